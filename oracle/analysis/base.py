@@ -1,5 +1,6 @@
 from oracle.poem_model import Poem
 from oracle.domain_objects import Stanza
+from oracle.tokenizer import PATTERN_PUNCTUATION
 
 
 # TODO: breakup anaphora into multiple functions
@@ -18,9 +19,10 @@ def anaphora(poem_stanza: Stanza) -> list[str]:
         return []
     
     best_matches: list[str] = []
+    lines_words = [line.tokenized.words for line in poem_stanza.lines]
     
     # Try patterns from 2 words up to (max words per line - 1)
-    max_words_per_line = max(len(line.text.split()) for line in poem_stanza.lines)
+    max_words_per_line = max(len(words) for words in lines_words)
     max_pattern_length = max_words_per_line - 1  # Don't use full lines
     
     for pattern_length in range(2, max_pattern_length + 1):
@@ -28,10 +30,9 @@ def anaphora(poem_stanza: Stanza) -> list[str]:
         
         # Get all patterns of this length
         patterns = []
-        for line in poem_stanza.lines:
-            words = line.text.split()
+        for words in lines_words:
             if len(words) >= pattern_length:
-                pattern = ' '.join(words[:pattern_length]).lower().strip('.,!?":;')
+                pattern = ' '.join(words[:pattern_length]).strip(PATTERN_PUNCTUATION)
                 patterns.append(pattern)
         
         # Count pattern frequencies
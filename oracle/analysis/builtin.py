@@ -0,0 +1,148 @@
+"""
+Builtin module registering the standard intermediates and analyzers.
+
+Intermediates are nested per stanza and line, in poem order:
+    - stanza_texts: Each stanza's text
+    - tokens: Each line's normalized words
+    - syllable_variants: Each line's unique syllable variants per word
+    - syllable_totals: Each line's achievable syllable totals
+    - feature_store: The poem's scope of FEATURE_STORE, holding its words missing from CMUdict
+    - phonemes: Each line's rows in feature_store, aligned with tokens
+"""
+
+from typing import Any
+
+from oracle.analysis.base import anaphora
+from oracle.analysis.forms import classify_form
+from oracle.analysis.meter import scan_stanza
+from oracle.analysis.phonemes import FEATURE_STORE, PhonemeFeatureStore
+from oracle.analysis.pipeline import (AnalysisValue, Analyzer, Intermediate, PoemContext, register_analyzer,
+                                      register_intermediate)
+from oracle.analysis.repetition import find_repetitions
+from oracle.analysis.rhyme import rhyme_scheme
+from oracle.analysis.sound import format_sound_device, word_sound_devices
+from oracle.domain_objects import possible_syllable_totals
+
+
+def _stanza_texts(context: PoemContext) -> list[str]:
+    return [stanza.stanza_text_string for stanza in context.poem.stanzas]
+
+
+def _tokens(context: PoemContext) -> list[list[list[str]]]:
+    return [[[form[2] for form in line.tokenized.forms if form[2]] for line in stanza.lines]
+            for stanza in context.poem.stanzas]
+
+
+def _syllable_variants(context: PoemContext) -> list[list[list[list[int]]]]:
+    return [[line.get_all_syllable_variants() for line in stanza.lines] for stanza in context.poem.stanzas]
+
+
+def _syllable_totals(context: PoemContext) -> list[list[list[int]]]:
+    return [[possible_syllable_totals(variants) for variants in stanza]
+            for stanza in context.get("syllable_variants")]
+
+
+def _feature_store(context: PoemContext) -> PhonemeFeatureStore:
+    return FEATURE_STORE.scope()
+
+
+def _phonemes(context: PoemContext) -> list[list[Any]]:
+    store: PhonemeFeatureStore = context.get("feature_store")
+    return [[store.rows(words) for words in stanza] for stanza in context.get("tokens")]
+
+
+register_intermediate(Intermediate("stanza_texts", _stanza_texts))
+register_intermediate(Intermediate("tokens", _tokens))
+register_intermediate(Intermediate("syllable_variants", _syllable_variants))
+register_intermediate(Intermediate("syllable_totals", _syllable_totals, requires=("syllable_variants",)))
+register_intermediate(Intermediate("feature_store", _feature_store))
+register_intermediate(Intermediate("phonemes", _phonemes, requires=("tokens", "feature_store")))
+
+
+def _stanzas(context: PoemContext) -> dict[str, AnalysisValue]:
+    return {
+        'stanza_texts': context.get("stanza_texts"),
+        'line_counts': [len(stanza.lines) for stanza in context.poem.stanzas],
+    }
+
+
+def _syllables(context: PoemContext) -> dict[str, AnalysisValue]:
+    # The first variant of each word, as Line.get_total_syllables counts
+    return {'syllables_per_line': [[sum(variants[0] for variants in line) for line in stanza]
+                                   for stanza in context.get("syllable_variants")]}
+
+
+def _poetic_devices(context: PoemContext) -> dict[str, AnalysisValue]:
+    return {'poetic_devices': [anaphora(stanza) for stanza in context.poem.stanzas]}
+
+
+def _rhyme_schemes(context: PoemContext) -> dict[str, AnalysisValue]:
+    return {'rhyme_schemes': [rhyme_scheme(stanza) for stanza in context.poem.stanzas]}
+
+
+def _meters(context: PoemContext) -> dict[str, AnalysisValue]:
+    meters = []
+    meter_deviations = []
+    stanza_meters = []
+    for stanza in context.poem.stanzas:
+        line_meters, prevailing_meter = scan_stanza(stanza)
+        meters.append([meter.name for meter in line_meters])
+        meter_deviations.append([meter.deviation for meter in line_meters])
+        stanza_meters.append(prevailing_meter)
+    return {'meters': meters, 'meter_deviations': meter_deviations, 'stanza_meters': stanza_meters}
+
+
+def _syllable_totals_fields(context: PoemContext) -> dict[str, AnalysisValue]:
+    possible_totals: list[list[list[int]]] = context.get("syllable_totals")
+    return {
+        'min_syllables_per_line': [[totals[0] for totals in stanza] for stanza in possible_totals],
+        'max_syllables_per_line': [[totals[-1] for totals in stanza] for stanza in possible_totals],
+        'possible_syllables_per_line': possible_totals,
+    }
+
+
+def _forms(context: PoemContext) -> dict[str, AnalysisValue]:
+    totals = [line for stanza in context.get("syllable_totals") for line in stanza]
+    form_matches = classify_form(context.poem.stanzas, syllable_totals=totals)
+    return {
+        'forms': [match.form for match in form_matches],
+        'form_scores': [round(match.score * 100) for match in form_matches],
+    }
+
+
+def _sound_devices(context: PoemContext) -> dict[str, AnalysisValue]:
+    devices: list[list[str]] = context.field("poetic_devices")  # type: ignore[assignment]
+    store: PhonemeFeatureStore = context.get("feature_store")
+    extended = []
+    device_types = []
+    device_patterns = []
+    for stanza_devices, stanza_words, stanza_rows in zip(devices, context.get("tokens"), context.get("phonemes")):
+        found = [device for words, rows in zip(stanza_words, stanza_rows)
+                 for device in word_sound_devices(words, rows, store)]
+        extended.append(stanza_devices + [format_sound_device(device) for device in found])
+        # The same devices as structured data, so consumers need not parse the entries
+        device_types.append(["anaphora"] * len(stanza_devices) + [device for device, _ in found])
+        device_patterns.append(stanza_devices + [pattern for _, pattern in found])
+    return {'poetic_devices': extended, 'poetic_device_types': device_types,
+            'poetic_device_patterns': device_patterns}
+
+
+def _repetitions(context: PoemContext) -> dict[str, AnalysisValue]:
+    repetitions = find_repetitions(context.poem.stanzas)
+    return {
+        'repetitions': [f"{repetition.device}: {repetition.phrase}" for repetition in repetitions],
+        'repetition_positions': [[list(position) for position in repetition.positions]
+                                 for repetition in repetitions],
+    }
+
+
+register_analyzer(Analyzer("stanzas", _stanzas, requires=("stanza_texts",), default=True))
+register_analyzer(Analyzer("syllables", _syllables, requires=("syllable_variants",), default=True))
+register_analyzer(Analyzer("poetic_devices", _poetic_devices, default=True))
+register_analyzer(Analyzer("rhyme_schemes", _rhyme_schemes))
+register_analyzer(Analyzer("meters", _meters))
+register_analyzer(Analyzer("syllable_totals", _syllable_totals_fields, requires=("syllable_totals",)))
+register_analyzer(Analyzer("forms", _forms, requires=("syllable_totals",)))
+register_analyzer(Analyzer("sound_devices", _sound_devices, requires=("tokens", "feature_store", "phonemes"),
+                           after=("poetic_devices",)))
+register_analyzer(Analyzer("repetitions", _repetitions))
@@ -0,0 +1,230 @@
+"""
+Forms module for recognizing fixed poetic forms.
+
+Each form is a list of constraints ordered from cheap to costly: line and
+stanza counts and refrains compare lengths and strings, syllable targets need
+the line's achievable totals over every pronunciation, and rhyme patterns need
+phoneme lookups. A form whose line count does not fit is discarded at once,
+and one that can no longer reach NEAR_MATCH_SCORE stops before its costlier
+constraints run.
+"""
+
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field
+
+from oracle.analysis.rhyme import line_rhyme_keys
+from oracle.domain_objects import Line, Stanza
+
+
+# Forms scoring below this are not reported
+NEAR_MATCH_SCORE = 0.5
+
+
+class PoemLines:
+    """
+    The lines of a poem with per-line features computed on first use.
+
+    Methods:
+        syllable_totals: Returns a line's achievable syllable totals.
+        rhymes: Checks whether two lines end in rhyming words.
+        same_text: Checks whether two lines are the same refrain.
+    """
+
+    def __init__(self, stanzas: Sequence[Stanza],
+                 syllable_totals: Sequence[Collection[int]] | None = None) -> None:
+        self.stanza_sizes = [len(stanza.lines) for stanza in stanzas]
+        self.lines: list[Line] = [line for stanza in stanzas for line in stanza.lines]
+        self._totals: dict[int, set[int]] = {}
+        if syllable_totals is not None:
+            self._totals = {index: set(totals) for index, totals in enumerate(syllable_totals)}
+        self._rhyme_keys: dict[int, set[int]] = {}
+
+    def syllable_totals(self, index: int) -> set[int]:
+        """Return the syllable totals line `index` can have."""
+        totals = self._totals.get(index)
+        if totals is None:
+            totals = self._totals[index] = set(self.lines[index].get_possible_syllable_totals())
+        return totals
+
+    def rhymes(self, first: int, second: int) -> bool:
+        """Check whether two lines end in words that rhyme under some pronunciation."""
+        keys = []
+        for index in (first, second):
+            line_keys = self._rhyme_keys.get(index)
+            if line_keys is None:
+                line_keys = self._rhyme_keys[index] = set(line_rhyme_keys(self.lines[index]))
+            keys.append(line_keys)
+        return bool(keys[0] & keys[1])
+
+    def same_text(self, first: int, second: int) -> bool:
+        """Check whether two lines have the same words, ignoring case and punctuation."""
+        return _refrain_words(self.lines[first]) == _refrain_words(self.lines[second])
+
+
+def _refrain_words(line: Line) -> list[str]:
+    return [form[2] for form in line.tokenized.forms if form[2]]
+
+
+# A constraint returns how well the poem satisfies it, from 0.0 to 1.0
+Constraint = Callable[[PoemLines], float]
+
+
+@dataclass
+class Form:
+    """
+    A fixed form as weighted constraints.
+
+    Attributes:
+        name (str): The form's name, e.g. "haiku".
+        line_count (int): The exact number of lines; other poems are never candidates.
+        constraints (list[tuple[float, Constraint]]): (weight, constraint) pairs,
+            cheapest first.
+    """
+
+    name: str
+    line_count: int
+    constraints: list[tuple[float, Constraint]] = field(default_factory=list)
+
+
+@dataclass
+class FormMatch:
+    """
+    How well a poem fits a form.
+
+    Attributes:
+        form (str): The form's name.
+        score (float): Weighted share of satisfied constraints, 1.0 for a full match.
+    """
+
+    form: str
+    score: float
+
+    @property
+    def is_match(self) -> bool:
+        """Return whether every constraint is satisfied."""
+        return self.score >= 1.0
+
+
+def _syllable_fit(totals: set[int], target: int) -> float:
+    if target in totals:
+        return 1.0
+    return 0.5 if target - 1 in totals or target + 1 in totals else 0.0
+
+
+def syllables(*targets: int) -> Constraint:
+    """Each line has a target syllable count under some pronunciation; off by one counts half."""
+    def check(poem: PoemLines) -> float:
+        return sum(_syllable_fit(poem.syllable_totals(index), target)
+                   for index, target in enumerate(targets)) / len(targets)
+    return check
+
+
+def syllable_ranges(*ranges: tuple[int, int]) -> Constraint:
+    """Each line's syllable count can fall into its (minimum, maximum) range."""
+    def check(poem: PoemLines) -> float:
+        return sum(any(low <= total <= high for total in poem.syllable_totals(index))
+                   for index, (low, high) in enumerate(ranges)) / len(ranges)
+    return check
+
+
+def every_line_syllables(target: int, line_count: int) -> Constraint:
+    """Every line has the same target syllable count, e.g. 10 in a sonnet."""
+    return syllables(*([target] * line_count))
+
+
+def stanza_sizes(*sizes: int) -> Constraint:
+    """The poem is divided into stanzas of exactly these sizes."""
+    def check(poem: PoemLines) -> float:
+        return 1.0 if poem.stanza_sizes == list(sizes) else 0.0
+    return check
+
+
+def refrains(*groups: Sequence[int]) -> Constraint:
+    """The lines of each group (1-based) repeat the group's first line."""
+    def check(poem: PoemLines) -> float:
+        pairs = [(group[0] - 1, line - 1) for group in groups for line in group[1:]]
+        return sum(poem.same_text(first, second) for first, second in pairs) / len(pairs)
+    return check
+
+
+def _scheme_pairs(scheme: str) -> list[tuple[int, int]]:
+    first_lines: dict[str, int] = {}
+    pairs = []
+    for index, letter in enumerate(scheme):
+        if letter == " ":
+            continue
+        if letter in first_lines:
+            pairs.append((first_lines[letter], index))
+        else:
+            first_lines[letter] = index
+    return pairs
+
+
+def rhyme_scheme(*schemes: str) -> Constraint:
+    """Lines sharing a letter rhyme; the best fitting of several allowed schemes counts."""
+    pair_lists = [_scheme_pairs(scheme.replace(" ", "")) for scheme in schemes]
+
+    def check(poem: PoemLines) -> float:
+        return max(sum(poem.rhymes(first, second) for first, second in pairs) / len(pairs)
+                   for pairs in pair_lists)
+    return check
+
+
+FORMS = [
+    Form("haiku", 3, [(1.0, syllables(5, 7, 5))]),
+    Form("tanka", 5, [(1.0, syllables(5, 7, 5, 7, 7))]),
+    Form("limerick", 5, [
+        (1.0, syllable_ranges((7, 11), (7, 11), (4, 7), (4, 7), (7, 11))),
+        (2.0, rhyme_scheme("AABBA")),
+    ]),
+    Form("sonnet", 14, [
+        (1.0, every_line_syllables(10, 14)),
+        # Shakespearean, Spenserian and Petrarchan (with either sestet)
+        (2.0, rhyme_scheme("ABAB CDCD EFEF GG", "ABAB BCBC CDCD EE", "ABBAABBA CDECDE", "ABBAABBA CDCDCD")),
+    ]),
+    Form("villanelle", 19, [
+        (1.0, stanza_sizes(3, 3, 3, 3, 3, 4)),
+        (2.0, refrains((1, 6, 12, 18), (3, 9, 15, 19))),
+        (2.0, rhyme_scheme("ABA ABA ABA ABA ABA ABAA")),
+    ]),
+]
+
+
+def classify_form(stanzas: Sequence[Stanza], forms: Sequence[Form] = FORMS,
+                  minimum_score: float = NEAR_MATCH_SCORE,
+                  syllable_totals: Sequence[Collection[int]] | None = None) -> list[FormMatch]:
+    """
+    Score a poem against fixed forms.
+
+    Args:
+        stanzas: The poem's stanzas.
+        forms: The forms to check, defaults to FORMS.
+        minimum_score: Forms scoring lower are left out.
+        syllable_totals: Each line's achievable totals in poem order, if already
+            computed; otherwise they are computed for the lines that need them.
+
+    Returns:
+        Matching and near-matching forms, best first.
+
+    Note:
+        Forms are skipped without any lookups unless the line count fits, and a
+        form's remaining constraints are skipped as soon as even satisfying all
+        of them could not reach minimum_score.
+    """
+    poem = PoemLines(stanzas, syllable_totals)
+    matches = []
+    for form in forms:
+        if len(poem.lines) != form.line_count:
+            continue
+        total_weight = sum(weight for weight, _ in form.constraints)
+        remaining_weight = total_weight
+        achieved = 0.0
+        for weight, constraint in form.constraints:
+            achieved += weight * constraint(poem)
+            remaining_weight -= weight
+            if (achieved + remaining_weight) / total_weight < minimum_score:
+                break
+        else:
+            score = achieved / total_weight
+            matches.append(FormMatch(form=form.name, score=score))
+    return sorted(matches, key=lambda match: -match.score)
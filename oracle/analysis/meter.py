@@ -0,0 +1,226 @@
+"""
+Meter module for scanning lines against accentual-syllabic meters.
+
+Each word contributes its CMUdict stress strings ("010" for "abandon") as
+alternative paths through a line. Instead of trying every combination of
+pronunciations, one dynamic-programming pass per foot type keeps, for every
+syllable position reachable so far, only the cheapest way of getting there.
+Positions beyond the longest meter are dropped, so the work per word is
+bounded and a line is scanned in linear time, scoring every line length of
+the foot type at once.
+"""
+
+import threading
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+from oracle.domain_objects import Line, Stanza
+from oracle.syllable_counter import DICTIONARY_CMUDICT, count_form_syllables
+
+
+# Foot patterns, "s" for a strong (stressed) and "w" for a weak position
+FEET = {
+    "iambic": "ws",
+    "trochaic": "sw",
+    "anapestic": "wws",
+    "dactylic": "sww",
+}
+
+LINE_LENGTHS = {
+    1: "monometer",
+    2: "dimeter",
+    3: "trimeter",
+    4: "tetrameter",
+    5: "pentameter",
+    6: "hexameter",
+    7: "heptameter",
+    8: "octameter",
+}
+
+# Reported for lines that fit no meter, e.g. lines longer than eight feet
+IRREGULAR = "irregular"
+
+# Costs, in deviation points, of a syllable's stress disagreeing with its position
+POLYSYLLABLE_MISMATCH = 2
+# Monosyllables are often promoted or demoted by the rhythm, so they cost less
+MONOSYLLABLE_MISMATCH = 1
+# A missing weak syllable at the end (catalexis) or an extra one (feminine ending)
+ENDING_ADJUSTMENT = 1
+
+# Word -> distinct CMUdict stress strings, built on first use
+_stress_index: dict[str, tuple[str, ...]] | None = None
+_index_lock = threading.Lock()
+
+
+@dataclass
+class LineMeter:
+    """
+    The best-fitting meter of a line.
+
+    Attributes:
+        name (str): E.g. "iambic pentameter", or "irregular".
+        foot (str | None): The foot type, None if irregular.
+        feet (int): Number of feet, 0 if irregular.
+        deviation (int): Deviation points of the best scansion, lower is more regular.
+        stresses (str): The chosen scansion as "0"/"1"/"2" stress digits, one per syllable.
+    """
+
+    name: str
+    foot: str | None
+    feet: int
+    deviation: int
+    stresses: str
+
+
+def _get_stress_index() -> dict[str, tuple[str, ...]]:
+    global _stress_index
+    if _stress_index is None:
+        with _index_lock:
+            if _stress_index is None:
+                _stress_index = {
+                    word: tuple(dict.fromkeys("".join(phoneme[-1] for phoneme in pronunciation
+                                                      if phoneme[-1].isdigit())
+                                              for pronunciation in pronunciations))
+                    for word, pronunciations in DICTIONARY_CMUDICT.items()
+                }
+    return _stress_index
+
+
+def line_stress_variants(line: Line) -> list[tuple[str, ...]]:
+    """
+    Return each word's alternative stress strings.
+
+    Args:
+        line: The line to scan.
+
+    Returns:
+        Per token, its distinct stress strings: "1" primary, "2" secondary and
+        "0" no stress. Words missing from CMUdict are all "2" (either strength)
+        for each of their estimated syllable counts. Tokens without syllables
+        are left out.
+    """
+    index = _get_stress_index()
+    variants = []
+    for form in line.tokenized.forms:
+        stresses = index.get(form[1]) or index.get(form[2])
+        if stresses is None:
+            stresses = tuple(dict.fromkeys("2" * count for count in count_form_syllables(form)))
+        stresses = tuple(stress for stress in stresses if stress)
+        if stresses:
+            variants.append(stresses)
+    return variants
+
+
+def _syllable_cost(stress: str, strong: bool, monosyllable: bool) -> int:
+    if stress == "2" or (stress == "1") == strong:
+        return 0
+    return MONOSYLLABLE_MISMATCH if monosyllable else POLYSYLLABLE_MISMATCH
+
+
+@lru_cache(maxsize=4096)
+def _word_costs(variant: str, foot: str) -> tuple[int, ...]:
+    """Return a stress string's cost when it starts at each position of the foot."""
+    monosyllable = len(variant) == 1
+    return tuple(sum(_syllable_cost(stress, foot[(phase + offset) % len(foot)] == "s", monosyllable)
+                     for offset, stress in enumerate(variant))
+                 for phase in range(len(foot)))
+
+
+def _scan(variants: Sequence[tuple[str, ...]], foot: str) -> dict[int, tuple[int, str]]:
+    """Return the cheapest (cost, stresses) for every reachable syllable count, against a repeating foot."""
+    # Position -> (cost, stresses chosen so far); only the cheapest path per position is kept
+    states: dict[int, tuple[int, str]] = {0: (0, "")}
+    size = len(foot)
+    # Positions past the longest line plus an extra syllable can never fit, which bounds the states
+    limit = max(LINE_LENGTHS) * size + 1
+    for word_variants in variants:
+        next_states: dict[int, tuple[int, str]] = {}
+        for position, (cost, stresses) in states.items():
+            for variant in word_variants:
+                word_cost = cost + _word_costs(variant, foot)[position % size]
+                end = position + len(variant)
+                if end > limit:
+                    continue
+                best = next_states.get(end)
+                if best is None or word_cost < best[0]:
+                    next_states[end] = (word_cost, stresses + variant)
+        states = next_states
+        if not states:
+            break
+    return states
+
+
+def _endings(foot: str) -> list[int]:
+    """Return the allowed differences from a whole number of feet: dropped or added weak syllables."""
+    endings = [0]
+    dropped = 0
+    while dropped < len(foot) - 1 and foot[len(foot) - 1 - dropped] == "w":
+        dropped += 1
+        endings.append(-dropped)
+    if foot[0] == "w":
+        endings.append(1)
+    return endings
+
+
+_ENDINGS = {foot: _endings(foot) for foot in FEET.values()}
+
+
+def scan_line(line: Line) -> LineMeter:
+    """
+    Find the meter that fits a line best.
+
+    Args:
+        line: The line to scan.
+
+    Returns:
+        The meter with the fewest deviation points over all pronunciations of
+        its words; ties prefer the foot types in FEET order. A catalectic or
+        feminine ending costs ENDING_ADJUSTMENT.
+    """
+    variants = line_stress_variants(line)
+    best: LineMeter | None = None
+    for foot_name, foot in FEET.items():
+        size = len(foot)
+        for position, (cost, stresses) in _scan(variants, foot).items():
+            for ending in _ENDINGS[foot]:
+                feet, remainder = divmod(position - ending, size)
+                if remainder or feet not in LINE_LENGTHS or position <= 0:
+                    continue
+                deviation = cost + abs(ending) * ENDING_ADJUSTMENT
+                # Strictly lower, so ties keep the earlier foot type and the shorter line
+                if best is None or deviation < best.deviation or \
+                        (deviation == best.deviation and best.foot == foot_name and feet < best.feet):
+                    best = LineMeter(name=f"{foot_name} {LINE_LENGTHS[feet]}", foot=foot_name, feet=feet,
+                                     deviation=deviation, stresses=stresses)
+    if best is None:
+        return LineMeter(name=IRREGULAR, foot=None, feet=0, deviation=0,
+                         stresses="".join(word_variants[0] for word_variants in variants))
+    return best
+
+
+def stanza_meter(line_meters: Sequence[LineMeter]) -> str:
+    """
+    Name the prevailing meter of a stanza.
+
+    Args:
+        line_meters: The scanned lines of the stanza.
+
+    Returns:
+        The most common line meter; ties go to the one with fewer total deviation
+        points. An empty stanza is "irregular".
+    """
+    if not line_meters:
+        return IRREGULAR
+    counts = Counter(meter.name for meter in line_meters)
+    deviations: Counter[str] = Counter()
+    for meter in line_meters:
+        deviations[meter.name] += meter.deviation
+    return min(counts, key=lambda name: (-counts[name], deviations[name]))
+
+
+def scan_stanza(stanza: Stanza) -> tuple[list[LineMeter], str]:
+    """Scan every line of a stanza and name the stanza's prevailing meter."""
+    line_meters = [scan_line(line) for line in stanza.lines]
+    return line_meters, stanza_meter(line_meters)
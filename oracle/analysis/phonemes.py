@@ -0,0 +1,203 @@
+"""
+Phonemes module for per-token pronunciation features.
+
+Sound-based analyses all need the same few facts about a word: how it starts,
+how it ends, its vowels and its stresses. The feature store resolves each
+unique token once and keeps those facts as interned integer ids in parallel
+array('i') columns, one row per token, so detectors compare small integers
+instead of re-reading CMUdict phoneme lists.
+
+The shared FEATURE_STORE is only filled with dictionary words, which bounds it
+by the size of CMUdict. Analyses look words up through a scope of it, which
+keeps the rows of words missing from CMUdict for as long as the analysis runs.
+"""
+
+import threading
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from oracle.analysis.rhyme import rhyme_keys
+from oracle.syllable_counter import DICTIONARY_CMUDICT
+from oracle.tokenizer import VOWELS
+
+
+# Shortest dictionary word accepted as the start or end of an unknown compound
+MIN_PART_LENGTH = 3
+
+# Id of an absent feature, e.g. the onset of a word starting with a vowel
+NONE = 0
+
+
+@dataclass(frozen=True)
+class TokenFeatures:
+    """
+    The pronunciation features of one token, as interned symbol ids.
+
+    Attributes:
+        onset (int): The first consonant, NONE if the word starts with a vowel.
+        coda (int): The last consonant, NONE if the word ends in a vowel.
+        stressed_vowel (int): The vowel of the (last) primary stressed syllable.
+        vowels (int): The sequence of vowels.
+        stresses (int): The stress string, e.g. "10".
+        rhyme (int): The first rhyme key id, see oracle.analysis.rhyme.
+    """
+
+    onset: int
+    coda: int
+    stressed_vowel: int
+    vowels: int
+    stresses: int
+    rhyme: int
+
+
+class PhonemeFeatureStore:
+    """
+    Pronunciation features of every token seen so far, in parallel integer columns.
+
+    Attributes:
+        onsets, codas, stressed_vowels, vowels, stresses, rhymes (array): One
+            column per feature, indexed by row.
+
+    Methods:
+        row: Returns a token's row, resolving its features on first use.
+        rows: Returns the rows of several tokens.
+        features: Returns a row's features.
+        symbol: Returns the phonemes behind a symbol id.
+        scope: Returns a store for one analysis that shares this store's dictionary words.
+    """
+
+    def __init__(self, parent: "PhonemeFeatureStore | None" = None) -> None:
+        self._parent = parent
+        self._rows: dict[str, int] = {}
+        # A scope interns into its parent's symbols, so symbol ids agree between them
+        self._symbol_ids: dict[tuple[str, ...], int] = {(): NONE} if parent is None else parent._symbol_ids
+        self._symbols: list[tuple[str, ...]] = [()] if parent is None else parent._symbols
+        self._lock: threading.Lock = threading.Lock() if parent is None else parent._lock
+        self.onsets = array("i")
+        self.codas = array("i")
+        self.stressed_vowels = array("i")
+        self.vowels = array("i")
+        self.stresses = array("i")
+        self.rhymes = array("i")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, word: str) -> int:
+        """
+        Return the row of a normalized (lowercase, unpunctuated) word.
+
+        Args:
+            word: The word to look up.
+
+        Returns:
+            The row index into the feature columns. Words missing from CMUdict
+            take their onset from the longest dictionary word they start with
+            and their coda from the longest they end with (spelling otherwise),
+            and have no vowel or stress features.
+        """
+        row = self._rows.get(word)
+        if row is not None:
+            return row
+        shared = None
+        if self._parent is not None and word in DICTIONARY_CMUDICT:
+            # Dictionary words are resolved once per process, in the parent
+            shared = self._parent.features(self._parent.row(word))
+        with self._lock:
+            row = self._rows.get(word)
+            if row is None:
+                self._append(shared if shared is not None else self._resolve(word))
+                # Published last, so readers never see a row before its columns
+                row = self._rows[word] = len(self.onsets) - 1
+        return row
+
+    def rows(self, words: Iterable[str]) -> "array[int]":
+        """Return the rows of several words, in order."""
+        return array("i", (self.row(word) for word in words))
+
+    def features(self, row: int) -> TokenFeatures:
+        """Return the features stored in a row."""
+        return TokenFeatures(onset=self.onsets[row], coda=self.codas[row],
+                             stressed_vowel=self.stressed_vowels[row], vowels=self.vowels[row],
+                             stresses=self.stresses[row], rhyme=self.rhymes[row])
+
+    def symbol(self, symbol_id: int) -> tuple[str, ...]:
+        """Return the phonemes (or "~"-prefixed spelling) a symbol id stands for."""
+        return self._symbols[symbol_id]
+
+    def scope(self) -> "PhonemeFeatureStore":
+        """
+        Return a store for one analysis.
+
+        Returns:
+            A store whose dictionary words are resolved (once) in this store and
+            copied, while words missing from CMUdict only get rows in the scope.
+            Arbitrary user input therefore cannot grow a long-lived store.
+        """
+        return PhonemeFeatureStore(parent=self)
+
+    def _append(self, features: TokenFeatures) -> None:
+        self.onsets.append(features.onset)
+        self.codas.append(features.coda)
+        self.stressed_vowels.append(features.stressed_vowel)
+        self.vowels.append(features.vowels)
+        self.stresses.append(features.stresses)
+        self.rhymes.append(features.rhyme)
+
+    def _intern(self, symbol: tuple[str, ...]) -> int:
+        # Callers hold _lock
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def _resolve(self, word: str) -> TokenFeatures:
+        keys = rhyme_keys(word)
+        rhyme = keys[0] if keys else NONE
+        pronunciations = DICTIONARY_CMUDICT.get(word)
+        if pronunciations:
+            phonemes = pronunciations[0]
+            vowels = [phoneme for phoneme in phonemes if phoneme[-1].isdigit()]
+            stresses = "".join(vowel[-1] for vowel in vowels)
+            stressed = stresses.rfind("1")
+            return TokenFeatures(
+                onset=self._intern(_consonant(phonemes[0])),
+                coda=self._intern(_consonant(phonemes[-1])),
+                stressed_vowel=self._intern((vowels[stressed][:-1],) if stressed >= 0 else ()),
+                vowels=self._intern(tuple(vowel[:-1] for vowel in vowels)),
+                stresses=self._intern(tuple(stresses)),
+                rhyme=rhyme,
+            )
+        return TokenFeatures(onset=self._intern(_estimate_onset(word)), coda=self._intern(_estimate_coda(word)),
+                             stressed_vowel=NONE, vowels=NONE, stresses=NONE, rhyme=rhyme)
+
+
+def _consonant(phoneme: str) -> tuple[str, ...]:
+    return () if phoneme[-1].isdigit() else (phoneme,)
+
+
+def _estimate_onset(word: str) -> tuple[str, ...]:
+    # Compounds start like their first part: "voidborn" like "void"
+    for end in range(len(word) - 1, MIN_PART_LENGTH - 1, -1):
+        pronunciations = DICTIONARY_CMUDICT.get(word[:end])
+        if pronunciations:
+            return _consonant(pronunciations[0][0])
+    if not word or word[0] in VOWELS or not word[0].isalpha():
+        return ()
+    return ("~", word[0])
+
+
+def _estimate_coda(word: str) -> tuple[str, ...]:
+    for start in range(1, len(word) - MIN_PART_LENGTH + 1):
+        pronunciations = DICTIONARY_CMUDICT.get(word[start:])
+        if pronunciations:
+            return _consonant(pronunciations[0][-1])
+    if not word or word[-1] in VOWELS or not word[-1].isalpha():
+        return ()
+    return ("~", word[-1])
+
+
+# Shared by all analyses through scopes, so each dictionary word is resolved once per process
+FEATURE_STORE = PhonemeFeatureStore()
@@ -0,0 +1,218 @@
+"""
+Pipeline module for running analyzers over a poem.
+
+An analyzer declares the intermediates it reads (tokens, syllable variants,
+phonemes, ...) and the analyzers whose output fields it builds on. The runner
+selects the default analyzers plus the requested ones, computes every needed
+intermediate once per poem, and runs the analyzers in dependency order. For
+large poems on free-threaded Python builds, analyzers that do not depend on
+each other run on a thread pool; with the GIL they would only take turns.
+
+New analyses plug in through register_intermediate and register_analyzer;
+the built-in ones are registered by oracle.analysis.builtin.
+"""
+
+import sys
+import threading
+from collections.abc import Callable, Collection, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from oracle.poem_model import Poem
+
+
+AnalysisValue = list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]
+
+# Poems with at least this many lines run independent analyzers in parallel
+PARALLEL_MIN_LINES = 200
+# Threads only run analyzers at the same time when the interpreter has no GIL
+GIL_ENABLED: bool = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+@dataclass(frozen=True)
+class Intermediate:
+    """
+    A value derived from a poem once and shared by every analyzer that needs it.
+
+    Attributes:
+        name (str): The name analyzers request it by, e.g. "tokens".
+        compute (Callable[[PoemContext], Any]): Derives the value; may read other intermediates.
+        requires (tuple[str, ...]): The intermediates compute reads.
+    """
+
+    name: str
+    compute: Callable[["PoemContext"], Any]
+    requires: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Analyzer:
+    """
+    One analysis contributing fields to the analyze_poem result.
+
+    Attributes:
+        name (str): The name used in `include`, e.g. "meters".
+        run (Callable[[PoemContext], dict[str, AnalysisValue]]): Returns the analyzer's fields.
+        requires (tuple[str, ...]): The intermediates run reads.
+        after (tuple[str, ...]): Analyzers whose fields run reads through
+            PoemContext.field; they are selected along with this one.
+        default (bool): Runs without being requested.
+    """
+
+    name: str
+    run: Callable[["PoemContext"], dict[str, AnalysisValue]]
+    requires: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    default: bool = False
+
+
+# Registered in order; the result lists fields in analyzer order
+INTERMEDIATES: dict[str, Intermediate] = {}
+ANALYZERS: dict[str, Analyzer] = {}
+
+
+def register_intermediate(intermediate: Intermediate) -> Intermediate:
+    """Make an intermediate available to analyzers, replacing one of the same name."""
+    INTERMEDIATES[intermediate.name] = intermediate
+    return intermediate
+
+
+def register_analyzer(analyzer: Analyzer) -> Analyzer:
+    """Make an analyzer selectable, replacing one of the same name."""
+    ANALYZERS[analyzer.name] = analyzer
+    return analyzer
+
+
+class PoemContext:
+    """
+    The poem under analysis with its intermediates and the fields produced so far.
+
+    Methods:
+        get: Returns an intermediate, computing it on first use.
+        field: Returns a field produced by an earlier analyzer.
+    """
+
+    def __init__(self, poem: Poem, intermediates: dict[str, Intermediate] | None = None) -> None:
+        self.poem = poem
+        self._intermediates = INTERMEDIATES if intermediates is None else intermediates
+        self._values: dict[str, Any] = {}
+        self._fields: dict[str, AnalysisValue] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Any:
+        """
+        Return an intermediate value.
+
+        Raises:
+            KeyError: If no intermediate of that name is registered.
+        """
+        if name in self._values:
+            return self._values[name]
+        intermediate = self._intermediates[name]
+        for requirement in intermediate.requires:
+            self.get(requirement)
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = intermediate.compute(self)
+        return self._values[name]
+
+    def field(self, name: str) -> AnalysisValue:
+        """Return a field of an analyzer listed in the current analyzer's `after`."""
+        return self._fields[name]
+
+
+def _select(include: Collection[str], analyzers: dict[str, Analyzer]) -> list[Analyzer]:
+    # Only non-default analyzers can be requested, as OPTIONAL_ANALYSES lists them
+    unknown = set(include) - {name for name, analyzer in analyzers.items() if not analyzer.default}
+    if unknown:
+        raise ValueError(f"Unknown analyses: {', '.join(sorted(unknown))}")
+    selected: set[str] = set()
+    pending = [name for name, analyzer in analyzers.items() if analyzer.default or name in include]
+    while pending:
+        name = pending.pop()
+        if name not in analyzers:
+            raise ValueError(f"Unknown analyses: {name}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(analyzers[name].after)
+    return [analyzer for name, analyzer in analyzers.items() if name in selected]
+
+
+def schedule(analyzers: Sequence[Analyzer]) -> list[list[Analyzer]]:
+    """
+    Group analyzers into waves that only depend on earlier waves.
+
+    Args:
+        analyzers: The analyzers to run, including everything they run after.
+
+    Returns:
+        The waves in order; the analyzers of one wave are independent.
+
+    Raises:
+        ValueError: If the analyzers depend on each other in a cycle.
+    """
+    done: set[str] = set()
+    remaining = list(analyzers)
+    waves = []
+    while remaining:
+        wave = [analyzer for analyzer in remaining if done.issuperset(analyzer.after)]
+        if not wave:
+            raise ValueError(f"Circular analyzer dependencies: {', '.join(analyzer.name for analyzer in remaining)}")
+        waves.append(wave)
+        done.update(analyzer.name for analyzer in wave)
+        remaining = [analyzer for analyzer in remaining if analyzer.name not in done]
+    return waves
+
+
+def run_pipeline(poem: Poem, include: Collection[str] = (),
+                 analyzers: dict[str, Analyzer] | None = None,
+                 intermediates: dict[str, Intermediate] | None = None,
+                 parallel_min_lines: int = PARALLEL_MIN_LINES) -> dict[str, AnalysisValue]:
+    """
+    Run the default and the requested analyzers over a poem.
+
+    Args:
+        poem: The poem to analyze.
+        include: Names of non-default analyzers to run as well.
+        analyzers: The analyzers to choose from, defaults to ANALYZERS.
+        intermediates: The intermediates to compute from, defaults to INTERMEDIATES.
+        parallel_min_lines: Poems with fewer lines run every analyzer on the
+            calling thread, as do all poems when GIL_ENABLED.
+
+    Returns:
+        The fields of every selected analyzer, in analyzer registration order.
+        A field returned by several analyzers keeps its first position and its
+        last value, so an analyzer can extend a field of one it runs after.
+
+    Raises:
+        ValueError: If an unknown or default analyzer is requested, or dependencies
+            are circular.
+    """
+    analyzers = ANALYZERS if analyzers is None else analyzers
+    selected = _select(include, analyzers)
+    waves = schedule(selected)
+    context = PoemContext(poem, intermediates)
+
+    # Computed up front, so parallel analyzers only ever read them
+    for analyzer in selected:
+        for requirement in analyzer.requires:
+            context.get(requirement)
+
+    outputs: dict[str, dict[str, AnalysisValue]] = {}
+    parallel = not GIL_ENABLED and sum(len(stanza.lines) for stanza in poem.stanzas) >= parallel_min_lines
+    for wave in waves:
+        if parallel and len(wave) > 1:
+            with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+                wave_outputs = list(executor.map(lambda analyzer: analyzer.run(context), wave))
+        else:
+            wave_outputs = [analyzer.run(context) for analyzer in wave]
+        for analyzer, fields in zip(wave, wave_outputs):
+            outputs[analyzer.name] = fields
+            context._fields.update(fields)
+
+    result: dict[str, AnalysisValue] = {}
+    for analyzer in selected:
+        for name in outputs[analyzer.name]:
+            result[name] = context._fields[name]
+    return result
@@ -0,0 +1,248 @@
+"""
+Repetition module for repeated phrases across a whole poem.
+
+The poem's normalized words become one integer stream with a unique separator
+after every line, so no repeat spans a line break. A suffix array (prefix
+doubling) and its LCP array (Kasai) give every right-maximal repeat as an LCP
+interval in one stack pass; a prefix sum over the words preceding each suffix
+tells in O(1) whether the repeat is also left-maximal. Each maximal repeat is
+then classified by where its occurrences sit in their lines: whole lines
+(refrain), line openings (anaphora), line endings (epistrophe) or elsewhere.
+Lines sharing both a repeated opening and a repeated ending form symploce.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from oracle.analysis.sound import FUNCTION_WORDS
+from oracle.domain_objects import Stanza
+
+
+REFRAIN = "refrain"
+ANAPHORA = "anaphora"
+EPISTROPHE = "epistrophe"
+SYMPLOCE = "symploce"
+REPETITION = "repetition"
+
+# Shortest repeated phrase reported, in words
+MIN_REPEAT_LENGTH = 2
+
+
+@dataclass
+class Repetition:
+    """
+    A phrase repeated in a poem.
+
+    Attributes:
+        device (str): REFRAIN, ANAPHORA, EPISTROPHE, SYMPLOCE or REPETITION.
+        words (tuple[str, ...]): The normalized words; for symploce the
+            opening and the ending, joined by "...".
+        positions (list[tuple[int, int, int]]): (stanza, line, word) of each
+            occurrence, in poem order; lines and words count from 0 within their
+            stanza and line.
+    """
+
+    device: str
+    words: tuple[str, ...]
+    positions: list[tuple[int, int, int]]
+
+    @property
+    def phrase(self) -> str:
+        """Return the words joined by spaces."""
+        return " ".join(self.words)
+
+
+def suffix_array(tokens: Sequence[int]) -> list[int]:
+    """
+    Sort the suffixes of a token sequence by prefix doubling.
+
+    Args:
+        tokens: Integer tokens.
+
+    Returns:
+        Start positions of the suffixes in lexicographic order.
+
+    Note:
+        Each round sorts by (rank, rank k tokens ahead) and doubles k, stopping
+        as soon as all ranks are distinct, so the number of rounds grows with
+        the logarithm of the longest repeat rather than of the poem.
+    """
+    n = len(tokens)
+    if n == 0:
+        return []
+    dense = {token: rank for rank, token in enumerate(sorted(set(tokens)))}
+    rank = [dense[token] for token in tokens]
+    order = sorted(range(n), key=rank.__getitem__)
+    k = 1
+    while True:
+        keys = [rank[i] * (n + 1) + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)]
+        order.sort(key=keys.__getitem__)
+        new_rank = [0] * n
+        for previous, current in zip(order, order[1:]):
+            new_rank[current] = new_rank[previous] + (keys[current] != keys[previous])
+        rank = new_rank
+        if rank[order[-1]] == n - 1 or k >= n:
+            return order
+        k *= 2
+
+
+def lcp_array(tokens: Sequence[int], order: Sequence[int]) -> list[int]:
+    """
+    Return the longest common prefix of each suffix with the one before it in `order` (Kasai).
+
+    Args:
+        tokens: Integer tokens.
+        order: Their suffix array.
+
+    Returns:
+        lcp[i] is the common prefix length of suffixes order[i - 1] and
+        order[i]; lcp[0] is 0.
+    """
+    n = len(tokens)
+    position_rank = [0] * n
+    for index, start in enumerate(order):
+        position_rank[start] = index
+    lcp = [0] * n
+    common = 0
+    for start in range(n):
+        index = position_rank[start]
+        if index == 0:
+            common = 0
+            continue
+        other = order[index - 1]
+        while start + common < n and other + common < n and tokens[start + common] == tokens[other + common]:
+            common += 1
+        lcp[index] = common
+        if common:
+            common -= 1
+    return lcp
+
+
+def maximal_repeats(tokens: Sequence[int], min_length: int = 1) -> list[tuple[int, list[int]]]:
+    """
+    Find every maximal repeat of a token sequence.
+
+    Args:
+        tokens: Integer tokens.
+        min_length: Shorter repeats are left out.
+
+    Returns:
+        (length, sorted start positions) per repeat. A repeat is maximal when
+        extending it by one token to the left or right would lose an occurrence.
+    """
+    n = len(tokens)
+    if n < 2:
+        return []
+    order = suffix_array(tokens)
+    lcp = lcp_array(tokens, order)
+    # The token before each suffix; the first suffix gets a value no token has
+    before = [tokens[start - 1] if start else min(tokens) - 1 for start in order]
+    # changes[i]: suffixes 1..i of the order whose preceding token differs from their neighbour's
+    changes = [0] * n
+    for index in range(1, n):
+        changes[index] = changes[index - 1] + (before[index] != before[index - 1])
+
+    repeats = []
+    # (lcp, left bound) of the open LCP intervals
+    stack = [(0, 0)]
+    for index in range(1, n + 1):
+        current = lcp[index] if index < n else 0
+        left = index - 1
+        while current < stack[-1][0]:
+            length, left = stack.pop()
+            right = index - 1
+            # Left-maximal unless every occurrence is preceded by the same token
+            if length >= min_length and changes[right] - changes[left] > 0:
+                repeats.append((length, sorted(order[left:right + 1])))
+        if current > stack[-1][0]:
+            stack.append((current, left))
+    return repeats
+
+
+def find_repetitions(stanzas: Sequence[Stanza], min_length: int = MIN_REPEAT_LENGTH) -> list[Repetition]:
+    """
+    Find and classify the repeated phrases of a poem.
+
+    Args:
+        stanzas: The poem's stanzas.
+        min_length: Shortest phrase reported, in words.
+
+    Returns:
+        The repetitions in order of first occurrence, longer phrases first on
+        ties. A phrase counts as a refrain, anaphora or epistrophe when at least
+        two occurrences are whole lines, line openings or line endings; other
+        phrases are reported as repetition only if they contain a word outside
+        FUNCTION_WORDS. Symploce entries follow for lines sharing both a
+        repeated opening and a repeated ending.
+    """
+    word_ids: dict[str, int] = {}
+    words: list[str] = []
+    tokens: list[int] = []
+    # Per stream position: (stanza, line, word), and the index of its line in line_lengths
+    locations: list[tuple[int, int, int]] = []
+    line_of: list[int] = []
+    line_lengths: list[int] = []
+    for stanza_index, stanza in enumerate(stanzas):
+        for line_index, line in enumerate(stanza.lines):
+            offset = 0
+            for form in line.tokenized.forms:
+                if not form[2]:
+                    continue
+                tokens.append(word_ids.setdefault(form[2], len(word_ids)))
+                words.append(form[2])
+                locations.append((stanza_index, line_index, offset))
+                line_of.append(len(line_lengths))
+                offset += 1
+            line_lengths.append(offset)
+            # A unique separator, so repeats stop at the end of a line
+            tokens.append(-len(line_lengths))
+            words.append("")
+            locations.append((stanza_index, line_index, offset))
+            line_of.append(len(line_lengths) - 1)
+
+    repetitions = []
+    openings: list[tuple[tuple[str, ...], dict[int, int]]] = []
+    endings: list[tuple[tuple[str, ...], dict[int, int]]] = []
+    for length, starts in maximal_repeats(tokens, min_length):
+        phrase = tuple(words[starts[0]:starts[0] + length])
+        at_start = {line_of[start]: start for start in starts if locations[start][2] == 0}
+        at_end = {line_of[start]: start for start in starts
+                  if locations[start][2] + length == line_lengths[line_of[start]]}
+        whole_lines = at_start.keys() & at_end.keys()
+        if len(whole_lines) >= 2:
+            device = REFRAIN
+        elif len(at_start) >= 2:
+            device = ANAPHORA
+        elif len(at_end) >= 2:
+            device = EPISTROPHE
+        elif all(word in FUNCTION_WORDS for word in phrase):
+            continue
+        else:
+            device = REPETITION
+        if device != REFRAIN:
+            if len(at_start) >= 2:
+                openings.append((phrase, at_start))
+            if len(at_end) >= 2:
+                endings.append((phrase, at_end))
+        repetitions.append(Repetition(device=device, words=phrase,
+                                      positions=[locations[start] for start in starts]))
+    repetitions.sort(key=lambda repetition: (repetition.positions[0], -len(repetition.words)))
+
+    # Pair openings and endings only on lines where both occur, not every opening with every ending
+    openings_by_line: dict[int, list[int]] = {}
+    for opening_index, (_, opening_lines) in enumerate(openings):
+        for line_number in opening_lines:
+            openings_by_line.setdefault(line_number, []).append(opening_index)
+    pair_lines: dict[tuple[int, int], list[int]] = {}
+    for ending_index, (ending, ending_lines) in enumerate(endings):
+        for line_number in ending_lines:
+            for opening_index in openings_by_line.get(line_number, ()):
+                if len(openings[opening_index][0]) + len(ending) <= line_lengths[line_number]:
+                    pair_lines.setdefault((opening_index, ending_index), []).append(line_number)
+    for opening_index, ending_index in sorted(pair_lines):
+        lines = sorted(pair_lines[opening_index, ending_index])
+        if len(lines) >= 2:
+            opening, opening_lines = openings[opening_index]
+            repetitions.append(Repetition(device=SYMPLOCE, words=opening + ("...",) + endings[ending_index][0],
+                                          positions=[locations[opening_lines[line_number]] for line_number in lines]))
+    return repetitions
@@ -0,0 +1,176 @@
+"""
+Rhyme module for detecting stanza rhyme schemes.
+
+Every CMUdict pronunciation is reduced once to its rhyme key: the phonemes from
+the last stressed vowel onward, without stress digits. Keys are interned to
+small integers, so checking whether two words rhyme is an integer comparison
+and labelling a stanza costs one dictionary lookup per line.
+"""
+
+import threading
+from collections.abc import Sequence
+from functools import lru_cache
+
+from oracle.domain_objects import Line, Stanza
+from oracle.syllable_counter import DICTIONARY_CMUDICT
+from oracle.tokenizer import VOWELS
+
+
+# Shortest dictionary word accepted as the ending of an unknown compound, e.g. "born" in "voidborn"
+MIN_SUFFIX_LENGTH = 3
+# Spelling keys interned before their table starts over, so arbitrary input cannot grow it without bound
+MAX_SPELLING_KEYS = 65536
+
+# Rhyme keys are interned to their index in this table
+_key_ids: dict[tuple[str, ...], int] = {}
+# Spelling keys of words missing from CMUdict, interned after the dictionary's keys
+_spelling_key_ids: dict[tuple[str, ...], int] = {}
+_next_spelling_id = 0
+# Guards both tables, so concurrent threads never give two keys the same id
+_intern_lock = threading.Lock()
+
+# Word -> rhyme key ids of its pronunciations, built on first use
+_rhyme_index: dict[str, tuple[int, ...]] | None = None
+
+
+def rhyme_key(pronunciation: Sequence[str]) -> tuple[str, ...]:
+    """
+    Return the rhyming part of a pronunciation.
+
+    Args:
+        pronunciation: ARPABET phonemes, e.g. ["AH0", "B", "IH1", "S"].
+
+    Returns:
+        The phonemes from the last vowel with primary or secondary stress onward
+        (from the last vowel if none is stressed), with stress digits removed,
+        e.g. ("IH", "S").
+    """
+    last_vowel = None
+    for index in range(len(pronunciation) - 1, -1, -1):
+        stress = pronunciation[index][-1]
+        if stress == "1" or stress == "2":
+            return _strip_stress(pronunciation[index:])
+        if stress == "0" and last_vowel is None:
+            last_vowel = index
+    return _strip_stress(pronunciation[last_vowel or 0:])
+
+
+def _strip_stress(phonemes: Sequence[str]) -> tuple[str, ...]:
+    return tuple(phoneme.rstrip("012") for phoneme in phonemes)
+
+
+def _intern(key: tuple[str, ...]) -> int:
+    # Callers hold _intern_lock
+    return _key_ids.setdefault(key, len(_key_ids))
+
+
+def _intern_spelling(key: tuple[str, ...]) -> int:
+    # Callers hold _intern_lock
+    global _next_spelling_id
+    key_id = _spelling_key_ids.get(key)
+    if key_id is None:
+        if len(_spelling_key_ids) >= MAX_SPELLING_KEYS:
+            # Ids keep counting up, so a dropped key's id is never reused for another key
+            _spelling_key_ids.clear()
+            _estimate_rhyme_keys.cache_clear()
+        key_id = _spelling_key_ids[key] = max(_next_spelling_id, len(_key_ids))
+        _next_spelling_id = key_id + 1
+    return key_id
+
+
+def _get_rhyme_index() -> dict[str, tuple[int, ...]]:
+    global _rhyme_index
+    if _rhyme_index is None:
+        with _intern_lock:
+            if _rhyme_index is None:
+                index: dict[str, tuple[int, ...]] = {}
+                for word, pronunciations in DICTIONARY_CMUDICT.items():
+                    index[word] = tuple(dict.fromkeys(_intern(rhyme_key(pronunciation))
+                                                      for pronunciation in pronunciations))
+                _rhyme_index = index
+    return _rhyme_index
+
+
+@lru_cache(maxsize=65536)
+def _estimate_rhyme_keys(word: str) -> tuple[int, ...]:
+    index = _get_rhyme_index()
+    # Compounds usually rhyme like their last part: "voidborn" like "born"
+    for start in range(1, len(word) - MIN_SUFFIX_LENGTH + 1):
+        keys = index.get(word[start:])
+        if keys is not None:
+            return keys
+    # Otherwise compare spellings from the last vowel group on, e.g. "-yss"
+    end = len(word)
+    while end > 0 and word[end - 1] not in VOWELS:
+        end -= 1
+    start = end
+    while start > 0 and word[start - 1] in VOWELS:
+        start -= 1
+    with _intern_lock:
+        return (_intern_spelling(("~", word[start:])),)
+
+
+def rhyme_keys(word: str) -> tuple[int, ...]:
+    """
+    Return the rhyme key ids of a normalized (lowercase, unpunctuated) word.
+
+    Args:
+        word: The word to look up.
+
+    Returns:
+        One id per distinct rhyme of the word's pronunciations; two words rhyme
+        when they share an id. Words missing from CMUdict get an estimate, and
+        an empty word gets no ids.
+    """
+    if not word:
+        return ()
+    keys = _get_rhyme_index().get(word)
+    if keys is not None:
+        return keys
+    return _estimate_rhyme_keys(word)
+
+
+def line_rhyme_keys(line: Line) -> tuple[int, ...]:
+    """Return the rhyme key ids of a line's last word."""
+    for form in reversed(line.tokenized.forms):
+        if form[2]:
+            return rhyme_keys(form[2])
+    return ()
+
+
+def _scheme_label(index: int) -> str:
+    if index < 26:
+        return chr(ord("A") + index)
+    if index < 52:
+        return chr(ord("a") + index - 26)
+    return f"[{index}]"
+
+
+def rhyme_scheme(stanza: Stanza) -> str:
+    """
+    Label a stanza's lines by rhyme, e.g. "ABAB" or "AABB".
+
+    Args:
+        stanza: The stanza to analyze.
+
+    Returns:
+        One letter per line. A line gets the letter of the first earlier line it
+        rhymes with under any pronunciation of either end word, otherwise the
+        next unused letter (A-Z, then a-z).
+    """
+    labels: list[str] = []
+    # Rhyme key id -> letter of the first line that ended on it
+    first_labels: dict[int, tuple[int, str]] = {}
+    next_label = 0
+    for position, line in enumerate(stanza.lines):
+        keys = line_rhyme_keys(line)
+        matches = [first_labels[key] for key in keys if key in first_labels]
+        if matches:
+            label = min(matches)[1]
+        else:
+            label = _scheme_label(next_label)
+            next_label += 1
+        for key in keys:
+            first_labels.setdefault(key, (position, label))
+        labels.append(label)
+    return "".join(labels)
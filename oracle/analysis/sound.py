@@ -0,0 +1,115 @@
+"""
+Sound module for alliteration, assonance and consonance.
+
+A line's words are mapped to rows of a scope of the shared phoneme feature
+store, and each detector then works on one integer column of those rows: runs of equal
+onsets for alliteration, repeated stressed vowels for assonance and repeated
+final consonants for consonance. Function words ("the", "and", ...) are
+skipped, since their sounds repeat in almost every line.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from oracle.analysis.phonemes import FEATURE_STORE, NONE, PhonemeFeatureStore
+from oracle.domain_objects import Line, Stanza
+
+
+ALLITERATION = "alliteration"
+ASSONANCE = "assonance"
+CONSONANCE = "consonance"
+
+# Device names, as used in the "<device>: <words>" entries of poetic_devices
+SOUND_DEVICES = (ALLITERATION, ASSONANCE, CONSONANCE)
+
+# Consecutive content words starting with the same consonant
+MIN_ALLITERATION_WORDS = 2
+# Content words of a line sharing a stressed vowel or a final consonant
+MIN_ASSONANCE_WORDS = 3
+MIN_CONSONANCE_WORDS = 3
+
+FUNCTION_WORDS = frozenset(
+    "a an the and or but nor so yet if as at by for from in into of off on onto out over to up with "
+    "i me my we us our you your he him his she her it its they them their this that these those "
+    "is am are was were be been being do does did has have had will would shall should can could may "
+    "might must not no than then there here when where who whom whose which what".split()
+)
+
+
+def _entry(device: str, words: Sequence[str]) -> tuple[str, str]:
+    return device, " ".join(words)
+
+
+def format_sound_device(device: tuple[str, str]) -> str:
+    """Return a (device, words) pair as a "<device>: <words>" entry, e.g. "alliteration: dark deep"."""
+    return f"{device[0]}: {device[1]}"
+
+
+def _alliteration(words: Sequence[str], onsets: "array[int]") -> list[tuple[str, str]]:
+    entries = []
+    start = 0
+    for end in range(1, len(words) + 1):
+        if end == len(words) or onsets[end] != onsets[start] or onsets[start] == NONE:
+            if end - start >= MIN_ALLITERATION_WORDS and onsets[start] != NONE:
+                entries.append(_entry(ALLITERATION, words[start:end]))
+            start = end
+    return entries
+
+
+def _repeated(device: str, words: Sequence[str], column: "array[int]", min_words: int,
+              rhymes: "array[int] | None" = None) -> list[tuple[str, str]]:
+    positions: dict[int, list[int]] = {}
+    for position, symbol in enumerate(column):
+        if symbol != NONE:
+            positions.setdefault(symbol, []).append(position)
+    entries = []
+    for group in positions.values():
+        if len(group) < min_words:
+            continue
+        # Words that all rhyme share their final consonant by rhyming, not by consonance
+        if rhymes is not None and len({rhymes[position] for position in group}) < 2:
+            continue
+        entries.append(_entry(device, [words[position] for position in group]))
+    return entries
+
+
+def word_sound_devices(words: Sequence[str], rows: Sequence[int],
+                       store: PhonemeFeatureStore) -> list[tuple[str, str]]:
+    """
+    Detect alliteration, assonance and consonance among a line's words.
+
+    Args:
+        words: The line's normalized words.
+        rows: Their rows in store, e.g. from store.rows(words).
+        store: A feature store, usually a scope of FEATURE_STORE.
+
+    Returns:
+        (device, words) pairs like ("alliteration", "dark deep"), in the order
+        alliteration, assonance, consonance, each listing its words in line order.
+    """
+    content = [index for index, word in enumerate(words) if word not in FUNCTION_WORDS]
+    if len(content) < MIN_ALLITERATION_WORDS:
+        return []
+    content_words = [words[index] for index in content]
+    content_rows = [rows[index] for index in content]
+    onsets = array("i", [store.onsets[row] for row in content_rows])
+    stressed_vowels = array("i", [store.stressed_vowels[row] for row in content_rows])
+    codas = array("i", [store.codas[row] for row in content_rows])
+    rhymes = array("i", [store.rhymes[row] for row in content_rows])
+    return (_alliteration(content_words, onsets)
+            + _repeated(ASSONANCE, content_words, stressed_vowels, MIN_ASSONANCE_WORDS)
+            + _repeated(CONSONANCE, content_words, codas, MIN_CONSONANCE_WORDS, rhymes))
+
+
+def line_sound_devices(line: Line, store: PhonemeFeatureStore | None = None) -> list[str]:
+    """Detect alliteration, assonance and consonance in a line as "<device>: <words>" entries."""
+    if store is None:
+        store = FEATURE_STORE.scope()
+    words = [form[2] for form in line.tokenized.forms if form[2]]
+    return [format_sound_device(device) for device in word_sound_devices(words, store.rows(words), store)]
+
+
+def sound_devices(stanza: Stanza) -> list[str]:
+    """Detect alliteration, assonance and consonance in every line of a stanza, in line order."""
+    store = FEATURE_STORE.scope()
+    return [entry for line in stanza.lines for entry in line_sound_devices(line, store)]
@@ -3,49 +3,88 @@
 Analyzer module for poem analysis.
 """
 
+from collections.abc import Collection
+
+from oracle.domain_objects import Stanza
 from oracle.poem_model import Poem
 from oracle.intern.lookout import watch_running_time_of_function
+from oracle.analysis import builtin  # noqa: F401  (registers the standard analyzers)
 from oracle.analysis.base import anaphora
+from oracle.analysis.pipeline import ANALYZERS, run_pipeline
+
 
+# Bump whenever analyze_poem output changes, so cached CLI outputs are regenerated
+ANALYZER_VERSION = "1"
+
+# Fields analyze_poem adds only when they are requested through `include`
+OPTIONAL_ANALYSES = tuple(name for name, analyzer in ANALYZERS.items() if not analyzer.default)
 
 
 @watch_running_time_of_function
-def analyze_poem(poem: Poem) -> dict[str, list[str] | list[int] | list[list[int]] | list[list[str]]]:
+def analyze_poem(poem: Poem,
+                 include: Collection[str] = ()) -> dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]]:
     """
     Analyze poem using domain objects for flexible syllable pattern detection.
     
     Args:
         poem (Poem): The poem to analyze.
+        include (Collection[str]): Optional analyses to add, see OPTIONAL_ANALYSES.
     
     Returns:
-        dict[str, list[str] | list[int] | list[list[int]] | list[list[str]]]: A dictionary containing:
+        dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]]: A dictionary containing:
             - stanza_texts: List of stanza text strings
             - line_counts: List of line counts per stanza
             - syllables_per_line: List of syllable counts per line
-            - poetic_devices: List of poetic devices per stanza
+            - poetic_devices: List of poetic devices per stanza; with "sound_devices" included
+              also "alliteration: ...", "assonance: ..." and "consonance: ..." entries
+            - poetic_device_types, poetic_device_patterns: The device ("anaphora",
+              "alliteration", ...) and phrase of each poetic_devices entry (only if
+              "sound_devices" is included)
+            - rhyme_schemes: Rhyme scheme per stanza, e.g. "ABAB" (only if included)
+            - meters, meter_deviations, stanza_meters: Best-fitting meter and its deviation
+              points per line, and the prevailing meter per stanza (only if "meters" is included)
+            - min_syllables_per_line, max_syllables_per_line, possible_syllables_per_line:
+              Fewest, most and all achievable syllable totals per line over every
+              pronunciation variant (only if "syllable_totals" is included)
+            - forms, form_scores: Fixed forms the poem matches or nearly matches, best
+              first, with their scores in percent (only if "forms" is included)
+            - repetitions, repetition_positions: Repeated phrases across the whole poem as
+              "<device>: <words>" (refrain, anaphora, epistrophe, symploce or repetition) and
+              the [stanza, line, word] of each occurrence (only if "repetitions" is included)
+
+    Raises:
+        ValueError: If an unknown optional analysis is requested.
     
     Note:
-        This function uses domain objects (Stanza, Line) for flexible syllable pattern detection.
-        It processes the poem through the Stanza objects which contain the processed line data.
+        The analyses run as a pipeline of analyzers (see oracle.analysis.pipeline and
+        oracle.analysis.builtin). Each line is tokenized once (Line.tokenized), and
+        syllable variants and totals and phoneme rows are computed once per poem for
+        the analyses that read them. rhyme_schemes, meters and repetitions work from
+        the tokenized lines and do their own rhyme, stress and word lookups.
     """
-    
-    stanza_texts = []
-    line_counts = []
-    syllables_per_line = []
-    poetic_devices = []
-    
-    # Convert raw string stanzas into Stanza objects
-    for stanza_obj in poem.stanzas:  
-        stanza_texts.append(stanza_obj.stanza_text_string)
-        line_counts.append(len(stanza_obj.lines))
+    return run_pipeline(poem, include)
+
 
-        stanza_syllables = [line.get_total_syllables() for line in stanza_obj.lines]
-        syllables_per_line.append(stanza_syllables)
+def analyze_stanza(stanza: Stanza) -> dict[str, str | int | list[int] | list[str]]:
+    """
+    Analyze a single stanza, e.g. one parsed from a streamed upload.
+
+    Args:
+        stanza (Stanza): The stanza to analyze.
 
-        poetic_devices.append(anaphora(stanza_obj))
+    Returns:
+        dict[str, str | int | list[int] | list[str]]: A dictionary containing:
+            - stanza_text: The stanza text
+            - line_count: The number of lines
+            - syllables_per_line: The syllable count of each line
+            - poetic_devices: The stanza's poetic devices
+
+    Note:
+        The values are the stanza's entries of the corresponding analyze_poem lists.
+    """
     return {
-        'stanza_texts': stanza_texts,
-        'line_counts': line_counts,
-        'syllables_per_line': syllables_per_line,
-        'poetic_devices': poetic_devices
-    }
\ No newline at end of file
+        'stanza_text': stanza.stanza_text_string,
+        'line_count': len(stanza.lines),
+        'syllables_per_line': [line.get_total_syllables() for line in stanza.lines],
+        'poetic_devices': anaphora(stanza)
+    }
@@ -0,0 +1,161 @@
+"""
+Anthology module for splitting files that hold many poems.
+
+Reads a collection line by line and yields one Poem at a time, so memory stays
+bounded by the largest single poem instead of the whole file. Poems are
+separated by ornament lines ("***", "---", ...) or by a title line that
+follows a run of blank lines, where titles are recognized like
+check_for_title_line does (quoted or all caps) plus configurable patterns.
+"""
+
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from oracle.poem_model import Poem
+from oracle.utils import check_for_title_line
+
+
+# Lines made only of these ornaments separate poems
+DEFAULT_SEPARATORS = (r"(?:\*\s*){3,}", r"(?:-\s*){3,}", r"(?:=\s*){3,}", r"(?:~\s*){3,}", r"§+")
+
+# Extra title forms besides quoted and all-caps lines: "12.", "XIV."
+DEFAULT_TITLE_PATTERNS = (r"\d+\.?", r"[IVXLCDM]+\.?")
+
+# Characters stripped from a title before it is used as the poem's name
+_TITLE_QUOTES = "\"'“”‘’"
+
+
+class AnthologySplitter:
+    """
+    Detects poem boundaries in a stream of lines.
+
+    Attributes:
+        blank_lines_before_title (int): Blank lines that must precede a title for it
+            to start a new poem.
+        max_title_length (int): Longer lines are never titles.
+
+    Methods:
+        is_separator: Checks whether a line separates two poems.
+        is_title: Checks whether a line looks like a poem title.
+        split: Yields the poems of a stream of lines.
+    """
+
+    def __init__(self, separators: Sequence[str] = DEFAULT_SEPARATORS,
+                 title_patterns: Sequence[str] = DEFAULT_TITLE_PATTERNS,
+                 blank_lines_before_title: int = 2, max_title_length: int = 80) -> None:
+        self._separator = re.compile("|".join(f"(?:{pattern})" for pattern in separators)) if separators else None
+        self._title = re.compile("|".join(f"(?:{pattern})" for pattern in title_patterns)) if title_patterns else None
+        self.blank_lines_before_title = blank_lines_before_title
+        self.max_title_length = max_title_length
+
+    def is_separator(self, line: str) -> bool:
+        """Check whether a line consists of a separator ornament."""
+        stripped = line.strip()
+        return bool(stripped) and self._separator is not None and self._separator.fullmatch(stripped) is not None
+
+    def is_title(self, line: str) -> bool:
+        """Check whether a line is a quoted, all-caps or pattern-matching title."""
+        stripped = line.strip().strip("#*").strip()
+        if not stripped or len(stripped) > self.max_title_length:
+            return False
+        if check_for_title_line(stripped, filename=""):
+            return True
+        return self._title is not None and self._title.fullmatch(stripped) is not None
+
+    def split(self, lines: Iterable[str], source_name: str = "anthology") -> Iterator[Poem]:
+        """
+        Yield the poems found in a stream of lines.
+
+        Args:
+            lines: Lines of text, e.g. an open file; line endings are optional.
+            source_name: Used to name untitled poems, e.g. "anthology 3".
+
+        Yields:
+            One Poem per non-empty section. Titled poems are named after their
+            title, so the parser drops the title line as usual.
+        """
+        current: list[str] = []
+        title: str | None = None
+        has_content = False
+        blank_run = 0
+        count = 0
+
+        def finish() -> Poem | None:
+            nonlocal count
+            if not has_content:
+                return None
+            count += 1
+            text = "\n".join(current).strip("\n")
+            return Poem(text=text, filepath=Path(f"{_poem_name(title, source_name, count)}.txt"))
+
+        for raw_line in lines:
+            line = raw_line.rstrip("\r\n")
+            if not line.strip():
+                blank_run += 1
+                if has_content:
+                    current.append(line)
+                continue
+
+            if self.is_separator(line):
+                poem = finish()
+                if poem is not None:
+                    yield poem
+                current, title, has_content = [], None, False
+            elif not has_content:
+                if self.is_title(line):
+                    title = line
+                current.append(line)
+                has_content = True
+            elif blank_run >= self.blank_lines_before_title and self.is_title(line):
+                poem = finish()
+                if poem is not None:
+                    yield poem
+                current, title = [line], line
+            else:
+                current.append(line)
+            blank_run = 0
+
+        poem = finish()
+        if poem is not None:
+            yield poem
+
+
+def _poem_name(title: str | None, source_name: str, index: int) -> str:
+    if title is None:
+        return f"{source_name} {index}"
+    # Path separators would turn the title into a folder name
+    name = title.strip().strip("#*").strip().strip(_TITLE_QUOTES).replace("/", "-").replace("\\", "-")
+    return name or f"{source_name} {index}"
+
+
+def iter_anthology_poems(lines: Iterable[str], source_name: str = "anthology",
+                         splitter: AnthologySplitter | None = None) -> Iterator[Poem]:
+    """
+    Split a stream of lines into poems with the default or a custom splitter.
+
+    Args:
+        lines: Lines of text, e.g. sys.stdin or an open file.
+        source_name: Used to name untitled poems.
+        splitter: Boundary rules, defaults to AnthologySplitter().
+
+    Yields:
+        The poems in order of appearance.
+    """
+    yield from (splitter or AnthologySplitter()).split(lines, source_name)
+
+
+def read_anthology(path: str | Path, splitter: AnthologySplitter | None = None) -> Iterator[Poem]:
+    """
+    Stream the poems of an anthology file without reading it whole.
+
+    Args:
+        path: The file to read, decoded as UTF-8.
+        splitter: Boundary rules, defaults to AnthologySplitter().
+
+    Yields:
+        The poems in order of appearance.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as file:
+        yield from iter_anthology_poems(file, source_name=path.stem, splitter=splitter)
@@ -2,18 +2,70 @@
 API module for the Oracle Poetry Analyzer.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from pathlib import Path
-from oracle.analyzer import analyze_poem
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+import codecs
+import json
+import os
+import secrets
+import threading
+from oracle import syllable_counter
+from oracle.analyzer import analyze_poem, analyze_stanza
+from oracle.jobs import JOBS_DB_ENV, JOBS_ROOT_ENV, JOBS_WORKERS_ENV, JobQueue, JobRunner
+from oracle.parser import IncrementalStanzaParser, StanzaSpan
 from oracle.poem_model import Poem
+from oracle.static_assets import AssetTable, etag_matches
+from oracle.store import AnalysisStore, parse_syllable_profile
+
+# Background runner for /jobs, started with the app or by the first submitted job
+_job_runner: JobRunner | None = None
+# Sync endpoints run on a threadpool, so two first requests must not both start a runner
+_job_runner_lock = threading.Lock()
+
+
+def _start_job_runner(jobs_db: str) -> JobRunner:
+    """Return the running job runner for a database, starting it if needed."""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None or _job_runner.path != Path(jobs_db):
+            if _job_runner is not None:
+                _job_runner.stop()
+            _job_runner = JobRunner(jobs_db, workers=int(os.getenv(JOBS_WORKERS_ENV, "1")))
+        _job_runner.start()
+        return _job_runner
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Lets `kill -HUP <worker pid>` reload the custom lexicon without a restart; installed
+    # here rather than on import, so importing the module leaves signal handlers alone
+    syllable_counter.install_lexicon_reload_handler()
+    # Compress the frontend before the first request instead of during it
+    await run_in_threadpool(_get_asset_table)
+    # Resume jobs left unfinished when the server last stopped
+    jobs_db = os.getenv(JOBS_DB_ENV)
+    if jobs_db:
+        _start_job_runner(jobs_db)
+    yield
+    with _job_runner_lock:
+        if _job_runner is not None:
+            _job_runner.stop()
+
 
 app = FastAPI(
     title="Oracle Poetry Analyzer API",
     description="Analyze poems for syllable counts and structure.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=_lifespan
 )
 
 app.add_middleware(
@@ -36,9 +88,11 @@ class PoemRequest(BaseModel):
     Attributes:
         poem_text: The text of the poem to analyze.
         title: The title of the poem.
+        include: Optional analyses to add to the result, e.g. ["rhyme_schemes", "meters"].
     """
     poem_text: str
     title: str = "Untitled"
+    include: list[str] = []
 
 class BatchPoemRequest(BaseModel):
     """
@@ -49,6 +103,19 @@ class BatchPoemRequest(BaseModel):
     """
     poems: list[PoemRequest]
 
+class JobRequest(BaseModel):
+    """
+    Request model for a background analysis job.
+
+    Attributes:
+        poems: Poems to analyze, as for /batch-analyze.
+        path: Instead of poems, a folder on the server relative to ORACLE_JOBS_ROOT.
+        recursive: Also analyze poems in subfolders of path.
+    """
+    poems: list[PoemRequest] | None = None
+    path: str | None = None
+    recursive: bool = False
+
 class PoemAnalysisResult(BaseModel):
     """
     Result model for poem analysis.
@@ -59,13 +126,13 @@ class PoemAnalysisResult(BaseModel):
         error: Error message if analysis failed.
     """
     title: str
-    analysis: dict[str, list[str] | list[int] | list[list[int]] | list[list[str]]]
+    analysis: dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]]
     error: str | None = None
 
 
 
 @app.post("/analyze")
-def analyze_endpoint(request: PoemRequest) -> dict[str, list[str] | list[int] | list[list[int]] | list[list[str]]]:
+def analyze_endpoint(request: PoemRequest) -> dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]]:
     """
     Analyze a poem and return syllable counts per stanza.
 
@@ -73,6 +140,10 @@ def analyze_endpoint(request: PoemRequest) -> dict[str, list[str] | list[int] |
     - stanza_texts: List of stanza contents
     - line_counts: Number of lines per stanza
     - syllables_per_line: Syllable counts for each line in each stanza
+    - rhyme_schemes: Rhyme scheme of each stanza, when "rhyme_schemes" is included
+    - meters, meter_deviations, stanza_meters: Line and stanza meters, when "meters" is included
+    - forms, form_scores: Matching fixed forms and their scores in percent, when "forms" is included
+    - repetitions, repetition_positions: Repeated phrases and where they occur, when "repetitions" is included
     """
 
     try:
@@ -80,7 +151,8 @@ def analyze_endpoint(request: PoemRequest) -> dict[str, list[str] | list[int] |
             text=request.poem_text,
             filepath=Path(f"{request.title}.txt")
         )
-        result: dict[str, list[str] | list[int] | list[list[int]] | list[list[str]]] = analyze_poem(poem)
+        result: dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]] = analyze_poem(
+            poem, include=request.include)
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -108,7 +180,7 @@ def batch_analyze_endpoint(request: BatchPoemRequest) -> dict[str, list[PoemAnal
                 text=poem_request.poem_text,
                 filepath=Path(f"{poem_request.title}.txt")
             )
-            analysis = analyze_poem(poem)
+            analysis = analyze_poem(poem, include=poem_request.include)
             results.append(PoemAnalysisResult(
                 title=poem_request.title,
                 analysis=analysis,
@@ -122,6 +194,98 @@ def batch_analyze_endpoint(request: BatchPoemRequest) -> dict[str, list[PoemAnal
             ))
     return {"results": results, "total": len(results)}
 
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    A StreamingResponse whose body iterator reads the request body while it streams.
+
+    Before ASGI spec 2.4, StreamingResponse watches for disconnects by reading the
+    request channel, which would swallow the upload chunks. Request.stream raises
+    ClientDisconnect by itself, so the watcher is left out.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _analyze_upload_stanza(span: StanzaSpan) -> dict[str, str | int | list[int] | list[str]]:
+    try:
+        return analyze_stanza(span.to_stanza())
+    except ValueError as e:
+        # e.g. a "***" stanza, which /analyze answers with 400; the other stanzas still stream
+        return {'stanza_text': span.text, 'error': str(e)}
+
+
+def _analyze_upload_chunk(parser: IncrementalStanzaParser, decoder: codecs.IncrementalDecoder, chunk: bytes,
+                          final: bool) -> list[dict[str, str | int | list[int] | list[str]]]:
+    spans = parser.feed_spans(decoder.decode(chunk, final=final))
+    if final:
+        spans += parser.close_spans()
+    return [_analyze_upload_stanza(span) for span in spans]
+
+
+async def _iter_upload_analysis(request: Request, title: str, encoding: str) -> AsyncIterator[str]:
+    parser = IncrementalStanzaParser(poem_name=Path(f"{title}.txt").stem)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    total = 0
+    try:
+        async for chunk in request.stream():
+            # Parsing and analysis run off the event loop, one chunk at a time
+            for result in await run_in_threadpool(_analyze_upload_chunk, parser, decoder, chunk, False):
+                yield json.dumps({"stanza": total, **result}, ensure_ascii=False) + "\n"
+                total += 1
+        for result in await run_in_threadpool(_analyze_upload_chunk, parser, decoder, b"", True):
+            yield json.dumps({"stanza": total, **result}, ensure_ascii=False) + "\n"
+            total += 1
+    except UnicodeDecodeError as e:
+        yield json.dumps({"error": f"Upload is not valid {encoding}: {e.reason}"}) + "\n"
+        return
+    except ClientDisconnect:
+        return
+    yield json.dumps({"title": title, "total": total}, ensure_ascii=False) + "\n"
+
+
+@app.post("/analyze/stream", response_model=None)
+async def analyze_stream_endpoint(request: Request, title: str = "Untitled") -> StreamingResponse:
+    """
+    Analyze a poem uploaded as a raw text/plain body, streaming one result per stanza.
+
+    Args:
+        request (Request): The upload; the body is read in chunks as it arrives.
+        title (str): The title of the poem, used to drop title lines like /analyze does.
+
+    Returns:
+        StreamingResponse: NDJSON lines, each a stanza's analysis (stanza index,
+        stanza_text, line_count, syllables_per_line, poetic_devices), followed by
+        a final {"title", "total"} line. A stanza that cannot be analyzed, e.g. one
+        holding only "***", gets a {"stanza", "stanza_text", "error"} line instead.
+        An {"error"} line ends the stream if the body cannot be decoded.
+
+    Note:
+        Only the unfinished stanza is buffered, so memory use does not grow with the
+        upload and the first stanzas are answered while the rest is still arriving.
+        Multipart bodies are not accepted; send the text itself, e.g.
+        `curl --data-binary @poem.txt -H "Content-Type: text/plain"`.
+    """
+    media_type, _, parameters = request.headers.get("content-type", "text/plain").partition(";")
+    if media_type.strip().lower() != "text/plain":
+        raise HTTPException(status_code=415, detail="Upload the poem as a text/plain body")
+
+    encoding = "utf-8"
+    for parameter in parameters.split(";"):
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            encoding = value.strip().strip('"')
+    try:
+        codecs.getincrementaldecoder(encoding)
+    except LookupError:
+        raise HTTPException(status_code=415, detail=f"Unknown charset '{encoding}'")
+
+    return _UploadStreamingResponse(_iter_upload_analysis(request, title, encoding),
+                                    media_type="application/x-ndjson")
+
     
 @app.get("/health")
 def health_check() -> dict[str, str]:
@@ -144,32 +308,247 @@ def health_check() -> dict[str, str]:
         }
 
 
+def _open_analysis_store() -> AnalysisStore:
+    """Open the store named by ORACLE_STORE_PATH read-only, or answer 404 if there is none."""
+    store_path = os.getenv("ORACLE_STORE_PATH")
+    if not store_path or not Path(store_path).is_file():
+        raise HTTPException(status_code=404, detail="Analysis store is not configured")
+    return AnalysisStore(store_path, read_only=True)
+
+
+@app.get("/store/stanzas")
+def store_stanzas_endpoint(profile: str, limit: int = 100) -> dict[str, list[dict[str, object]] | int]:
+    """
+    Find stored stanzas with an exact syllable profile.
+
+    Args:
+        profile (str): Syllables per line, e.g. "5-7-5".
+        limit (int): Maximum number of stanzas to return.
+
+    Returns:
+        dict: A dictionary containing:
+            - results: Matching stanzas (poem, position, text, syllables_per_line)
+            - total: Number of results
+    """
+    try:
+        syllables = parse_syllable_profile(profile)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="profile must look like 5-7-5")
+
+    with _open_analysis_store() as store:
+        results = [asdict(record) for record in store.stanzas_with_profile(syllables, limit=limit)]
+    return {"results": results, "total": len(results)}
+
+
+@app.get("/store/poems")
+def store_poems_endpoint(anaphora: str, limit: int = 100) -> dict[str, list[str] | int]:
+    """
+    Find stored poems whose anaphora includes a phrase.
+
+    Args:
+        anaphora (str): Case-insensitive phrase, e.g. "i am".
+        limit (int): Maximum number of poems to return.
+
+    Returns:
+        dict: A dictionary containing:
+            - results: Names of matching poems
+            - total: Number of results
+    """
+    with _open_analysis_store() as store:
+        results = store.poems_with_anaphora(anaphora, limit=limit)
+    return {"results": results, "total": len(results)}
+
+
+@app.get("/store/lines")
+def store_lines_endpoint(min_syllables: int | None = None, max_syllables: int | None = None,
+                         limit: int = 100) -> dict[str, list[dict[str, object]] | int]:
+    """
+    Find stored lines within a syllable range (both bounds inclusive).
+
+    Args:
+        min_syllables (int | None): Smallest syllable count.
+        max_syllables (int | None): Largest syllable count.
+        limit (int): Maximum number of lines to return.
+
+    Returns:
+        dict: A dictionary containing:
+            - results: Matching lines (poem, stanza, position, text, syllables)
+            - total: Number of results
+    """
+    with _open_analysis_store() as store:
+        records = store.lines_by_syllables(min_syllables, max_syllables, limit=limit)
+    results = [asdict(record) for record in records]
+    return {"results": results, "total": len(results)}
+
+
+@app.post("/admin/reload-lexicon")
+def reload_lexicon_endpoint(x_admin_token: str | None = Header(default=None)) -> dict[str, int | str | None]:
+    """
+    Reload the custom lexicon (ORACLE_LEXICON) in this worker without a restart.
+
+    Args:
+        x_admin_token (str | None): Must match the ORACLE_ADMIN_TOKEN environment variable.
+
+    Returns:
+        dict: A dictionary containing:
+            - entries: Number of custom lexicon entries now in use
+            - path: The lexicon file, or None when only CMUdict is used
+
+    Note:
+        The endpoint answers 404 unless ORACLE_ADMIN_TOKEN is set. With several
+        uvicorn workers each worker has its own table; send SIGHUP to every
+        worker to reload all of them.
+    """
+    admin_token = os.getenv("ORACLE_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    try:
+        entries = syllable_counter.reload_custom_lexicon()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Lexicon was not reloaded: {e}")
+
+    lexicon_path = syllable_counter.custom_lexicon_path()
+    return {"entries": entries, "path": str(lexicon_path) if lexicon_path else None}
+
+
+def _jobs_database() -> str:
+    """Return the job database named by ORACLE_JOBS_DB, or answer 404 if there is none."""
+    jobs_db = os.getenv(JOBS_DB_ENV)
+    if not jobs_db:
+        raise HTTPException(status_code=404, detail="Job queue is not configured")
+    return jobs_db
+
+
+def _resolve_job_folder(path: str) -> Path:
+    """Resolve a requested folder inside ORACLE_JOBS_ROOT, refusing anything outside it."""
+    root = os.getenv(JOBS_ROOT_ENV)
+    if not root:
+        raise HTTPException(status_code=403, detail="Folder jobs are disabled")
+    root_resolved = Path(root).resolve()
+    folder = (root_resolved / path).resolve()
+    if not folder.is_relative_to(root_resolved):
+        raise HTTPException(status_code=403, detail="Folder is outside the jobs root")
+    if not folder.is_dir():
+        raise HTTPException(status_code=400, detail=f"'{path}' is not a directory")
+    return folder
+
+
+@app.post("/jobs", status_code=202)
+def submit_job_endpoint(request: JobRequest) -> dict[str, str]:
+    """
+    Queue a corpus for background analysis and return right away.
+
+    Args:
+        request (JobRequest): Inline poems, or a server-local folder.
+
+    Returns:
+        dict: A dictionary containing:
+            - id: The job id for /jobs/{id}
+            - status: "queued"
+
+    Note:
+        Needs ORACLE_JOBS_DB; folder jobs also need ORACLE_JOBS_ROOT. Jobs are
+        processed by ORACLE_JOBS_WORKERS worker processes (default 1) and resumed
+        after a restart.
+    """
+    jobs_db = _jobs_database()
+    if (request.poems is None) == (request.path is None):
+        raise HTTPException(status_code=400, detail="Send either 'poems' or 'path'")
+
+    with JobQueue(jobs_db) as queue:
+        if request.path is not None:
+            job_id = queue.submit_folder(_resolve_job_folder(request.path), recursive=request.recursive)
+        else:
+            job_id = queue.submit_poems((poem.title, poem.poem_text) for poem in request.poems or [])
+    _start_job_runner(jobs_db).notify()
+    return {"id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+def job_status_endpoint(job_id: str) -> dict[str, str | int | float | None]:
+    """
+    Report a job's progress.
+
+    Returns:
+        dict: id, status ("queued", "running", "done" or "failed"), total, done,
+        failed, error, created_at and updated_at.
+    """
+    with JobQueue(_jobs_database()) as queue:
+        status = queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return asdict(status)
+
+
+@app.get("/jobs/{job_id}/results")
+def job_results_endpoint(job_id: str, cursor: int = 0, limit: int = 100) -> dict[str, list[dict[str, object]] | int | None]:
+    """
+    Return a page of a job's finished poems, available while the job runs.
+
+    Args:
+        job_id (str): The job.
+        cursor (int): Position to start from, 0 or the previous page's next_cursor.
+        limit (int): Maximum number of results.
+
+    Returns:
+        dict: A dictionary containing:
+            - results: Finished poems (position, title, analysis, error) in order
+            - next_cursor: Cursor of the next page, null when no further poems have finished yet
+    """
+    with JobQueue(_jobs_database()) as queue:
+        if queue.status(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        results, next_cursor = queue.results(job_id, cursor=cursor, limit=limit)
+    return {"results": [asdict(result) for result in results], "next_cursor": next_cursor}
+
+
 # Serve built frontend (dist folder from root)
 # Underscore to stop pdoc from documenting this variable since it's absolute path
 _DIST_DIR = Path(__file__).parent.parent / "dist" 
 
 
+# The frontend files, loaded from _DIST_DIR on first use
+_asset_table: AssetTable | None = None
+
+
+def _get_asset_table() -> AssetTable:
+    global _asset_table
+    if _asset_table is None:
+        _asset_table = AssetTable.load(_DIST_DIR)
+    return _asset_table
+
+
 @app.get("/{full_path:path}", response_model=None)
-async def serve_frontend(full_path: str) -> FileResponse | dict[str, str]:
+async def serve_frontend(full_path: str, request: Request) -> Response | dict[str, str]:
     """
-    Serve the built frontend from the dist directory.
-    
+    Serve the built frontend from memory.
+
     Args:
         full_path (str): The path to the file to serve.
-    
+        request (Request): Used for the Accept-Encoding and If-None-Match headers.
+
     Returns:
-        FileResponse: The file to serve.
+        Response: The file, compressed when the client accepts it, or 304 Not Modified
+        when the client's copy is current. Unknown paths get index.html, so the
+        single-page app handles its own routes.
+
+    Note:
+        The dist folder is read and compressed once (see oracle.static_assets);
+        rebuilding the frontend requires a restart. Only files found inside the
+        folder can be served, whatever the request path.
     """
-    dist_resolved = _DIST_DIR.resolve()
-    file_path = (_DIST_DIR / full_path).resolve()
-    
-    # Security check: ensure we're not serving files outside dist
-    if file_path.is_file() and str(file_path).startswith(str(dist_resolved)):
-        return FileResponse(file_path)
-    
-    # SPA fallback: serve index.html
-    index_path = dist_resolved / "index.html"
-    if index_path.is_file():
-        return FileResponse(index_path)
-    
-    return {"error": "Frontend not found"}
\ No newline at end of file
+    table = _get_asset_table()
+    asset = table.get(full_path) or table.index()
+    if asset is None:
+        return {"error": "Frontend not found"}
+
+    coding, body, etag = asset.variant(request.headers.get("accept-encoding"))
+    headers = {"ETag": etag, "Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=asset.content_type, headers=headers)
@@ -0,0 +1,201 @@
+"""
+Corpus index module for form-driven search over analyzed poems.
+
+Builds in-memory inverted indexes from analyze_poem output, so questions such
+as "lines with 10 syllables", "stanzas with a 5-7-5 signature" or "lines that
+open with 'i am'" are answered by a dictionary lookup instead of re-analysis.
+Poems can be added and removed one at a time, and the index can be saved to
+and loaded from a JSON file.
+"""
+
+import json
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from oracle.tokenizer import PATTERN_PUNCTUATION, tokenize_line
+from oracle.utils import write_text_atomically
+
+
+# (poem name, stanza index, line index)
+LineId = tuple[str, int, int]
+# (poem name, stanza index)
+StanzaId = tuple[str, int]
+
+# Number of leading tokens indexed per line; phrases up to this length can be looked up
+DEFAULT_PREFIX_TOKENS = 3
+
+INDEX_FORMAT = "oracle-index-1"
+
+
+def normalize_tokens(text: str) -> list[str]:
+    """
+    Split text into lowercase tokens without surrounding punctuation.
+
+    Args:
+        text: A line or phrase.
+
+    Returns:
+        The non-empty tokens, e.g. "Oh, Captain!" -> ["oh", "captain"].
+    """
+    tokens = (word.strip(PATTERN_PUNCTUATION) for word in tokenize_line(text).words)
+    return [token for token in tokens if token]
+
+
+@dataclass
+class _IndexedPoem:
+    stanza_texts: list[str]
+    syllables_per_line: list[list[int]]
+
+
+class CorpusIndex:
+    """
+    Inverted indexes from syllable counts, stanza signatures and line openings.
+
+    Attributes:
+        prefix_tokens (int): Longest opening phrase, in tokens, that is indexed.
+
+    Methods:
+        add_poem: Indexes a poem's analysis, replacing an earlier one of the same name.
+        remove_poem: Drops a poem from every index.
+        lines_with_syllables: Finds lines with an exact syllable count.
+        stanzas_with_signature: Finds stanzas by syllables per line.
+        lines_starting_with: Finds lines that open with a phrase.
+        line_text: Returns the text of an indexed line.
+        save: Writes the index to a JSON file.
+        load: Reads an index written by save.
+
+    Note:
+        Lookups cost one dictionary access plus the size of the result.
+        Updates only touch the keys of the poem being added or removed.
+    """
+
+    def __init__(self, prefix_tokens: int = DEFAULT_PREFIX_TOKENS) -> None:
+        if prefix_tokens < 1:
+            raise ValueError("prefix_tokens must be at least 1")
+        self.prefix_tokens = prefix_tokens
+        self._poems: dict[str, _IndexedPoem] = {}
+        self._lines: dict[LineId, str] = {}
+        self._by_syllables: dict[int, set[LineId]] = {}
+        self._by_signature: dict[tuple[int, ...], set[StanzaId]] = {}
+        self._by_prefix: dict[str, set[LineId]] = {}
+
+    def __len__(self) -> int:
+        return len(self._poems)
+
+    def __contains__(self, poem_name: object) -> bool:
+        return poem_name in self._poems
+
+    def _prefixes(self, line_text: str) -> list[str]:
+        tokens = normalize_tokens(line_text)[:self.prefix_tokens]
+        return [" ".join(tokens[:length]) for length in range(1, len(tokens) + 1)]
+
+    def _iter_keys(self, poem_name: str,
+                   poem: _IndexedPoem) -> Iterator[tuple[StanzaId, tuple[int, ...], list[tuple[LineId, str, int]]]]:
+        for stanza, (text, syllables) in enumerate(zip(poem.stanza_texts, poem.syllables_per_line)):
+            lines = [((poem_name, stanza, position), line_text, line_syllables)
+                     for position, (line_text, line_syllables) in enumerate(zip(text.split("\n"), syllables))]
+            yield (poem_name, stanza), tuple(syllables), lines
+
+    def add_poem(self, poem_name: str, analysis: dict[str, Any]) -> None:
+        """
+        Index one poem.
+
+        Args:
+            poem_name: Name the poem's lines and stanzas are identified by.
+            analysis: The dictionary returned by analyze_poem.
+        """
+        if poem_name in self._poems:
+            self.remove_poem(poem_name)
+
+        poem = _IndexedPoem(stanza_texts=list(analysis["stanza_texts"]),
+                            syllables_per_line=[list(counts) for counts in analysis["syllables_per_line"]])
+        self._poems[poem_name] = poem
+
+        for stanza_id, signature, lines in self._iter_keys(poem_name, poem):
+            self._by_signature.setdefault(signature, set()).add(stanza_id)
+            for line_id, line_text, syllables in lines:
+                self._lines[line_id] = line_text
+                self._by_syllables.setdefault(syllables, set()).add(line_id)
+                for prefix in self._prefixes(line_text):
+                    self._by_prefix.setdefault(prefix, set()).add(line_id)
+
+    def remove_poem(self, poem_name: str) -> None:
+        """Drop a poem from every index; unknown names are ignored."""
+        poem = self._poems.pop(poem_name, None)
+        if poem is None:
+            return
+
+        for stanza_id, signature, lines in self._iter_keys(poem_name, poem):
+            _discard(self._by_signature, signature, stanza_id)
+            for line_id, line_text, syllables in lines:
+                del self._lines[line_id]
+                _discard(self._by_syllables, syllables, line_id)
+                for prefix in self._prefixes(line_text):
+                    _discard(self._by_prefix, prefix, line_id)
+
+    def lines_with_syllables(self, syllables: int) -> list[LineId]:
+        """Return the ids of lines with exactly this many syllables, sorted."""
+        return sorted(self._by_syllables.get(syllables, ()))
+
+    def stanzas_with_signature(self, signature: Sequence[int]) -> list[StanzaId]:
+        """Return the ids of stanzas whose syllables per line equal the signature, e.g. [5, 7, 5]."""
+        return sorted(self._by_signature.get(tuple(signature), ()))
+
+    def lines_starting_with(self, phrase: str) -> list[LineId]:
+        """
+        Return the ids of lines that open with a phrase.
+
+        Args:
+            phrase: Up to prefix_tokens words, matched case-insensitively and
+                ignoring the punctuation the anaphora detector ignores.
+
+        Raises:
+            ValueError: If the phrase is longer than the indexed prefixes.
+        """
+        tokens = normalize_tokens(phrase)
+        if len(tokens) > self.prefix_tokens:
+            raise ValueError(f"Only phrases of up to {self.prefix_tokens} words are indexed")
+        return sorted(self._by_prefix.get(" ".join(tokens), ()))
+
+    def line_text(self, line_id: LineId) -> str:
+        """Return the text of an indexed line."""
+        return self._lines[line_id]
+
+    def save(self, path: str | Path) -> None:
+        """Write the indexed poems to a JSON file; the indexes are rebuilt on load."""
+        data = {
+            "format": INDEX_FORMAT,
+            "prefix_tokens": self.prefix_tokens,
+            "poems": {
+                name: {"stanza_texts": poem.stanza_texts, "syllables_per_line": poem.syllables_per_line}
+                for name, poem in self._poems.items()
+            },
+        }
+        write_text_atomically(Path(path), json.dumps(data, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CorpusIndex":
+        """
+        Read an index written by save.
+
+        Raises:
+            ValueError: If the file is not a saved corpus index.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            raise ValueError(f"'{path}' is not a saved corpus index")
+
+        index = cls(prefix_tokens=data["prefix_tokens"])
+        for name, analysis in data["poems"].items():
+            index.add_poem(name, analysis)
+        return index
+
+
+def _discard(index: dict[Any, set[Any]], key: Any, item: Any) -> None:
+    items = index.get(key)
+    if items is not None:
+        items.discard(item)
+        if not items:
+            del index[key]
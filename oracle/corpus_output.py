@@ -0,0 +1,249 @@
+"""
+Corpus output module for writing many analyses into a few bulk files.
+
+Instead of one '_analysis.txt' per poem, a whole corpus can be written as a
+single JSONL file or as a columnar directory of flat binary arrays
+(Arrow-style values + offsets) that can be memory-mapped for statistics.
+
+Columnar layout (all integers native-endian, recorded in meta.json):
+    syllables.i32          syllables of every line, poem after poem
+    stanza_offsets.i64     start of each stanza in syllables.i32, plus the end
+    poem_offsets.i64       start of each poem in stanza_offsets.i64, plus the end
+    poems.jsonl            one JSON string (the poem name) per poem
+"""
+
+import json
+import mmap
+import sys
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, IO, Literal
+
+
+SYLLABLES_FILE = "syllables.i32"
+STANZA_OFFSETS_FILE = "stanza_offsets.i64"
+POEM_OFFSETS_FILE = "poem_offsets.i64"
+POEM_NAMES_FILE = "poems.jsonl"
+META_FILE = "meta.json"
+
+# Number of buffered poems before arrays are flushed to disk
+FLUSH_EVERY = 1024
+
+
+class JsonlCorpusWriter:
+    """
+    Writes one JSON object per analyzed poem into a single JSONL file.
+
+    Methods:
+        write: Appends a poem's analysis.
+        close: Flushes and closes the file.
+    """
+
+    def __init__(self, path: str | Path, append: bool = False, buffer_size: int = 1024 * 1024) -> None:
+        self.path = Path(path)
+        self._file: IO[str] = open(self.path, "a" if append else "w", encoding="utf-8",
+                                   buffering=buffer_size)
+
+    def write(self, poem_name: str, analysis: dict[str, Any]) -> None:
+        """Append one poem's analysis as a JSON line."""
+        self._file.write(json.dumps({"poem": poem_name, "analysis": analysis}, ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        """Flush buffered lines and close the file."""
+        self._file.close()
+
+    def __enter__(self) -> "JsonlCorpusWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+def read_jsonl_corpus(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Stream the records of a JSONL corpus.
+
+    Args:
+        path: The JSONL file written by JsonlCorpusWriter.
+
+    Yields:
+        Dictionaries with "poem" and "analysis" keys, one per line.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ColumnarCorpusWriter:
+    """
+    Writes syllables-per-line of many poems as flat binary arrays with offset indexes.
+
+    Methods:
+        write: Buffers a poem's syllable counts.
+        flush: Appends buffered arrays to disk.
+        close: Flushes and writes the metadata file.
+    """
+
+    def __init__(self, directory: str | Path, append: bool = False) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._line_count = 0
+        self._stanza_count = 0
+        self._poem_count = 0
+        if append and (self.directory / META_FILE).exists():
+            meta = json.loads((self.directory / META_FILE).read_text(encoding="utf-8"))
+            self._line_count = meta["lines"]
+            self._stanza_count = meta["stanzas"]
+            self._poem_count = meta["poems"]
+        else:
+            # Offset arrays start with a leading zero, like Arrow offsets
+            for name, typecode in ((SYLLABLES_FILE, "i"), (STANZA_OFFSETS_FILE, "q"), (POEM_OFFSETS_FILE, "q")):
+                with open(self.directory / name, "wb") as file:
+                    if typecode == "q":
+                        array("q", [0]).tofile(file)
+            (self.directory / POEM_NAMES_FILE).write_text("", encoding="utf-8")
+
+        self._syllables = array("i")
+        self._stanza_offsets = array("q")
+        self._poem_offsets = array("q")
+        self._names: list[str] = []
+
+    def write(self, poem_name: str, analysis: dict[str, Any]) -> None:
+        """
+        Buffer one poem's syllables_per_line.
+
+        Args:
+            poem_name: Name stored alongside the poem.
+            analysis: The dictionary returned by analyze_poem.
+        """
+        for stanza_syllables in analysis["syllables_per_line"]:
+            self._syllables.extend(stanza_syllables)
+            self._line_count += len(stanza_syllables)
+            self._stanza_offsets.append(self._line_count)
+            self._stanza_count += 1
+        self._poem_offsets.append(self._stanza_count)
+        self._poem_count += 1
+        self._names.append(poem_name)
+
+        if len(self._names) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered arrays to their files."""
+        for name, values in ((SYLLABLES_FILE, self._syllables),
+                             (STANZA_OFFSETS_FILE, self._stanza_offsets),
+                             (POEM_OFFSETS_FILE, self._poem_offsets)):
+            with open(self.directory / name, "ab") as file:
+                values.tofile(file)
+            del values[:]
+        with open(self.directory / POEM_NAMES_FILE, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(name, ensure_ascii=False) + "\n" for name in self._names)
+        self._names.clear()
+
+    def close(self) -> None:
+        """Flush buffered poems and record the array sizes and byte order."""
+        self.flush()
+        meta = {
+            "format": "oracle-columnar-1",
+            "byteorder": sys.byteorder,
+            "poems": self._poem_count,
+            "stanzas": self._stanza_count,
+            "lines": self._line_count,
+            "dtypes": {SYLLABLES_FILE: "int32", STANZA_OFFSETS_FILE: "int64", POEM_OFFSETS_FILE: "int64"},
+        }
+        (self.directory / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    def __enter__(self) -> "ColumnarCorpusWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+class ColumnarCorpus:
+    """
+    Read-only, memory-mapped view of a columnar corpus directory.
+
+    Attributes:
+        syllables (memoryview): Syllable count of every line, as int32.
+        stanza_offsets (memoryview): Stanza boundaries into syllables, as int64.
+        poem_offsets (memoryview): Poem boundaries into stanza_offsets, as int64.
+
+    Methods:
+        poem_names: Returns the poem names in write order.
+        poem_syllables: Returns one poem's syllables per line, grouped by stanza.
+        close: Releases the memory maps.
+
+    Note:
+        The arrays are zero-copy views over the files; e.g. sum(corpus.syllables)
+        or numpy.frombuffer(corpus.syllables, dtype=numpy.int32) never load a copy.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / META_FILE).read_text(encoding="utf-8"))
+        if self.meta["byteorder"] != sys.byteorder:
+            raise ValueError("Corpus was written on a machine with a different byte order")
+
+        self._maps: list[mmap.mmap] = []
+        self._views: list[memoryview] = []
+        self.syllables = self._map(SYLLABLES_FILE, "i")
+        self.stanza_offsets = self._map(STANZA_OFFSETS_FILE, "q")
+        self.poem_offsets = self._map(POEM_OFFSETS_FILE, "q")
+
+    def _map(self, name: str, typecode: Literal["i", "q"]) -> memoryview:
+        with open(self.directory / name, "rb") as file:
+            if file.seek(0, 2) == 0:
+                return memoryview(b"").cast(typecode)
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        raw = memoryview(mapped)
+        self._views.append(raw)
+        return raw.cast(typecode)
+
+    def __len__(self) -> int:
+        return int(self.meta["poems"])
+
+    def poem_names(self) -> list[str]:
+        """Return the poem names in the order they were written."""
+        with open(self.directory / POEM_NAMES_FILE, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def poem_syllables(self, index: int) -> list[list[int]]:
+        """
+        Return one poem's syllables_per_line.
+
+        Args:
+            index: Position of the poem in write order.
+
+        Returns:
+            Syllable counts per line, grouped by stanza.
+        """
+        first_stanza, end_stanza = self.poem_offsets[index], self.poem_offsets[index + 1]
+        return [
+            self.syllables[self.stanza_offsets[stanza]:self.stanza_offsets[stanza + 1]].tolist()
+            for stanza in range(first_stanza, end_stanza)
+        ]
+
+    def close(self) -> None:
+        """Release the memory maps; the array views must not be used afterwards."""
+        for view in (self.syllables, self.stanza_offsets, self.poem_offsets, *self._views):
+            view.release()
+        self._views.clear()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+    def __enter__(self) -> "ColumnarCorpus":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
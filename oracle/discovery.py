@@ -0,0 +1,160 @@
+"""
+Discovery module for finding poem files in a folder.
+
+Walks folders with os.scandir and yields poem files as a stream, deciding
+emptiness from the file size and a bounded peek instead of reading every file
+in full. Small files keep the peeked bytes, so the analysis step does not have
+to read them a second time.
+"""
+
+import os
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+
+DEFAULT_INCLUDE = ("*.txt", "*.md")
+DEFAULT_EXCLUDE = ("*_analysis.txt",)
+
+# Files up to this size are read completely by the emptiness check and kept in memory
+PEEK_BYTES = 64 * 1024
+
+
+@dataclass
+class PoemFile:
+    """
+    A discovered, non-empty poem file.
+
+    Attributes:
+        path (Path): Full path of the file.
+        name (str): Path relative to the discovery root, using forward slashes.
+        size (int): File size in bytes when it was discovered.
+
+    Methods:
+        read_bytes: Returns the raw content, reading the file at most once.
+        read_text: Returns the content decoded as UTF-8 with normalized newlines.
+    """
+
+    path: Path
+    name: str
+    size: int
+    _content: bytes | None = field(default=None, repr=False)
+
+    def read_bytes(self) -> bytes:
+        """Return the raw file content, reusing the bytes read during discovery."""
+        if self._content is None:
+            self._content = self.path.read_bytes()
+        return self._content
+
+    def read_text(self) -> str:
+        """Return the file content as text, the same as reading it in text mode."""
+        text = self.read_bytes().decode("utf-8")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _matches(name: str, relative_name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatchcase(name, pattern) or fnmatchcase(relative_name, pattern)
+               for pattern in patterns)
+
+
+def _peek_non_empty(path: Path, size: int) -> tuple[bool, bytes | None]:
+    """
+    Check whether a file holds anything besides whitespace.
+
+    Args:
+        path: The file to check.
+        size: The file size reported by the directory entry.
+
+    Returns:
+        A tuple of (non_empty, content), where content holds the whole file
+        if it fit into the peek and None otherwise.
+    """
+    with open(path, "rb") as file:
+        chunk = file.read(PEEK_BYTES)
+        if len(chunk) >= size:
+            return chunk.decode("utf-8", errors="ignore").strip() != "", chunk
+
+        # Large file: keep reading only while everything so far is whitespace
+        while chunk:
+            if chunk.decode("utf-8", errors="ignore").strip():
+                return True, None
+            chunk = file.read(PEEK_BYTES)
+        return False, None
+
+
+def iter_candidate_files(folder_path: str | Path, recursive: bool = False,
+                         include: Sequence[str] = DEFAULT_INCLUDE,
+                         exclude: Sequence[str] = DEFAULT_EXCLUDE) -> Iterator[tuple[os.DirEntry[str], str]]:
+    """
+    Yield directory entries whose names pass the include/exclude patterns.
+
+    Args:
+        folder_path: The folder to search.
+        recursive: Also descend into subfolders (hidden folders are skipped).
+        include: Glob patterns a file name must match.
+        exclude: Glob patterns, matched against the file name or its relative path,
+            that rule a file out.
+
+    Yields:
+        Tuples of (entry, relative_name) in directory order, without opening the files.
+    """
+    root = Path(folder_path)
+    pending = [root]
+
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if recursive and not entry.name.startswith("."):
+                            pending.append(Path(entry.path))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                relative_name = Path(entry.path).relative_to(root).as_posix()
+                if _matches(entry.name, relative_name, include) \
+                        and not _matches(entry.name, relative_name, exclude):
+                    yield entry, relative_name
+
+
+def iter_poem_files(folder_path: str | Path, recursive: bool = False,
+                    include: Sequence[str] = DEFAULT_INCLUDE,
+                    exclude: Sequence[str] = DEFAULT_EXCLUDE) -> Iterator[PoemFile]:
+    """
+    Yield the non-empty poem files in a folder as they are found.
+
+    Args:
+        folder_path: The folder to search.
+        recursive: Also descend into subfolders (hidden folders are skipped).
+        include: Glob patterns a file name must match, defaults to *.txt and *.md.
+        exclude: Glob patterns, matched against the file name or its relative path,
+            that rule a file out. Defaults to skipping '_analysis.txt' outputs.
+
+    Yields:
+        PoemFile objects in directory order.
+
+    Note:
+        Empty and whitespace-only files are skipped without being read in full.
+        Files that vanish or become unreadable during the walk are skipped.
+    """
+    for entry, relative_name in iter_candidate_files(folder_path, recursive, include, exclude):
+        try:
+            size = entry.stat().st_size
+            if size == 0:
+                continue
+            non_empty, content = _peek_non_empty(Path(entry.path), size)
+        except OSError:
+            continue
+
+        if non_empty:
+            yield PoemFile(path=Path(entry.path), name=relative_name, size=size, _content=content)
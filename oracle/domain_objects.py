@@ -3,10 +3,30 @@ Module for domain objects used in poem analysis.
 """
 
 
-from dataclasses import dataclass
-from oracle.syllable_counter import count_syllables
+from dataclasses import dataclass, field
+from functools import cached_property
+from oracle.syllable_counter import count_syllables, count_form_syllables
+from oracle.tokenizer import TokenForm, TokenizedLine, tokenize_line
 from typing import cast
 
+
+def possible_syllable_totals(word_variants: list[list[int]]) -> list[int]:
+    """
+    Get every total of choosing one syllable variant per word, e.g. from get_all_syllable_variants.
+
+    Returns:
+        The achievable totals in ascending order.
+    """
+    totals = 1
+    for variants in word_variants:
+        shifted = 0
+        for variant in variants:
+            # Elision estimates can drop below zero for vowel-less words
+            shifted |= totals << max(variant, 0)
+        totals = shifted
+    return [total for total in range(totals.bit_length()) if totals >> total & 1]
+
+
 @dataclass
 class Word:
     """
@@ -14,6 +34,7 @@ class Word:
     
     Attributes:
         text (str): The text of the word.
+        form (TokenForm | None): The normalized token, when the word comes from a tokenized line.
 
     Methods:
         syllable_variants: Returns a list of possible syllable counts for the word.
@@ -24,10 +45,13 @@ class Word:
     """
 
     text: str
+    form: TokenForm | None = field(default=None, compare=False, repr=False)
 
     @property
     def syllable_variants(self) -> list[int]:
         """Returns a list of possible syllable counts for the word."""
+        if self.form is not None:
+            return count_form_syllables(self.form)
         return count_syllables(self.text)
 
 
@@ -42,6 +66,7 @@ class Line:
     Methods:
         get_total_syllables: Returns the total number of syllables in the line.
         get_all_syllable_variants: Returns all unique syllable variants per word for pattern analysis.
+        get_possible_syllable_totals: Returns every total the line can have across word variants.
         get_syllable_counts: Returns syllable counts for words in the line.
 
     Note:
@@ -69,6 +94,20 @@ class Line:
         """Get all unique syllable variants per word for pattern analysis."""
         return cast(list[list[int]], self.get_syllable_counts(use_all_variants=True))
 
+    def get_possible_syllable_totals(self) -> list[int]:
+        """
+        Get every syllable total the line can have, choosing one variant per word.
+
+        Returns:
+            The achievable totals in ascending order, e.g. [4, 5, 6] for "every fire burns".
+
+        Note:
+            The totals are kept as bits of one integer (bit n set = n syllables reachable),
+            so adding a word is a shift-and-or per variant instead of enumerating
+            every combination of variants.
+        """
+        return possible_syllable_totals(self.get_all_syllable_variants())
+
     def get_syllable_counts(self, use_all_variants: bool = False) -> list[int] | list[list[int]]:
         """
         Get syllable counts for words in the line.
@@ -82,27 +121,21 @@ class Line:
             When True: [[1], [2,1], [1]] (unique variants per word)
         """
 
+        forms = self.tokenized.forms
         if use_all_variants:
-            return [self._get_unique_variants(word.syllable_variants)
-                    for word in self.line_chain_of_words]
+            return [self._get_unique_variants(count_form_syllables(form)) for form in forms]
         else:
-            return [word.syllable_variants[0] for word in self.line_chain_of_words]
+            return [count_form_syllables(form)[0] for form in forms]
         
+    @cached_property
+    def tokenized(self) -> TokenizedLine:
+        """Return the line's lowercase words and hyphen-split tokens, computed once."""
+        return tokenize_line(self.text)
+
     @property
     def line_chain_of_words(self) -> list[Word]:
         """Split line text into words, handling compound words with dashes."""
-        words_in_line = self.text.split()
-        result = []
-    
-        for word in words_in_line:
-            if "-" in word:
-                # Split compound words on dashes
-                parts = word.split("-")
-                result.extend([Word(text=part) for part in parts])
-            else:
-                result.append(Word(text=word))
-    
-        return result
+        return [Word(text=form[0], form=form) for form in self.tokenized.forms]
 
     @staticmethod
     def _get_unique_variants(variants: list[int]) -> list[int]:
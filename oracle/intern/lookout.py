@@ -4,6 +4,7 @@ Performance monitoring utilities for the Oracle of the Abyss.
 
 import time 
 import os
+import sys
 from functools import wraps
 from typing import Callable, TypeVar, ParamSpec
 
@@ -19,6 +20,10 @@ def watch_running_time_of_function(func: Callable[Parameters, Result]) -> Callab
     
     Returns:
         A wrapped function that prints its execution time.
+
+    Note:
+        Timing is enabled by ORACLE_LOOKOUT=1 and printed to stdout, or to
+        stderr when ORACLE_LOOKOUT_STDERR=1 (stdout may carry NDJSON output).
     """
     @wraps(func)
     def wrapper(*args: Parameters.args, **kwargs: Parameters.kwargs) -> Result:
@@ -26,7 +31,8 @@ def watch_running_time_of_function(func: Callable[Parameters, Result]) -> Callab
             start = time.time()
             result = func(*args, **kwargs)
             elapsed = time.time() - start
-            print(f"{func.__name__}: {elapsed:.3f}s")
+            output = sys.stderr if os.getenv("ORACLE_LOOKOUT_STDERR") == "1" else sys.stdout
+            print(f"{func.__name__}: {elapsed:.3f}s", file=output)
             return result
         
         return func(*args, **kwargs)
@@ -0,0 +1,564 @@
+"""
+Jobs module for analyzing large corpora in the background.
+
+A JobQueue keeps jobs and their poems in a SQLite file: the poems of a job are
+either stored inline or discovered in a server-local folder, and every poem's
+result is written back as it completes. A JobRunner thread claims unfinished
+jobs and analyzes their pending poems with a bounded number in flight, so an
+API request only has to submit the job and return its id.
+
+Claims are leases that a heartbeat thread renews while the runner works, also
+during a single slow poem. A job whose runner died (a crash or restart) keeps
+its recorded results and is resumed by the next runner once the lease has expired.
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from oracle.analyzer import analyze_poem
+from oracle.discovery import iter_poem_files
+from oracle.poem_model import Poem
+
+
+JOBS_DB_ENV = "ORACLE_JOBS_DB"
+JOBS_WORKERS_ENV = "ORACLE_JOBS_WORKERS"
+JOBS_ROOT_ENV = "ORACLE_JOBS_ROOT"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    folder TEXT,
+    recursive INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    poem_text TEXT,
+    file_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    analysis TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items(job_id, status, position);
+"""
+
+# Job states; "running" jobs whose lease expired are picked up again
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Seconds a claimed job stays reserved without being renewed
+LEASE_SECONDS = 30.0
+
+# Results written per transaction
+RECORD_EVERY = 64
+
+# Pending poems fetched from the database at a time
+FETCH_SIZE = 256
+
+# Seconds a process waits for another one holding the write lock
+BUSY_TIMEOUT = 30.0
+
+# Attempts at switching a new database to WAL while other processes open it too
+SETUP_ATTEMPTS = 5
+
+
+@dataclass
+class JobStatus:
+    """
+    Progress of a job.
+
+    Attributes:
+        id (str): The job id.
+        status (str): "queued", "running", "done" or "failed".
+        total (int | None): Number of poems, None until a folder job has been scanned.
+        done (int): Poems analyzed successfully.
+        failed (int): Poems whose analysis failed.
+        error (str | None): Why the whole job failed, e.g. a missing folder.
+        created_at (float): Submission time as a Unix timestamp.
+        updated_at (float): Time of the last recorded progress.
+    """
+
+    id: str
+    status: str
+    total: int | None
+    done: int
+    failed: int
+    error: str | None
+    created_at: float
+    updated_at: float
+
+
+@dataclass
+class JobResult:
+    """
+    The result of one poem of a job.
+
+    Attributes:
+        position (int): Index of the poem within the job.
+        title (str): The poem title, or the file name relative to the job's folder.
+        analysis (dict[str, Any]): analyze_poem output, empty on failure.
+        error (str | None): Error message if the analysis failed.
+    """
+
+    position: int
+    title: str
+    analysis: dict[str, Any]
+    error: str | None
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of analysis jobs and their per-poem results.
+
+    Methods:
+        submit_poems: Queues a job for inline (title, poem_text) pairs.
+        submit_folder: Queues a job for the poems in a server-local folder.
+        status: Returns a job's progress.
+        results: Returns a page of a job's finished poems.
+        claim_next: Reserves the oldest unfinished job for a runner.
+        renew, record, release, finish: Update a claimed job on behalf of its runner.
+        close: Closes the connection.
+
+    Note:
+        A JobQueue holds one connection and is meant for one thread; the API
+        opens a queue per request and the runner keeps its own.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        self._set_up(self._connection)
+        self._connection.execute("PRAGMA foreign_keys=ON")
+
+    @staticmethod
+    def _set_up(connection: sqlite3.Connection) -> None:
+        # Changing the journal mode can fail right away, without waiting for the
+        # busy timeout, when several server workers open a new database at once
+        for attempt in range(1, SETUP_ATTEMPTS + 1):
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                return
+            except sqlite3.OperationalError:
+                if attempt == SETUP_ATTEMPTS:
+                    raise
+                time.sleep(0.05 * attempt)
+
+    def submit_poems(self, poems: Iterable[tuple[str, str]]) -> str:
+        """
+        Queue a job for poems sent with the request.
+
+        Args:
+            poems: (title, poem_text) pairs.
+
+        Returns:
+            The new job's id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, now, now),
+            )
+            self._connection.executemany(
+                "INSERT INTO job_items (job_id, position, title, poem_text) VALUES (?, ?, ?, ?)",
+                ((job_id, position, title, poem_text) for position, (title, poem_text) in enumerate(poems)),
+            )
+            total = self._connection.execute("SELECT COUNT(*) FROM job_items WHERE job_id = ?",
+                                             (job_id,)).fetchone()[0]
+            self._connection.execute("UPDATE jobs SET total = ? WHERE id = ?", (total, job_id))
+        return job_id
+
+    def submit_folder(self, folder: str | Path, recursive: bool = False) -> str:
+        """
+        Queue a job for the poem files in a folder on the server.
+
+        Args:
+            folder: The folder; it is scanned when the job starts.
+            recursive: Also analyze poems in subfolders.
+
+        Returns:
+            The new job's id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, status, folder, recursive, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, str(folder), int(recursive), now, now),
+            )
+        return job_id
+
+    def status(self, job_id: str) -> JobStatus | None:
+        """Return a job's progress, or None if there is no such job."""
+        row = self._connection.execute(
+            "SELECT id, status, total, done, failed, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        return JobStatus(*row) if row is not None else None
+
+    def results(self, job_id: str, cursor: int = 0, limit: int = 100) -> tuple[list[JobResult], int | None]:
+        """
+        Return finished poems of a job in order of their position.
+
+        Args:
+            job_id: The job.
+            cursor: Smallest position to return, 0 for the first page.
+            limit: Maximum number of results.
+
+        Returns:
+            The results and the cursor of the next page, None when no further poems have finished yet.
+        """
+        rows = self._connection.execute(
+            "SELECT position, title, analysis, error FROM job_items "
+            "WHERE job_id = ? AND status != 'pending' AND position >= ? ORDER BY position LIMIT ?",
+            (job_id, cursor, limit),
+        ).fetchall()
+        results = [JobResult(position=position, title=title, analysis=json.loads(analysis) if analysis else {},
+                             error=error)
+                   for position, title, analysis, error in rows]
+        next_cursor = results[-1].position + 1 if len(results) == limit else None
+        return results, next_cursor
+
+    def claim_next(self, owner: str, lease_seconds: float = LEASE_SECONDS) -> str | None:
+        """
+        Reserve the oldest job that is queued or whose runner's lease has expired.
+
+        Args:
+            owner: Identifies the claiming runner.
+            lease_seconds: How long the claim lasts unless renewed.
+
+        Returns:
+            The claimed job's id, or None if no job is available.
+        """
+        now = time.time()
+        with self._connection:
+            row = self._connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND (lease_expires IS NULL OR lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            # Another runner may have claimed the job since the SELECT
+            claimed = self._connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                (RUNNING, owner, now + lease_seconds, now, row[0], now),
+            ).rowcount
+        return str(row[0]) if claimed else None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        """Extend a claim; returns False if the job is no longer held by this owner."""
+        with self._connection:
+            return self._connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, owner),
+            ).rowcount == 1
+
+    def job_folder(self, job_id: str) -> tuple[str | None, bool, bool]:
+        """Return (folder, recursive, scanned) of a job; folder is None for inline jobs."""
+        folder, recursive, total = self._connection.execute(
+            "SELECT folder, recursive, total FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return folder, bool(recursive), total is not None
+
+    def add_folder_items(self, job_id: str, files: Iterable[tuple[str, str]]) -> None:
+        """
+        Record the poem files of a folder job, replacing an interrupted earlier scan.
+
+        Args:
+            job_id: The job.
+            files: (name relative to the folder, file path) pairs.
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            self._connection.executemany(
+                "INSERT INTO job_items (job_id, position, title, file_path) VALUES (?, ?, ?, ?)",
+                ((job_id, position, name, file_path) for position, (name, file_path) in enumerate(files)),
+            )
+            total = self._connection.execute("SELECT COUNT(*) FROM job_items WHERE job_id = ?",
+                                             (job_id,)).fetchone()[0]
+            self._connection.execute("UPDATE jobs SET total = ?, updated_at = ? WHERE id = ?",
+                                     (total, time.time(), job_id))
+
+    def iter_pending(self, job_id: str) -> Iterator[tuple[int, str, str | None, str | None]]:
+        """Yield (position, title, poem_text, file_path) of unfinished poems, a page at a time."""
+        position = -1
+        while True:
+            rows = self._connection.execute(
+                "SELECT position, title, poem_text, file_path FROM job_items "
+                "WHERE job_id = ? AND status = 'pending' AND position > ? ORDER BY position LIMIT ?",
+                (job_id, position, FETCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            position = rows[-1][0]
+
+    def record(self, job_id: str, owner: str, results: Iterable[tuple[int, str | None, str | None]],
+               lease_seconds: float = LEASE_SECONDS) -> bool:
+        """
+        Store finished poems and renew the claim in one transaction.
+
+        Args:
+            job_id: The job.
+            owner: The runner holding the job.
+            results: (position, analysis JSON or None, error or None) triples.
+            lease_seconds: The renewed claim's duration.
+
+        Returns:
+            False, without storing anything, if the job is no longer held by this owner.
+        """
+        results = list(results)
+        failed = sum(1 for _, _, error in results if error is not None)
+        now = time.time()
+        with self._connection:
+            renewed = self._connection.execute(
+                "UPDATE jobs SET done = done + ?, failed = failed + ?, updated_at = ?, lease_expires = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (len(results) - failed, failed, now, now + lease_seconds, job_id, owner),
+            ).rowcount == 1
+            if not renewed:
+                return False
+            self._connection.executemany(
+                "UPDATE job_items SET status = ?, analysis = ?, error = ? "
+                "WHERE job_id = ? AND position = ? AND status = 'pending'",
+                [("failed" if error is not None else "done", analysis, error, job_id, position)
+                 for position, analysis, error in results],
+            )
+        return True
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Give up a claim so that the job can be resumed right away."""
+        with self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET lease_owner = NULL, lease_expires = NULL WHERE id = ? AND lease_owner = ?",
+                (job_id, owner),
+            )
+
+    def finish(self, job_id: str, owner: str, error: str | None = None) -> None:
+        """Mark a claimed job as done, or as failed with an error, and release it."""
+        with self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND lease_owner = ?",
+                (FAILED if error is not None else DONE, error, time.time(), job_id, owner),
+            )
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._connection.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+def analyze_job_item(title: str, poem_text: str | None, file_path: str | None) -> tuple[str | None, str | None]:
+    """
+    Analyze one poem of a job; runs in a worker process.
+
+    Args:
+        title: The poem title, used for inline poems.
+        poem_text: The inline text, or None to read file_path.
+        file_path: The poem file of a folder job.
+
+    Returns:
+        (analysis as JSON, None) on success, (None, error message) on failure.
+    """
+    try:
+        if poem_text is None:
+            path = Path(str(file_path))
+            poem_text = path.read_text(encoding="utf-8")
+        else:
+            path = Path(f"{title}.txt")
+        analysis = analyze_poem(Poem(text=poem_text, filepath=path))
+        return json.dumps(analysis, ensure_ascii=False), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _warm_up_worker() -> None:
+    """Process pool initializer: load the CMU lexicon once per worker process."""
+    from oracle.syllable_counter import count_syllables
+    count_syllables("warm")
+
+
+class JobRunner:
+    """
+    Background thread that works through the jobs of a JobQueue.
+
+    Attributes:
+        path (Path): The job database.
+        workers (int): Worker processes; 1 analyzes in the runner thread.
+        window (int): Maximum number of poems in flight.
+        owner (str): Identifies this runner's claims.
+
+    Methods:
+        start: Starts the background thread.
+        notify: Wakes the thread after a job was submitted.
+        run_pending: Processes every available job in the calling thread.
+        stop: Stops the thread after the poems in flight are recorded.
+    """
+
+    def __init__(self, path: str | Path, workers: int = 1, window: int | None = None,
+                 poll_interval: float = 5.0, lease_seconds: float = LEASE_SECONDS) -> None:
+        self.path = Path(path)
+        self.workers = max(1, workers)
+        self.window = window or self.workers * 4
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start processing jobs in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="oracle-job-runner", daemon=True)
+            self._thread.start()
+
+    def notify(self) -> None:
+        """Look for new jobs right away instead of at the next poll."""
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the thread; unfinished jobs are resumed by the next runner."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self.run_pending()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def run_pending(self) -> int:
+        """
+        Claim and process jobs until none is left.
+
+        Returns:
+            The number of jobs processed.
+        """
+        processed = 0
+        executor: Executor | None = None
+        try:
+            with JobQueue(self.path) as queue:
+                while not self._stopping.is_set():
+                    job_id = queue.claim_next(self.owner, self.lease_seconds)
+                    if job_id is None:
+                        break
+                    if executor is None and self.workers > 1:
+                        # Spawned workers do not inherit the locks of the server's other threads
+                        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up_worker,
+                                                       mp_context=multiprocessing.get_context("spawn"))
+                    with self._renewing_lease(job_id):
+                        self._process_job(queue, job_id, executor)
+                    processed += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return processed
+
+    @contextmanager
+    def _renewing_lease(self, job_id: str) -> Iterator[None]:
+        """Renew a job's lease from a heartbeat thread, so one slow poem does not let it expire."""
+        done = threading.Event()
+
+        def heartbeat() -> None:
+            # The runner's queue belongs to the runner thread, so the heartbeat has its own
+            with JobQueue(self.path) as queue:
+                while not done.wait(self.lease_seconds / 3):
+                    if not queue.renew(job_id, self.owner, self.lease_seconds):
+                        return
+
+        thread = threading.Thread(target=heartbeat, name="oracle-job-lease", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _process_job(self, queue: JobQueue, job_id: str, executor: Executor | None) -> None:
+        folder, recursive, scanned = queue.job_folder(job_id)
+        if folder is not None and not scanned:
+            if not Path(folder).is_dir():
+                queue.finish(job_id, self.owner, error=f"'{folder}' is not a directory")
+                return
+            queue.add_folder_items(job_id, ((poem_file.name, str(poem_file.path))
+                                            for poem_file in iter_poem_files(folder, recursive=recursive)))
+
+        pending: list[tuple[int, str | None, str | None]] = []
+        # Results are also recorded on a timer, so the job's progress shows while slow poems run
+        record_interval = self.lease_seconds / 3
+        last_record = time.monotonic()
+        for result in self._analyze(queue.iter_pending(job_id), executor):
+            pending.append(result)
+            if len(pending) >= RECORD_EVERY or time.monotonic() - last_record > record_interval \
+                    or self._stopping.is_set():
+                if not queue.record(job_id, self.owner, pending, self.lease_seconds):
+                    return
+                pending = []
+                last_record = time.monotonic()
+                if self._stopping.is_set():
+                    queue.release(job_id, self.owner)
+                    return
+        if queue.record(job_id, self.owner, pending, self.lease_seconds):
+            queue.finish(job_id, self.owner)
+
+    def _analyze(self, items: Iterator[tuple[int, str, str | None, str | None]],
+                 executor: Executor | None) -> Iterator[tuple[int, str | None, str | None]]:
+        if executor is None:
+            for position, title, poem_text, file_path in items:
+                yield (position, *analyze_job_item(title, poem_text, file_path))
+            return
+
+        # Bound the number of poems held in memory while the queue is still being read
+        in_flight: dict[Future[tuple[str | None, str | None]], int] = {}
+        for position, title, poem_text, file_path in items:
+            if len(in_flight) >= self.window:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield (in_flight.pop(future), *future.result())
+            if self._stopping.is_set():
+                break
+            in_flight[executor.submit(analyze_job_item, title, poem_text, file_path)] = position
+        for future in list(in_flight):
+            yield (in_flight.pop(future), *future.result())
@@ -0,0 +1,102 @@
+"""
+Lexicon module for compiling syllable lookup tables.
+
+Turns CMUdict pronunciations and an optional user lexicon into one flat
+word -> syllable counts table, so count_syllables answers dictionary words
+with a single lookup no matter how many sources contributed to the table.
+
+User lexicon format (JSON object, words are matched in lowercase):
+    {
+        "voidborn": 2,                          a single syllable count
+        "oracle": [3, 2],                       several counts, most common first
+        "abyss'": ["AH0 B IH1 S"]               ARPABET pronunciations, counted by stress digits
+    }
+"""
+
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+
+LEXICON_ENV = "ORACLE_LEXICON"
+
+
+def count_pronunciation_syllables(pronunciation: Sequence[str]) -> int:
+    """Count the vowel phonemes (those carrying a stress digit) of a pronunciation."""
+    return len([phoneme for phoneme in pronunciation if phoneme[-1].isdigit()])
+
+
+def compile_pronunciations(dictionary: Mapping[str, Iterable[Sequence[str]]]) -> dict[str, list[int]]:
+    """
+    Convert a pronunciation dictionary such as CMUdict into syllable counts.
+
+    Args:
+        dictionary: Words mapped to their pronunciations.
+
+    Returns:
+        Words mapped to one syllable count per pronunciation, in the same order.
+    """
+    return {word: [count_pronunciation_syllables(pronunciation) for pronunciation in pronunciations]
+            for word, pronunciations in dictionary.items()}
+
+
+def _parse_entry(word: str, entry: Any) -> list[int]:
+    values = entry if isinstance(entry, list) else [entry]
+    counts = []
+    for value in values:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            counts.append(value)
+        elif isinstance(value, str) and value.split():
+            counts.append(count_pronunciation_syllables(value.split()))
+        else:
+            raise ValueError(f"Invalid lexicon entry for '{word}': {value!r}")
+    if not counts:
+        raise ValueError(f"Lexicon entry for '{word}' is empty")
+    return counts
+
+
+def parse_lexicon(data: Any) -> dict[str, list[int]]:
+    """
+    Validate a decoded user lexicon.
+
+    Args:
+        data: The decoded JSON document.
+
+    Returns:
+        Lowercase words mapped to their syllable counts.
+
+    Raises:
+        ValueError: If the document is not a lexicon or an entry is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("A lexicon must be a JSON object mapping words to syllable counts")
+    return {word.lower(): _parse_entry(word, entry) for word, entry in data.items()}
+
+
+def load_lexicon_file(path: str | Path) -> dict[str, list[int]]:
+    """
+    Read and validate a user lexicon file.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON or not a valid lexicon.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return parse_lexicon(json.load(file))
+
+
+def merge_lexicon(base: Mapping[str, list[int]], overlay: Mapping[str, list[int]]) -> dict[str, list[int]]:
+    """
+    Build a new lookup table where overlay entries replace base entries.
+
+    Args:
+        base: The compiled main dictionary, left unchanged.
+        overlay: The compiled user lexicon.
+
+    Returns:
+        A new table; callers swap it in with a single assignment.
+    """
+    table = dict(base)
+    table.update(overlay)
+    return table
@@ -2,38 +2,47 @@
 Main module for the Oracle Poetry Analyzer.
 """
 
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
 from oracle.analyzer import analyze_poem
 from pathlib import Path
 from oracle.poem_model import Poem
+from oracle.discovery import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, PoemFile, iter_poem_files
+from oracle.manifest import AnalysisManifest, hash_poem_content
+from oracle.utils import write_text_atomically
+from oracle.watcher import PollingWatcher
+from oracle.streaming import DEFAULT_DELIMITER, run_stream
+from oracle.corpus_output import ColumnarCorpusWriter, JsonlCorpusWriter
+from oracle.store import AnalysisStore
 from oracle.intern.lookout import watch_running_time_of_function
 
 # TODO improve read_poem_file_and_return_content with error handling
 # TODO improve write_poem_analysis to format analysis nicely
 
+TaskResult = TypeVar('TaskResult')
 
 
-def read_poem_folder_and_return_names(folder_path: str) -> list[str]:
+def read_poem_folder_and_return_names(folder_path: str, recursive: bool = False) -> list[str]:
     """
     Reads only .txt and .md files' names from the specified folder and returns a 
     list that contains names of those files.
     
     Args:
         folder_path: The path to the folder containing poem files.
+        recursive: Also include poems from subfolders, named by their relative path.
     
     Returns:
         A list of poem file names.
-    """
 
-    poem_texts = []
-    folder = Path(folder_path)
+    Note:
+        Built on iter_poem_files, which checks emptiness from the file size and a
+        bounded peek instead of reading every file in full.
+    """
 
-    # Support both .txt and .md files
-    for file_path in list(folder.glob("*.txt")) + list(folder.glob("*.md")):
-        if not file_path.name.endswith("_analysis.txt"):
-            with open(file_path, 'r', encoding='utf-8') as file:
-                if file.read().strip() != "":
-                    poem_texts.append(file_path.name)
-    return poem_texts
+    return [poem_file.name for poem_file in iter_poem_files(folder_path, recursive=recursive)]
 
 
 
@@ -63,14 +72,21 @@ def read_poem_file_and_return_content(file_path: str) -> str:
 
 
 
+def analysis_output_path(input_path: Path) -> Path:
+    """Return the '_analysis.txt' path written next to a poem file."""
+    return input_path.with_name(input_path.stem + "_analysis.txt")
+
+
 # TODO: figure out where poetic devices should be handled and how should they be printed
 
-def write_poem_analysis(file_path: str) -> None:
+def write_poem_analysis(file_path: str, poem_text: str | None = None) -> None:
     """
     Analyzes a poem and writes the results to a text file.
     
     Args:
         file_path: The path to the poem file to analyze.
+        poem_text: The poem's content if the caller already read it,
+            otherwise the file is read here.
     
     Note:
         Creates an output file with '_analysis.txt' suffix containing
@@ -78,57 +94,386 @@ def write_poem_analysis(file_path: str) -> None:
     """
     input_path = Path(file_path)
 
-    poem_text = read_poem_file_and_return_content(file_path)
+    if poem_text is None:
+        poem_text = read_poem_file_and_return_content(file_path)
     poem_obj = Poem(text=poem_text, filepath=input_path)
 
     analysis_result = analyze_poem(poem_obj)
     
-    output_path = input_path.with_name(input_path.stem + "_analysis.txt")
-    with open(output_path, 'w', encoding='utf-8') as file:
-        # Iterate through each stanza's data together
-        for i, (text, line_count, syllables, poetic_devices) in enumerate(
-            zip(
-                analysis_result['stanza_texts'],
-                analysis_result['line_counts'],
-                analysis_result['syllables_per_line'],
-                analysis_result['poetic_devices']
-            ), start=1
-        ):
-            file.write(f"Stanza {i}:\n")
-            file.write(f"{text}\n")
-            file.write(f"Lines: {line_count}\n")
-            file.write(f"Syllables per line: {syllables}\n\n")
-            if poetic_devices:
-                file.write(f"Anaphora: {poetic_devices}\n\n")
+    output_path = analysis_output_path(input_path)
+    write_text_atomically(output_path, format_poem_analysis(analysis_result))
+
+
+def format_poem_analysis(analysis_result: dict[str, list[str] | list[int] | list[list[int]] | list[list[str]] | list[list[list[int]]]]) -> str:
+    """
+    Format an analyze_poem result as the text written to '_analysis.txt' files.
+
+    Args:
+        analysis_result: The dictionary returned by analyze_poem.
+
+    Returns:
+        The stanza-by-stanza report.
+    """
+    parts = []
+    # Iterate through each stanza's data together
+    for i, (text, line_count, syllables, poetic_devices) in enumerate(
+        zip(
+            analysis_result['stanza_texts'],
+            analysis_result['line_counts'],
+            analysis_result['syllables_per_line'],
+            analysis_result['poetic_devices']
+        ), start=1
+    ):
+        parts.append(f"Stanza {i}:\n")
+        parts.append(f"{text}\n")
+        parts.append(f"Lines: {line_count}\n")
+        parts.append(f"Syllables per line: {syllables}\n\n")
+        if poetic_devices:
+            parts.append(f"Anaphora: {poetic_devices}\n\n")
+    return "".join(parts)
+
+
+@dataclass
+class RunSummary:
+    """
+    Outcome of a folder run.
+
+    Attributes:
+        total (int): Number of poem files that were scheduled.
+        failures (dict[str, str]): Poem file name mapped to the error it raised.
+        elapsed (float): Wall-clock duration of the run in seconds.
+        skipped (int): Poems whose manifest entry was still up to date.
+        removed (list[str]): Deleted poems whose stale outputs were cleaned up.
+
+    Methods:
+        succeeded: Returns the number of poems analyzed without error.
+        files_per_second: Returns the run throughput.
+    """
+
+    total: int = 0
+    failures: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    skipped: int = 0
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        """Return the number of poems analyzed without error."""
+        return self.total - len(self.failures)
+
+    @property
+    def files_per_second(self) -> float:
+        """Return processed files per second of wall-clock time."""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _warm_up_worker() -> None:
+    """Process pool initializer: load the CMU lexicon once per worker process."""
+    from oracle.syllable_counter import count_syllables
+    count_syllables("warm")
+
+
+def _write_poem_analysis_safely(file_path: str, poem_text: str | None = None) -> str | None:
+    """Run write_poem_analysis and return the error message instead of raising."""
+    try:
+        write_poem_analysis(file_path, poem_text)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def _report_progress(done: int, poem_file_name: str, error: str | None) -> None:
+    status = f"FAILED ({error})" if error else "ok"
+    print(f"[{done}] {poem_file_name}: {status}")
+
+
+def _analyze_poem_text_safely(file_path: str, poem_text: str) -> tuple[dict[str, Any] | None, str | None]:
+    """Analyze a poem's text and return (analysis, None) or (None, error message)."""
+    try:
+        poem_obj = Poem(text=poem_text, filepath=Path(file_path))
+        return dict(analyze_poem(poem_obj)), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _run_poem_tasks(folder: Path, poems: Iterator[tuple[str, str]],
+                    task: Callable[[str, str], TaskResult], jobs: int) -> Iterator[tuple[str, TaskResult]]:
+    """
+    Run task(file_path, poem_text) for every poem, in this process or in a process pool.
+
+    Args:
+        folder: The folder poem names are relative to.
+        poems: (poem_file_name, poem_text) pairs, consumed lazily.
+        task: A picklable module-level function.
+        jobs: Number of worker processes; 1 runs the tasks in this process.
+
+    Yields:
+        (poem_file_name, result) pairs as tasks complete.
+    """
+    if jobs <= 1:
+        for poem_file_name, poem_text in poems:
+            yield poem_file_name, task(str(folder / poem_file_name), poem_text)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_up_worker) as executor:
+        # Bound the number of poems held in memory while the folder is still being walked
+        in_flight: dict[Future[TaskResult], str] = {}
+        for poem_file_name, poem_text in poems:
+            if len(in_flight) >= jobs * 4:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield in_flight.pop(future), future.result()
+            in_flight[executor.submit(task, str(folder / poem_file_name), poem_text)] = poem_file_name
+        for future in as_completed(in_flight):
+            yield in_flight[future], future.result()
+
+
+def _print_summary(summary: RunSummary) -> None:
+    print(f"Analyzed {summary.succeeded}/{summary.total} poems in {summary.elapsed:.2f}s "
+          f"({summary.files_per_second:.1f} files/sec), {len(summary.failures)} failed, "
+          f"{summary.skipped} unchanged, {len(summary.removed)} removed.")
+    for poem_file_name, error in summary.failures.items():
+        print(f"  {poem_file_name}: {error}")
 
 
 @watch_running_time_of_function
-def read_multiple_poem_files_and_write_analyses(folder_path: str = "user poems") -> None:
+def read_multiple_poem_files_and_write_analyses(folder_path: str = "user poems",
+                                                jobs: int = 1,
+                                                force: bool = False,
+                                                recursive: bool = False,
+                                                include: Sequence[str] = DEFAULT_INCLUDE,
+                                                exclude: Sequence[str] = DEFAULT_EXCLUDE) -> RunSummary | None:
     """
     Processes all poem files in a folder and generates analysis files.
     
     Args:
         folder_path: The path to the folder containing poem files.
+        jobs: Number of worker processes. 1 (default) analyzes files in this process,
+            higher values fan files out to a process pool.
+        force: Re-analyze every poem even if the manifest says its output is current.
+        recursive: Also process poems in subfolders.
+        include: Glob patterns of poem file names to process.
+        exclude: Glob patterns of file names or relative paths to leave out.
+
+    Returns:
+        A RunSummary with throughput and per-file failures, or None when
+        there was nothing to process.
     
     Note:
         Skips files ending with '_analysis.txt' to avoid reprocessing.
+        Files are discovered as a stream and each one is read once; the same
+        bytes are hashed for the manifest and handed to the analysis.
+        A manifest of content hashes in the folder lets unchanged poems be skipped,
+        and outputs of poems that were deleted are removed.
+        A poem that cannot be read as UTF-8 or fails to analyze is recorded in
+        the summary and does not abort the run.
         Prints progress and error messages to console.
     """
 
     folder = Path(folder_path)
     if not folder.exists() or not folder.is_dir():
         print(f"Error: The directory '{folder_path}' does not exist or is not a directory.")
-        return
+        return None
+
+    manifest = AnalysisManifest.load(folder)
+    summary = RunSummary()
+    seen_poem_file_names: set[str] = set()
+    content_hashes: dict[str, str] = {}
+    start = time.perf_counter()
 
-    poem_file_names = read_poem_folder_and_return_names(folder_path)
+    def record_result(poem_file_name: str, error: str | None) -> None:
+        summary.total += 1
+        if error:
+            summary.failures[poem_file_name] = error
+        else:
+            manifest.record(poem_file_name, content_hashes[poem_file_name],
+                            analysis_output_path(Path(poem_file_name)).as_posix())
+        _report_progress(summary.total, poem_file_name, error)
 
-    if not poem_file_names:
+    def iter_pending_poems() -> Iterator[tuple[str, str]]:
+        for poem_file in iter_poem_files(folder, recursive=recursive, include=include, exclude=exclude):
+            seen_poem_file_names.add(poem_file.name)
+            try:
+                content_hash = hash_poem_content(poem_file.read_bytes())
+                if not force and manifest.is_up_to_date(poem_file.name, content_hash):
+                    summary.skipped += 1
+                    continue
+                poem_text = poem_file.read_text()
+            except (OSError, UnicodeDecodeError) as e:
+                # A file that cannot be read or decoded fails on its own, like a poem that fails to analyze
+                record_result(poem_file.name, f"{type(e).__name__}: {e}")
+                continue
+            content_hashes[poem_file.name] = content_hash
+            yield poem_file.name, poem_text
+
+    for poem_file_name, error in _run_poem_tasks(folder, iter_pending_poems(), _write_poem_analysis_safely, jobs):
+        record_result(poem_file_name, error)
+
+    summary.removed = manifest.remove_deleted(seen_poem_file_names)
+    if summary.total or summary.removed:
+        manifest.save()
+
+    if not seen_poem_file_names:
         print(f"No valid poems found in '{folder_path}'.")
+        return None
+
+    summary.elapsed = time.perf_counter() - start
+    _print_summary(summary)
+    return summary
+
+
+@watch_running_time_of_function
+def export_poem_corpus(folder_path: str, output_path: str, output_format: str = "jsonl",
+                       jobs: int = 1,
+                       recursive: bool = False,
+                       include: Sequence[str] = DEFAULT_INCLUDE,
+                       exclude: Sequence[str] = DEFAULT_EXCLUDE) -> RunSummary | None:
+    """
+    Analyzes every poem in a folder into one bulk output instead of per-poem files.
+    
+    Args:
+        folder_path: The path to the folder containing poem files.
+        output_path: The JSONL or SQLite file, or the directory for the columnar layout.
+        output_format: "jsonl" for one JSON record per poem, "columnar" for flat
+            syllable arrays with offset indexes (see oracle.corpus_output),
+            "sqlite" for an indexed, queryable AnalysisStore (see oracle.store).
+        jobs: Number of worker processes.
+        recursive: Also process poems in subfolders.
+        include: Glob patterns of poem file names to process.
+        exclude: Glob patterns of file names or relative paths to leave out.
+    
+    Returns:
+        A RunSummary, or None when the folder does not exist (an existing
+        output is then left untouched).
+
+    Raises:
+        ValueError: If the output format is unknown.
+    
+    Note:
+        JSONL and columnar outputs are rewritten from scratch; a SQLite store keeps
+        other poems and replaces the ones analyzed again. The per-file manifest is not used.
+        A poem that cannot be read as UTF-8 or fails to analyze is recorded in
+        the summary and does not abort the export.
+    """
+
+    if output_format not in ("jsonl", "columnar", "sqlite"):
+        raise ValueError(f"Unknown output format '{output_format}', expected 'jsonl', 'columnar' or 'sqlite'")
+
+    # Checked before the writer truncates an existing export
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        print(f"Error: The directory '{folder_path}' does not exist or is not a directory.")
+        return None
+
+    writer: JsonlCorpusWriter | ColumnarCorpusWriter | AnalysisStore
+    if output_format == "jsonl":
+        writer = JsonlCorpusWriter(output_path)
+    elif output_format == "columnar":
+        writer = ColumnarCorpusWriter(output_path)
+    else:
+        writer = AnalysisStore(output_path)
+
+    summary = RunSummary()
+    start = time.perf_counter()
+
+    def record_failure(poem_file_name: str, error: str) -> None:
+        summary.total += 1
+        summary.failures[poem_file_name] = error
+        _report_progress(summary.total, poem_file_name, error)
+
+    def iter_poems() -> Iterator[tuple[str, str]]:
+        for poem_file in iter_poem_files(folder, recursive=recursive, include=include, exclude=exclude):
+            try:
+                poem_text = poem_file.read_text()
+            except (OSError, UnicodeDecodeError) as e:
+                record_failure(poem_file.name, f"{type(e).__name__}: {e}")
+                continue
+            yield poem_file.name, poem_text
+
+    with writer:
+        for poem_file_name, (analysis, error) in _run_poem_tasks(folder, iter_poems(), _analyze_poem_text_safely, jobs):
+            if analysis is not None:
+                summary.total += 1
+                writer.write(poem_file_name, analysis)
+                _report_progress(summary.total, poem_file_name, None)
+            else:
+                record_failure(poem_file_name, error or "unknown error")
+
+    summary.elapsed = time.perf_counter() - start
+    _print_summary(summary)
+    return summary
+
+
+def watch_poem_folder(folder_path: str = "user poems",
+                      interval: float = 1.0,
+                      debounce: float = 2.0,
+                      recursive: bool = False,
+                      include: Sequence[str] = DEFAULT_INCLUDE,
+                      exclude: Sequence[str] = DEFAULT_EXCLUDE,
+                      max_polls: int | None = None,
+                      sleep: Callable[[float], None] = time.sleep) -> None:
+    """
+    Watches a folder and re-analyzes poems as they are added or edited.
+    
+    Args:
+        folder_path: The path to the folder containing poem files.
+        interval: Seconds between folder polls.
+        debounce: Seconds a file must stay unchanged before it is analyzed.
+        recursive: Also watch poems in subfolders.
+        include: Glob patterns of poem file names to watch.
+        exclude: Glob patterns of file names or relative paths to ignore.
+        max_polls: Stop after this many polls (runs until interrupted when None).
+        sleep: Function used to wait between polls.
+    
+    Note:
+        Starts with an incremental run over the whole folder, then keeps the
+        lexicon warm in this process and only analyzes files that changed.
+        Analysis files are written atomically and the manifest is kept current,
+        so a later plain run skips everything the watcher already handled.
+    """
+
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        print(f"Error: The directory '{folder_path}' does not exist or is not a directory.")
         return
 
-    for poem_file_name in poem_file_names:
-        poem_file_path = folder / poem_file_name
-        write_poem_analysis(str(poem_file_path))
+    read_multiple_poem_files_and_write_analyses(folder_path, recursive=recursive,
+                                                include=include, exclude=exclude)
+    manifest = AnalysisManifest.load(folder)
+    watcher = PollingWatcher(folder, debounce=debounce, recursive=recursive,
+                             include=include, exclude=exclude)
+    watcher.prime()
+    print(f"Watching '{folder_path}' for changes (Ctrl+C to stop)...")
+
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            sleep(interval)
+            polls += 1
+
+            changed = watcher.poll()
+            for poem_file_name in changed:
+                poem_path = folder / poem_file_name
+                try:
+                    content = poem_path.read_bytes()
+                    poem_file = PoemFile(path=poem_path, name=poem_file_name, size=len(content), _content=content)
+                    poem_text = poem_file.read_text()
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"{poem_file_name}: FAILED ({type(e).__name__}: {e})")
+                    continue
+                if not poem_text.strip():
+                    continue
+
+                error = _write_poem_analysis_safely(str(poem_path), poem_text)
+                if error is None:
+                    manifest.record(poem_file_name, hash_poem_content(content),
+                                    analysis_output_path(Path(poem_file_name)).as_posix())
+                print(f"{poem_file_name}: {'FAILED (' + error + ')' if error else 're-analyzed'}")
+
+            if changed:
+                manifest.save()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
 
 
 if __name__ == "__main__":
@@ -138,9 +483,42 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Oracle of the Abyss - Poem Analyzer")
     parser.add_argument("--perf", action="store_true", help="Enable performance monitoring")
     parser.add_argument("--folder", type=str, default="user poems", help="Folder containing poems (relative or absolute path)")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes for analyzing poems")
+    parser.add_argument("--force", action="store_true", help="Re-analyze all poems, ignoring the manifest")
+    parser.add_argument("--recursive", action="store_true", help="Also analyze poems in subfolders")
+    parser.add_argument("--include", action="append", default=None, help="Glob pattern of poem files to analyze (repeatable, default *.txt and *.md)")
+    parser.add_argument("--exclude", action="append", default=None, help="Glob pattern of files to skip (repeatable, *_analysis.txt is always skipped)")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-analyze poems when they change")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between folder polls in watch mode")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Seconds a file must stay unchanged before it is re-analyzed in watch mode")
+    parser.add_argument("--output-format", choices=["text", "jsonl", "columnar", "sqlite"], default="text", help="Per-poem '_analysis.txt' files (default) or one bulk corpus output")
+    parser.add_argument("--output", type=str, default="", help="Corpus output path for the jsonl/columnar/sqlite formats")
+    parser.add_argument("--stream", action="store_true", help="Read poems from stdin and write NDJSON analyses to stdout")
+    parser.add_argument("--stream-format", choices=["ndjson", "text", "anthology"], default="ndjson", help="Stdin format in stream mode")
+    parser.add_argument("--delimiter", type=str, default=DEFAULT_DELIMITER, help="Separator line between plain-text poems in stream mode")
     args = parser.parse_args()
 
     if args.perf:
         os.environ["ORACLE_LOOKOUT"] = "1"
+        if args.stream:
+            # Keep timings out of the NDJSON on stdout, also in pool workers that inherit the environment
+            os.environ["ORACLE_LOOKOUT_STDERR"] = "1"
+
+    include = args.include or DEFAULT_INCLUDE
+    exclude = [*DEFAULT_EXCLUDE, *(args.exclude or [])]
 
-    read_multiple_poem_files_and_write_analyses(folder_path=args.folder)
\ No newline at end of file
+    if args.stream:
+        import sys
+        run_stream(sys.stdin, sys.stdout, input_format=args.stream_format,
+                   delimiter=args.delimiter, jobs=args.jobs)
+    elif args.output_format != "text":
+        if not args.output:
+            parser.error("--output is required with --output-format jsonl/columnar/sqlite")
+        export_poem_corpus(folder_path=args.folder, output_path=args.output, output_format=args.output_format,
+                           jobs=args.jobs, recursive=args.recursive, include=include, exclude=exclude)
+    elif args.watch:
+        watch_poem_folder(folder_path=args.folder, interval=args.interval, debounce=args.debounce,
+                          recursive=args.recursive, include=include, exclude=exclude)
+    else:
+        read_multiple_poem_files_and_write_analyses(folder_path=args.folder, jobs=args.jobs, force=args.force,
+                                                    recursive=args.recursive, include=include, exclude=exclude)
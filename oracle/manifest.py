@@ -0,0 +1,151 @@
+"""
+Manifest module for incremental CLI runs.
+
+The manifest lives in the poems folder and remembers, for every analyzed poem,
+the hash of its content, the analyzer version that produced the output and the
+output file name, so unchanged poems can be skipped on the next run.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from oracle.analyzer import ANALYZER_VERSION
+from oracle.utils import write_text_atomically
+
+
+MANIFEST_FILE_NAME = ".oracle_manifest.json"
+
+
+def hash_poem_content(content: bytes) -> str:
+    """Return the SHA-256 hex digest of a poem file's raw bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Record of one analyzed poem.
+
+    Attributes:
+        content_hash (str): SHA-256 of the poem file when it was analyzed.
+        analyzer_version (str): ANALYZER_VERSION that produced the output.
+        output (str): Name of the analysis file, relative to the poems folder.
+    """
+
+    content_hash: str
+    analyzer_version: str
+    output: str
+
+
+@dataclass
+class AnalysisManifest:
+    """
+    Content-hash manifest of a poems folder.
+
+    Attributes:
+        folder (Path): The poems folder the manifest belongs to.
+        entries (dict[str, ManifestEntry]): Poem file name mapped to its entry.
+
+    Methods:
+        load: Reads the manifest from a folder, or returns an empty one.
+        save: Writes the manifest atomically.
+        is_up_to_date: Checks whether a poem's output can be reused.
+        record: Stores the entry for a freshly analyzed poem.
+        remove_deleted: Drops entries and outputs of poems that no longer exist.
+    """
+
+    folder: Path
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+
+    @property
+    def path(self) -> Path:
+        """Return the manifest file path."""
+        return self.folder / MANIFEST_FILE_NAME
+
+    @classmethod
+    def load(cls, folder: Path) -> "AnalysisManifest":
+        """
+        Read the manifest stored in a folder.
+
+        Args:
+            folder: The poems folder.
+
+        Returns:
+            The stored manifest, or an empty one if it is missing or unreadable.
+        """
+        manifest = cls(folder=folder)
+        try:
+            raw = json.loads(manifest.path.read_text(encoding="utf-8"))
+            manifest.entries = {
+                name: ManifestEntry(**entry) for name, entry in raw.get("poems", {}).items()
+            }
+        except (OSError, ValueError, TypeError):
+            manifest.entries = {}
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest through a temporary file so a crash never leaves it half-written."""
+        payload = {
+            "poems": {
+                name: {
+                    "content_hash": entry.content_hash,
+                    "analyzer_version": entry.analyzer_version,
+                    "output": entry.output,
+                }
+                for name, entry in sorted(self.entries.items())
+            }
+        }
+        write_text_atomically(self.path, json.dumps(payload, indent=2))
+
+    def is_up_to_date(self, poem_file_name: str, content_hash: str) -> bool:
+        """
+        Check whether the stored output for a poem can be reused.
+
+        Args:
+            poem_file_name: The poem file name inside the folder.
+            content_hash: Hash of the poem's current content.
+
+        Returns:
+            True if the content and analyzer version match and the output file still exists.
+        """
+        entry = self.entries.get(poem_file_name)
+        return (
+            entry is not None
+            and entry.content_hash == content_hash
+            and entry.analyzer_version == ANALYZER_VERSION
+            and (self.folder / entry.output).is_file()
+        )
+
+    def record(self, poem_file_name: str, content_hash: str, output: str) -> None:
+        """Store the entry for a poem that was just analyzed."""
+        self.entries[poem_file_name] = ManifestEntry(
+            content_hash=content_hash,
+            analyzer_version=ANALYZER_VERSION,
+            output=output,
+        )
+
+    def remove_deleted(self, current_poem_file_names: set[str]) -> list[str]:
+        """
+        Forget poems that are gone and delete their analysis files.
+
+        Args:
+            current_poem_file_names: Poem file names found in the folder on this run.
+
+        Returns:
+            The names of the poems that were removed from the manifest.
+
+        Note:
+            A run limited by include/exclude patterns or without recursion does not
+            find every poem, so entries are only dropped once their poem file no
+            longer exists in the folder.
+        """
+        removed = sorted(poem_file_name for poem_file_name in set(self.entries) - current_poem_file_names
+                         if not (self.folder / poem_file_name).exists())
+        for poem_file_name in removed:
+            entry = self.entries.pop(poem_file_name)
+            # "poem.txt" and "poem.md" share "poem_analysis.txt"; keep it if still in use
+            if all(other.output != entry.output for other in self.entries.values()):
+                (self.folder / entry.output).unlink(missing_ok=True)
+        return removed
@@ -0,0 +1,208 @@
+"""
+Persistent cache for syllable counts of out-of-vocabulary words.
+
+Words missing from CMUdict are estimated by `fallback_estimate` in every worker
+and after every restart. This module keeps the estimates in a SQLite file that
+many processes can share, together with how often each word was looked up, so
+caches are warm after a deploy and the most common OOV words can be reported
+as candidates for a custom lexicon.
+
+Enable it for count_syllables by setting ORACLE_OOV_CACHE to a database path.
+
+Usage:
+    python -m oracle.oov_cache oov_cache.db --top 20
+"""
+
+import json
+import multiprocessing.util
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS oov_words (
+    word TEXT PRIMARY KEY,
+    syllables TEXT NOT NULL,
+    estimator_version TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_oov_words_hits ON oov_words(hits);
+"""
+
+# Buffered lookups per process before hit counts are written
+FLUSH_EVERY = 256
+
+# Seconds a process waits for another one holding the write lock
+BUSY_TIMEOUT = 30.0
+
+# Attempts at switching a new database to WAL while other processes open it too
+SETUP_ATTEMPTS = 5
+
+# Words kept in memory per process, least recently used first out
+MEMORY_SIZE = 65536
+
+
+class OovCache:
+    """
+    SQLite-backed cache of fallback syllable counts with hit frequencies.
+
+    Attributes:
+        path (Path): The database file.
+        estimator_version (str): Results stored by another estimator version are recomputed.
+
+    Methods:
+        lookup: Returns the cached counts for a word, estimating and storing them on a miss.
+        flush: Writes buffered hit counts.
+        most_common: Returns the most frequently looked-up words.
+        close: Flushes and closes the connection.
+
+    Note:
+        Each process keeps its own connection and an in-memory copy of the
+        MEMORY_SIZE words it has used most recently, so repeated words cost a
+        dictionary lookup. The connection is opened lazily and re-opened after a
+        fork, so a cache configured in a parent process is safe to use from pool
+        workers. Threads of a process share the connection under a lock, as the
+        API's threadpool does. Buffered hit counts are written when a process
+        exits, including multiprocessing pool workers.
+    """
+
+    def __init__(self, path: str | Path, estimator_version: str = "1") -> None:
+        self.path = Path(path)
+        self.estimator_version = estimator_version
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._memory: OrderedDict[str, list[int]] = OrderedDict()
+        self._hits: dict[str, int] = {}
+        self._pending = 0
+        # Guards the connection, the memory and the buffered hits
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Callers hold _lock
+        if self._connection is None or self._pid != os.getpid():
+            # After a fork the inherited connection and hit counts belong to the parent
+            self._hits.clear()
+            self._pending = 0
+            self._connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            self._set_up(self._connection)
+            if self._pid != os.getpid():
+                # Pool workers leave through os._exit and skip atexit handlers, but
+                # multiprocessing still runs its finalizers, so buffered hits are kept
+                multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _set_up(connection: sqlite3.Connection) -> None:
+        # Changing the journal mode can fail right away, without waiting for the
+        # busy timeout, when several processes open a new database at once
+        for attempt in range(1, SETUP_ATTEMPTS + 1):
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                return
+            except sqlite3.OperationalError:
+                if attempt == SETUP_ATTEMPTS:
+                    raise
+                time.sleep(0.05 * attempt)
+
+    def lookup(self, word: str, estimate: Callable[[str], list[int]]) -> list[int]:
+        """
+        Return the syllable counts of an out-of-vocabulary word.
+
+        Args:
+            word: The normalized word.
+            estimate: Computes the counts when the word is not cached yet.
+
+        Returns:
+            The cached or freshly estimated counts.
+        """
+        with self._lock:
+            connection = self._connect()
+            counts = self._memory.get(word)
+            if counts is None:
+                row = connection.execute(
+                    "SELECT syllables FROM oov_words WHERE word = ? AND estimator_version = ?",
+                    (word, self.estimator_version),
+                ).fetchone()
+                if row is not None:
+                    counts = json.loads(row[0])
+                else:
+                    counts = estimate(word)
+                    with connection:
+                        connection.execute(
+                            "INSERT INTO oov_words (word, syllables, estimator_version) VALUES (?, ?, ?) "
+                            "ON CONFLICT(word) DO UPDATE SET syllables = excluded.syllables, "
+                            "estimator_version = excluded.estimator_version",
+                            (word, json.dumps(counts), self.estimator_version),
+                        )
+                self._memory[word] = counts
+                if len(self._memory) > MEMORY_SIZE:
+                    self._memory.popitem(last=False)
+            else:
+                self._memory.move_to_end(word)
+
+            self._hits[word] = self._hits.get(word, 0) + 1
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self.flush()
+            return list(counts)
+
+    def flush(self) -> None:
+        """Add the buffered hit counts to the database."""
+        with self._lock:
+            if not self._hits:
+                return
+            connection = self._connect()
+            hits, self._hits = self._hits, {}
+            self._pending = 0
+            with connection:
+                connection.executemany("UPDATE oov_words SET hits = hits + ? WHERE word = ?",
+                                       [(count, word) for word, count in hits.items()])
+
+    def most_common(self, limit: int = 20) -> list[tuple[str, int]]:
+        """
+        Return the most frequently looked-up words.
+
+        Args:
+            limit: Maximum number of words to return.
+
+        Returns:
+            (word, hits) pairs, most frequent first.
+        """
+        with self._lock:
+            self.flush()
+            rows = self._connect().execute(
+                "SELECT word, hits FROM oov_words ORDER BY hits DESC, word LIMIT ?", (limit,)
+            ).fetchall()
+        return [(word, hits) for word, hits in rows]
+
+    def close(self) -> None:
+        """Write buffered hit counts and close the connection."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self.flush()
+                self._connection.close()
+            self._connection = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Oracle of the Abyss - most common out-of-vocabulary words")
+    parser.add_argument("path", type=str, help="The OOV cache database")
+    parser.add_argument("--top", type=int, default=20, help="Number of words to list")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"Error: The OOV cache '{args.path}' does not exist.")
+    else:
+        cache = OovCache(args.path)
+        for word, hits in cache.most_common(args.top):
+            print(f"{hits:>8}  {word}")
+        cache.close()
@@ -2,15 +2,166 @@
 Parser module for turning poem text into domain objects.
 """
 
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+
 from oracle.domain_objects import Line, Stanza
+from oracle.tokenizer import MARKUP_CHARACTERS
 from oracle.utils import check_for_title_line
 
+# Line boundaries recognized by str.splitlines
+_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+# The content of a non-blank line, without surrounding whitespace
+_LINE_CONTENT = re.compile(rf"\S(?:[^{_BREAKS}]*\S)?")
+
+_LINE_BREAK = re.compile(rf"\r\n|[{_BREAKS}]")
+
+# One line break; a lone "\r" is only a break when no "\n" follows
+_BREAKS_WITHOUT_CR = _BREAKS.replace("\r", "")
+_SINGLE_BREAK = rf"(?:\r\n|\r(?!\n)|[{_BREAKS_WITHOUT_CR}])"
+
+# A blank (or whitespace-only) line, which ends the stanza before it
+_BLANK_LINE = re.compile(rf"{_SINGLE_BREAK}[^\S{_BREAKS}]*{_SINGLE_BREAK}")
+
+
+@dataclass(slots=True)
+class LineSpan:
+    """
+    A line of a poem as offsets into the original text.
+
+    Attributes:
+        source (str): The full poem text.
+        start (int): Offset of the first character of the stripped line.
+        end (int): Offset just past the last character of the stripped line.
+
+    Methods:
+        text: Returns the line text, sliced from the source on demand.
+    """
+
+    source: str
+    start: int
+    end: int
+
+    @property
+    def text(self) -> str:
+        """Return the stripped line text."""
+        return self.source[self.start:self.end]
+
+
+@dataclass(slots=True)
+class StanzaSpan:
+    """
+    A stanza of a poem as line offsets into the original text.
+
+    Attributes:
+        lines (list[LineSpan]): The stanza's lines, without a title line.
+
+    Methods:
+        start: Offset of the stanza's first line.
+        end: Offset just past the stanza's last line.
+        text: Returns the stanza's lines joined with newlines, like Stanza.stanza_text_string.
+        to_stanza: Returns the Stanza that parse_into_stanzas builds for the span.
+    """
+
+    lines: list[LineSpan]
+
+    @property
+    def start(self) -> int:
+        """Return the offset of the first line."""
+        return self.lines[0].start
+
+    @property
+    def end(self) -> int:
+        """Return the offset just past the last line."""
+        return self.lines[-1].end
+
+    @property
+    def text(self) -> str:
+        """Return the stanza text as the analysis reports it."""
+        return '\n'.join(line.text for line in self.lines)
+
+    def to_stanza(self) -> Stanza:
+        """
+        Build the stanza's domain object.
+
+        Raises:
+            ValueError: If a line is empty once its markup is stripped, e.g. "***".
+        """
+        return Stanza(lines=[Line(text=line.text) for line in self.lines])
+
+
+def _iter_stanza_offsets(poem_text: str, poem_name: str) -> Iterator[list[int]]:
+    """
+    Yield each stanza's line offsets as a flat [start, end, start, end, ...] list.
+
+    Flat lists of ints keep the garbage collector out of the scan: they are single
+    containers, where a tuple per line would be tracked one by one.
+    """
+    current: list[int] = []
+    # Blank lines never match, so a stanza ends where the gap to the next line holds two line breaks
+    previous_end = 0
+    for match in _LINE_CONTENT.finditer(poem_text):
+        start, end = match.span()
+        # A one-character gap is the single line break between two lines of a stanza
+        if start - previous_end > 1 and current:
+            breaks = poem_text.count("\n", previous_end, start)
+            if breaks < 2 and start - previous_end > breaks:
+                # The gap holds more than plain newlines, e.g. "\r\n" or trailing spaces
+                breaks = len(_LINE_BREAK.findall(poem_text, previous_end, start))
+            if breaks >= 2:
+                if _drop_title_line(poem_text, poem_name, current):
+                    yield current
+                current = []
+        previous_end = end
+
+        if poem_text[start] in MARKUP_CHARACTERS or poem_text[end - 1] in MARKUP_CHARACTERS:
+            while start < end and poem_text[start] in MARKUP_CHARACTERS:
+                start += 1
+            while end > start and poem_text[end - 1] in MARKUP_CHARACTERS:
+                end -= 1
+        current.append(start)
+        current.append(end)
+
+    if current and _drop_title_line(poem_text, poem_name, current):
+        yield current
+
+
+def _drop_title_line(poem_text: str, poem_name: str, offsets: list[int]) -> bool:
+    """Remove a title line from the start of a stanza; return whether any lines remain."""
+    if check_for_title_line(poem_text[offsets[0]:offsets[1]], poem_name):
+        del offsets[:2]
+    return bool(offsets)
+
+
+def scan_stanzas(poem_text: str, poem_name: str) -> list[StanzaSpan]:
+    """
+    Find stanza and line offsets in poem text with a single scan.
+
+    Args:
+        poem_text (str): The raw poem text.
+        poem_name (str): The name of the poem, used to identify title lines.
+
+    Returns:
+        list[StanzaSpan]: The stanzas, each holding the spans of its lines.
+
+    Note:
+        Lines are stripped of surrounding whitespace and then of leading and trailing
+        '#'/'*' markup. Runs of blank (or whitespace-only) lines separate stanzas.
+        A title line at the start of a stanza is left out, and stanzas that only
+        held a title are dropped. No line text is copied until it is requested.
+    """
+    return [StanzaSpan(lines=[LineSpan(source=poem_text, start=offsets[i], end=offsets[i + 1])
+                              for i in range(0, len(offsets), 2)])
+            for offsets in _iter_stanza_offsets(poem_text, poem_name)]
+
 # TODO improve parse_into_stanzas to handle title cases when first line of other stanzas matches filename
 
 def parse_into_stanzas(poem_text: str, poem_name: str) -> list[Stanza]:
     """
     Parse poem text into stanzas, separated by blank line/s.
-     
+
     Args:
         poem_text (str): The raw poem text to parse.
         poem_name (str): The name of the poem, used to identify title lines.
@@ -22,21 +173,87 @@ def parse_into_stanzas(poem_text: str, poem_name: str) -> list[Stanza]:
         The function strips leading/trailing whitespace from lines,
         and handles multiple consecutive blank lines as a single stanza separator.
         The function returns a list of stanzas, where each stanza is a list of its lines.
+        The text is scanned once for line offsets (see scan_stanzas); only the final
+        line texts are copied.
+    """
+
+    # Files holding multiple poems are split beforehand with oracle.anthology
+
+    return [Stanza(lines=[Line(text=poem_text[offsets[i]:offsets[i + 1]]) for i in range(0, len(offsets), 2)])
+            for offsets in _iter_stanza_offsets(poem_text, poem_name)]
+
+
+class IncrementalStanzaParser:
     """
-    
-    # TODO add accounting for multiple poems in single file
-
-    cleaned_text = '\n'.join(line.strip() for line in poem_text.splitlines())
-    stanzas=cleaned_text.split('\n\n')
-
-    result = []
-    for stanza in stanzas:
-        lines = [line.strip('#*') for line in stanza.split('\n') if line.strip()]
-        if check_for_title_line(lines[0], poem_name):
-            lines = lines[1:]
-        if lines:
-            # Create Line objects here
-            line_objects = [Line(text=line) for line in lines]
-            stanza_obj = Stanza(lines=line_objects)
-            result.append(stanza_obj)
-    return result
\ No newline at end of file
+    Parses stanzas from text that arrives in chunks, e.g. a streamed upload.
+
+    Attributes:
+        poem_name (str): The name of the poem, used to identify title lines.
+
+    Methods:
+        feed: Adds a chunk and returns the stanzas it completed.
+        close: Returns the stanzas left at the end of the text.
+        feed_spans, close_spans: The same as StanzaSpans, so a stanza that does
+            not make valid Line objects fails on its own in to_stanza.
+
+    Note:
+        A stanza is complete once a blank line follows it, so only the unfinished
+        stanza is buffered and memory stays bounded by the longest stanza. Feeding
+        all chunks and closing yields the same stanzas as parse_into_stanzas on
+        the whole text.
+    """
+
+    def __init__(self, poem_name: str) -> None:
+        self.poem_name = poem_name
+        self._buffer = ""
+        # Earlier text holds no stanza boundary, so it is not searched again
+        self._search_from = 0
+
+    def feed(self, chunk: str) -> list[Stanza]:
+        """
+        Add the next chunk of text.
+
+        Args:
+            chunk (str): The text following the previous chunk.
+
+        Returns:
+            list[Stanza]: The stanzas completed by this chunk, possibly none.
+        """
+        return [span.to_stanza() for span in self.feed_spans(chunk)]
+
+    def close(self) -> list[Stanza]:
+        """
+        Finish the text.
+
+        Returns:
+            list[Stanza]: The stanzas still buffered, i.e. the last one if any.
+        """
+        return [span.to_stanza() for span in self.close_spans()]
+
+    def feed_spans(self, chunk: str) -> list[StanzaSpan]:
+        """Add the next chunk of text and return the stanzas it completed as spans, see feed."""
+        buffer = self._buffer + chunk
+        boundary = None
+        for boundary in _BLANK_LINE.finditer(buffer, self._search_from):
+            pass
+        # A trailing "\r" may still be followed by "\n", so a boundary at the very end waits
+        if boundary is not None and boundary.end() == len(buffer):
+            boundary = None
+
+        if boundary is None:
+            self._buffer = buffer
+            stripped = chunk.rstrip()
+            if stripped:
+                # A later boundary starts with the whitespace at the end of the buffer
+                self._search_from = len(buffer) - len(chunk) + len(stripped)
+            return []
+
+        complete, self._buffer = buffer[:boundary.end()], buffer[boundary.end():]
+        self._search_from = 0
+        return scan_stanzas(complete, self.poem_name)
+
+    def close_spans(self) -> list[StanzaSpan]:
+        """Finish the text and return the buffered stanza as spans, see close."""
+        remainder, self._buffer = self._buffer, ""
+        self._search_from = 0
+        return scan_stanzas(remainder, self.poem_name)
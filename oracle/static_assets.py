@@ -0,0 +1,213 @@
+"""
+Static assets module for serving the built frontend from memory.
+
+The dist folder is read once into an AssetTable: every file with its content
+type, a content-hash ETag, a Cache-Control policy and gzip (and, when the
+brotli package is installed, brotli) variants compressed at build time.
+Requests are then answered by one dictionary lookup, so a request path can
+only ever reach files that were found inside the folder when it was loaded.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+# Optional: without the brotli package only gzip variants are built
+brotli: ModuleType | None
+try:
+    import brotli  # type: ignore[import-not-found, no-redef, unused-ignore]
+except ImportError:
+    brotli = None
+
+
+# Vite names built assets like "index-BXk2a9Lq.js", so their content never changes under one name
+HASHED_ASSET = re.compile(r"(?:^|/)assets/[^/]+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Other files (index.html, favicon, ...) are revalidated with their ETag on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Smaller files are not worth a compressed variant
+MIN_COMPRESS_SIZE = 256
+
+# Content types worth compressing besides text/*
+_COMPRESSIBLE_TYPES = {"application/javascript", "application/json", "application/manifest+json",
+                       "application/xml", "image/svg+xml", "application/wasm"}
+
+# Encodings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+@dataclass(frozen=True)
+class Asset:
+    """
+    One file of the built frontend, ready to send.
+
+    Attributes:
+        body (bytes): The file contents.
+        content_type (str): The Content-Type header.
+        etag (str): Quoted strong ETag of the contents.
+        cache_control (str): The Cache-Control header.
+        encodings (dict[str, bytes]): Compressed bodies by content coding ("br", "gzip"),
+            only for codings that made the file smaller.
+    """
+
+    body: bytes
+    content_type: str
+    etag: str
+    cache_control: str
+    encodings: dict[str, bytes] = field(default_factory=dict)
+
+    def variant(self, accept_encoding: str | None) -> tuple[str | None, bytes, str]:
+        """
+        Choose the body to send for an Accept-Encoding header.
+
+        Returns:
+            (content coding or None for identity, body, ETag of that body).
+        """
+        coding = negotiate_encoding(accept_encoding, self.encodings)
+        if coding is None:
+            return None, self.body, self.etag
+        # Each encoded body is a different representation, so it gets its own tag
+        return coding, self.encodings[coding], f'{self.etag[:-1]}-{coding}"'
+
+
+def negotiate_encoding(accept_encoding: str | None, available: dict[str, bytes]) -> str | None:
+    """
+    Pick the preferred content coding a client accepts.
+
+    Args:
+        accept_encoding: The Accept-Encoding header, e.g. "gzip, deflate, br;q=0.9".
+        available: The codings an asset has.
+
+    Returns:
+        The coding in ENCODINGS with the highest q-value, ties going to the
+        earlier one, or None for identity. "*" stands for any coding the header
+        does not list; q=0 refuses a coding.
+    """
+    if not accept_encoding or not available:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.strip().partition(";")
+        weight = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+    best: str | None = None
+    best_weight = 0.0
+    for coding in ENCODINGS:
+        if coding not in available:
+            continue
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, with weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _content_type(path: Path) -> str:
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if content_type == "text/javascript":
+        content_type = "application/javascript"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+        return f"{content_type}; charset=utf-8"
+    return content_type
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0]
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES
+
+
+def build_asset(path: str, body: bytes, content_type: str) -> Asset:
+    """
+    Prepare a file's headers and compressed variants.
+
+    Args:
+        path: The file's path relative to the asset root, with "/" separators.
+        body: The file contents.
+        content_type: The Content-Type header.
+
+    Returns:
+        The asset, immutable if the path is a hashed Vite asset.
+    """
+    encodings: dict[str, bytes] = {}
+    if len(body) >= MIN_COMPRESS_SIZE and _is_compressible(content_type):
+        # mtime=0 keeps the gzip bytes identical across restarts and workers
+        candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(body, quality=11)
+        encodings = {coding: data for coding, data in candidates.items() if len(data) < len(body)}
+    cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.search(path) else REVALIDATE_CACHE_CONTROL
+    return Asset(body=body, content_type=content_type, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                 cache_control=cache_control, encodings=encodings)
+
+
+class AssetTable:
+    """
+    The files of a folder, loaded into memory.
+
+    Attributes:
+        root (Path): The folder the files were read from.
+
+    Methods:
+        get: Returns the asset at a request path.
+        index: Returns index.html, the fallback of single-page app routes.
+    """
+
+    def __init__(self, assets: dict[str, Asset], root: Path) -> None:
+        self._assets = assets
+        self.root = root
+
+    @classmethod
+    def load(cls, root: str | Path) -> "AssetTable":
+        """
+        Read and compress every file below a folder.
+
+        Args:
+            root: The folder, e.g. the frontend's dist folder. A missing folder
+                gives an empty table.
+
+        Returns:
+            The table. Files that resolve outside the folder (through symlinks)
+            are left out.
+        """
+        root = Path(root).resolve()
+        assets: dict[str, Asset] = {}
+        if root.is_dir():
+            for file_path in sorted(root.rglob("*")):
+                resolved = file_path.resolve()
+                if not resolved.is_file() or not resolved.is_relative_to(root):
+                    continue
+                relative = file_path.relative_to(root).as_posix()
+                assets[relative] = build_asset(relative, resolved.read_bytes(), _content_type(file_path))
+        return cls(assets, root)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def get(self, path: str) -> Asset | None:
+        """Return the asset at a request path such as "assets/index-BXk2a9Lq.js", or None."""
+        return self._assets.get(path.lstrip("/"))
+
+    def index(self) -> Asset | None:
+        """Return index.html, or None if the folder has none."""
+        return self._assets.get("index.html")
@@ -0,0 +1,302 @@
+"""
+Store module for persisting poem analyses in SQLite.
+
+Keeps analyze_poem output per poem, stanza and line in indexed tables, so
+corpus questions ("stanzas with a 5-7-5 profile", "poems whose anaphora
+includes 'i am'", "lines with more than 14 syllables") are answered by
+queries instead of re-analysis.
+"""
+
+import sqlite3
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from oracle.analyzer import ANALYZER_VERSION
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS poems (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    analyzer_version TEXT NOT NULL,
+    stanza_count INTEGER NOT NULL,
+    line_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stanzas (
+    id INTEGER PRIMARY KEY,
+    poem_id INTEGER NOT NULL REFERENCES poems(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    line_count INTEGER NOT NULL,
+    syllable_profile TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    stanza_id INTEGER NOT NULL REFERENCES stanzas(id) ON DELETE CASCADE,
+    poem_id INTEGER NOT NULL REFERENCES poems(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    syllables INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS devices (
+    stanza_id INTEGER NOT NULL REFERENCES stanzas(id) ON DELETE CASCADE,
+    poem_id INTEGER NOT NULL REFERENCES poems(id) ON DELETE CASCADE,
+    device TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    occurrences INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stanzas_profile ON stanzas(syllable_profile);
+CREATE INDEX IF NOT EXISTS idx_stanzas_poem ON stanzas(poem_id);
+CREATE INDEX IF NOT EXISTS idx_lines_syllables ON lines(syllables);
+CREATE INDEX IF NOT EXISTS idx_lines_stanza ON lines(stanza_id);
+CREATE INDEX IF NOT EXISTS idx_lines_poem ON lines(poem_id);
+CREATE INDEX IF NOT EXISTS idx_devices_pattern ON devices(device, pattern);
+CREATE INDEX IF NOT EXISTS idx_devices_stanza ON devices(stanza_id);
+CREATE INDEX IF NOT EXISTS idx_devices_poem ON devices(poem_id);
+"""
+
+# Number of buffered poems written per transaction
+BATCH_SIZE = 500
+
+
+def format_syllable_profile(syllables: Sequence[int]) -> str:
+    """Return the indexed profile key of a stanza, e.g. [5, 7, 5] -> "5-7-5"."""
+    return "-".join(str(count) for count in syllables)
+
+
+def parse_syllable_profile(profile: str) -> list[int]:
+    """
+    Parse a profile such as "5-7-5" or "5,7,5".
+
+    Raises:
+        ValueError: If the profile contains anything but integers.
+    """
+    return [int(part) for part in profile.replace(",", "-").split("-") if part.strip()]
+
+
+@dataclass
+class StanzaRecord:
+    """
+    A stored stanza returned by a query.
+
+    Attributes:
+        poem (str): Name of the poem.
+        position (int): Stanza index within the poem, starting at 0.
+        text (str): The stanza text.
+        syllables_per_line (list[int]): Syllable count of each line.
+    """
+
+    poem: str
+    position: int
+    text: str
+    syllables_per_line: list[int]
+
+
+@dataclass
+class LineRecord:
+    """
+    A stored line returned by a query.
+
+    Attributes:
+        poem (str): Name of the poem.
+        stanza (int): Stanza index within the poem, starting at 0.
+        position (int): Line index within the stanza, starting at 0.
+        text (str): The line text.
+        syllables (int): Syllable count of the line.
+    """
+
+    poem: str
+    stanza: int
+    position: int
+    text: str
+    syllables: int
+
+
+class AnalysisStore:
+    """
+    SQLite-backed store of analyze_poem results.
+
+    Methods:
+        write: Buffers a poem's analysis for the next bulk insert.
+        add_poems: Inserts many analyses in a single transaction.
+        flush: Writes buffered analyses.
+        remove_poem: Deletes a poem and its stanzas, lines and devices.
+        stanzas_with_profile: Finds stanzas by their syllable profile.
+        poems_with_anaphora: Finds poems whose anaphora includes a phrase.
+        lines_by_syllables: Finds lines within a syllable range.
+        close: Flushes and closes the connection.
+
+    Note:
+        Storing a poem under an existing name replaces the old analysis.
+        Opened with read_only=True the database is never modified, which is
+        how the API serves queries.
+    """
+
+    def __init__(self, path: str | Path, read_only: bool = False) -> None:
+        self.path = Path(path)
+        self.read_only = read_only
+        if read_only:
+            self._connection = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                               check_same_thread=False)
+        else:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._pending: list[tuple[str, dict[str, Any]]] = []
+
+    def write(self, poem_name: str, analysis: dict[str, Any]) -> None:
+        """Buffer one analysis; buffered poems are inserted together in one transaction."""
+        self._pending.append((poem_name, analysis))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert all buffered analyses."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_poems(pending)
+
+    def add_poems(self, analyses: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """
+        Store many analyses in one transaction.
+
+        Args:
+            analyses: (poem_name, analysis) pairs, where analysis is analyze_poem output.
+        """
+        with self._connection:
+            for poem_name, analysis in analyses:
+                self._insert_poem(poem_name, analysis)
+
+    def _insert_poem(self, poem_name: str, analysis: dict[str, Any]) -> None:
+        cursor = self._connection.cursor()
+        cursor.execute("DELETE FROM poems WHERE name = ?", (poem_name,))
+
+        syllables_per_line: list[list[int]] = analysis["syllables_per_line"]
+        cursor.execute(
+            "INSERT INTO poems (name, analyzer_version, stanza_count, line_count) VALUES (?, ?, ?, ?)",
+            (poem_name, ANALYZER_VERSION, len(syllables_per_line), sum(analysis["line_counts"])),
+        )
+        poem_id = cursor.lastrowid
+
+        # Without sound devices, every entry of poetic_devices is an anaphora pattern
+        device_types = (analysis.get("poetic_device_types")
+                        or [["anaphora"] * len(devices) for devices in analysis["poetic_devices"]])
+        device_patterns = analysis.get("poetic_device_patterns") or analysis["poetic_devices"]
+        for position, (text, syllables, types, patterns) in enumerate(zip(
+            analysis["stanza_texts"], syllables_per_line, device_types, device_patterns
+        )):
+            cursor.execute(
+                "INSERT INTO stanzas (poem_id, position, text, line_count, syllable_profile) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (poem_id, position, text, len(syllables), format_syllable_profile(syllables)),
+            )
+            stanza_id = cursor.lastrowid
+
+            cursor.executemany(
+                "INSERT INTO lines (stanza_id, poem_id, position, text, syllables) VALUES (?, ?, ?, ?, ?)",
+                [(stanza_id, poem_id, line_position, line_text, line_syllables)
+                 for line_position, (line_text, line_syllables)
+                 in enumerate(zip(text.split("\n"), syllables))],
+            )
+
+            occurrences: dict[tuple[str, str], int] = {}
+            for key in zip(types, patterns):
+                occurrences[key] = occurrences.get(key, 0) + 1
+            cursor.executemany(
+                "INSERT INTO devices (stanza_id, poem_id, device, pattern, occurrences) VALUES (?, ?, ?, ?, ?)",
+                [(stanza_id, poem_id, device, pattern, count) for (device, pattern), count in occurrences.items()],
+            )
+
+    def remove_poem(self, poem_name: str) -> None:
+        """Delete a poem together with its stanzas, lines and devices."""
+        with self._connection:
+            self._connection.execute("DELETE FROM poems WHERE name = ?", (poem_name,))
+
+    def poem_count(self) -> int:
+        """Return the number of stored poems."""
+        return int(self._connection.execute("SELECT COUNT(*) FROM poems").fetchone()[0])
+
+    def stanzas_with_profile(self, profile: Sequence[int], limit: int = 1000) -> list[StanzaRecord]:
+        """
+        Find stanzas whose lines have exactly the given syllable counts.
+
+        Args:
+            profile: Syllables per line, e.g. [5, 7, 5].
+            limit: Maximum number of stanzas to return.
+
+        Returns:
+            Matching stanzas ordered by poem name and position.
+        """
+        rows = self._connection.execute(
+            "SELECT poems.name, stanzas.position, stanzas.text FROM stanzas "
+            "JOIN poems ON poems.id = stanzas.poem_id "
+            "WHERE stanzas.syllable_profile = ? ORDER BY poems.name, stanzas.position LIMIT ?",
+            (format_syllable_profile(profile), limit),
+        ).fetchall()
+        return [StanzaRecord(poem=name, position=position, text=text, syllables_per_line=list(profile))
+                for name, position, text in rows]
+
+    def poems_with_anaphora(self, phrase: str, limit: int = 1000) -> list[str]:
+        """
+        Find poems where a detected anaphora pattern contains a phrase.
+
+        Args:
+            phrase: Case-insensitive phrase, e.g. "i am".
+            limit: Maximum number of poem names to return.
+
+        Returns:
+            Names of matching poems, sorted.
+        """
+        phrase = " ".join(phrase.lower().split())
+        # Exact pattern matches use the index; longer patterns starting with or containing the phrase are found by LIKE
+        rows = self._connection.execute(
+            "SELECT DISTINCT poems.name FROM devices JOIN poems ON poems.id = devices.poem_id "
+            "WHERE devices.device = 'anaphora' AND (devices.pattern = ? OR ' ' || devices.pattern || ' ' LIKE ? ESCAPE '\\') "
+            "ORDER BY poems.name LIMIT ?",
+            (phrase, f"% {_escape_like(phrase)} %", limit),
+        ).fetchall()
+        return [name for (name,) in rows]
+
+    def lines_by_syllables(self, minimum: int | None = None, maximum: int | None = None,
+                           limit: int = 1000) -> list[LineRecord]:
+        """
+        Find lines whose syllable count lies within a range.
+
+        Args:
+            minimum: Smallest allowed syllable count (inclusive), unbounded when None.
+            maximum: Largest allowed syllable count (inclusive), unbounded when None.
+            limit: Maximum number of lines to return.
+
+        Returns:
+            Matching lines ordered by syllable count, then poem and position.
+        """
+        rows = self._connection.execute(
+            "SELECT poems.name, stanzas.position, lines.position, lines.text, lines.syllables FROM lines "
+            "JOIN stanzas ON stanzas.id = lines.stanza_id JOIN poems ON poems.id = lines.poem_id "
+            "WHERE lines.syllables BETWEEN ? AND ? "
+            "ORDER BY lines.syllables, poems.name, stanzas.position, lines.position LIMIT ?",
+            (minimum if minimum is not None else -1, maximum if maximum is not None else 2 ** 31, limit),
+        ).fetchall()
+        return [LineRecord(poem=name, stanza=stanza, position=position, text=text, syllables=syllables)
+                for name, stanza, position, text, syllables in rows]
+
+    def close(self) -> None:
+        """Write buffered analyses and close the connection."""
+        if not self.read_only:
+            self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,194 @@
+"""
+Streaming module for using the analyzer as a Unix pipeline filter.
+
+Reads poems from a text stream (NDJSON records, delimiter-separated plain
+text or an anthology split by oracle.anthology), analyzes them with a bounded number of poems in memory, optionally in a
+process pool, and writes one JSON result per line in input order.
+"""
+
+import json
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from oracle.analyzer import analyze_poem
+from oracle.anthology import iter_anthology_poems
+from oracle.poem_model import Poem
+
+
+DEFAULT_DELIMITER = "---"
+
+
+@dataclass
+class StreamRecord:
+    """
+    One poem read from the input stream.
+
+    Attributes:
+        title (str): The poem title, "Untitled" when the input has none.
+        poem_text (str): The poem text.
+        error (str | None): Set when the input record itself could not be read.
+    """
+
+    title: str
+    poem_text: str
+    error: str | None = None
+
+
+def iter_ndjson_records(stream: Iterable[str]) -> Iterator[StreamRecord]:
+    """
+    Read poems from NDJSON lines with "poem_text" and optional "title" fields.
+
+    Args:
+        stream: Lines of text, e.g. sys.stdin.
+
+    Yields:
+        One StreamRecord per non-blank line. Malformed lines produce a record
+        with an error so the output stays aligned with the input.
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+            if not isinstance(raw, dict):
+                raise ValueError("record must be a JSON object")
+            title = raw.get("title", "Untitled")
+            poem_text = raw["poem_text"]
+            if not isinstance(title, str) or not isinstance(poem_text, str):
+                raise ValueError("'title' and 'poem_text' must be strings")
+            yield StreamRecord(title=title, poem_text=poem_text)
+        except KeyError:
+            yield StreamRecord(title="Untitled", poem_text="", error="Missing 'poem_text' field")
+        except ValueError as e:
+            yield StreamRecord(title="Untitled", poem_text="", error=f"Invalid record: {e}")
+
+
+def iter_delimited_records(stream: Iterable[str], delimiter: str = DEFAULT_DELIMITER) -> Iterator[StreamRecord]:
+    """
+    Read plain-text poems separated by lines consisting only of the delimiter.
+
+    Args:
+        stream: Lines of text, e.g. sys.stdin.
+        delimiter: The separator line between poems, compared after stripping whitespace.
+
+    Yields:
+        One StreamRecord per non-blank poem, titled "Untitled".
+    """
+    lines: list[str] = []
+    for line in stream:
+        if line.strip() == delimiter:
+            if "".join(lines).strip():
+                yield StreamRecord(title="Untitled", poem_text="".join(lines))
+            lines = []
+        else:
+            lines.append(line)
+    if "".join(lines).strip():
+        yield StreamRecord(title="Untitled", poem_text="".join(lines))
+
+
+def iter_anthology_records(stream: Iterable[str]) -> Iterator[StreamRecord]:
+    """
+    Read the poems of an anthology, split on separator lines and titles.
+
+    Args:
+        stream: Lines of text, e.g. sys.stdin.
+
+    Yields:
+        One StreamRecord per poem, titled after the poem's title line.
+    """
+    for poem in iter_anthology_poems(stream):
+        yield StreamRecord(title=poem.filename, poem_text=poem.text)
+
+
+def analyze_record(record: StreamRecord) -> dict[str, Any]:
+    """
+    Analyze one stream record.
+
+    Args:
+        record: The poem to analyze.
+
+    Returns:
+        A result with the same shape as the API's PoemAnalysisResult:
+        title, analysis (empty on failure) and error.
+    """
+    if record.error is not None:
+        return {"title": record.title, "analysis": {}, "error": record.error}
+    try:
+        poem = Poem(text=record.poem_text, filepath=Path(f"{record.title}.txt"))
+        return {"title": record.title, "analysis": analyze_poem(poem), "error": None}
+    except Exception as e:
+        return {"title": record.title, "analysis": {}, "error": str(e)}
+
+
+def iter_stream_results(records: Iterable[StreamRecord], jobs: int = 1,
+                        window: int | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Analyze records lazily and yield results in input order.
+
+    Args:
+        records: The poems to analyze, consumed lazily.
+        jobs: Number of worker processes; 1 analyzes in this process.
+        window: Maximum number of poems in flight when jobs > 1, defaults to jobs * 4.
+
+    Yields:
+        One result dictionary per record, in the order the records arrived.
+
+    Note:
+        At most `window` poems (and their results) are held in memory at once,
+        so arbitrarily long inputs run in constant memory.
+    """
+    if jobs <= 1:
+        for record in records:
+            yield analyze_record(record)
+        return
+
+    window = window or jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        in_flight: deque[Future[dict[str, Any]]] = deque()
+        for record in records:
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(analyze_record, record))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def run_stream(input_stream: TextIO, output_stream: TextIO, input_format: str = "ndjson",
+               delimiter: str = DEFAULT_DELIMITER, jobs: int = 1) -> int:
+    """
+    Read poems from one stream and write NDJSON analyses to another.
+
+    Args:
+        input_stream: Where poems are read from, e.g. sys.stdin.
+        output_stream: Where results are written, e.g. sys.stdout.
+        input_format: "ndjson" for JSON records, "text" for delimiter-separated poems,
+            "anthology" for a multi-poem file split on separators and titles.
+        delimiter: Separator line used by the "text" format.
+        jobs: Number of worker processes.
+
+    Returns:
+        The number of results written.
+
+    Raises:
+        ValueError: If the input format is unknown.
+    """
+    if input_format == "ndjson":
+        records = iter_ndjson_records(input_stream)
+    elif input_format == "text":
+        records = iter_delimited_records(input_stream, delimiter)
+    elif input_format == "anthology":
+        records = iter_anthology_records(input_stream)
+    else:
+        raise ValueError(f"Unknown input format '{input_format}', expected 'ndjson', 'text' or 'anthology'")
+
+    written = 0
+    for result in iter_stream_results(records, jobs=jobs):
+        output_stream.write(json.dumps(result, ensure_ascii=False))
+        output_stream.write("\n")
+        written += 1
+    output_stream.flush()
+    return written
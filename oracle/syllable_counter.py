@@ -2,9 +2,20 @@
 Syllable counting module for the Oracle Poetry Analyzer.
 """
 
+import atexit
+import logging
+import os
+import signal
+from pathlib import Path
+from types import FrameType
+
 import nltk # type: ignore[import-untyped]
 from nltk.corpus import cmudict # type: ignore[import-untyped]
 
+from oracle.lexicon import LEXICON_ENV, compile_pronunciations, load_lexicon_file, merge_lexicon
+from oracle.oov_cache import OovCache
+from oracle.tokenizer import ELISION, VOWELS, WRAPPED, TokenForm, normalize_token
+
 
 try:
     DICTIONARY_CMUDICT = cmudict.dict()
@@ -12,11 +23,123 @@ except LookupError:
     nltk.download('cmudict', quiet=True)
     DICTIONARY_CMUDICT = cmudict.dict()
 
+# Syllable counts of every CMUdict word, so lookups do not re-count phonemes
+_CMUDICT_SYLLABLES = compile_pronunciations(DICTIONARY_CMUDICT)
+
+# The table count_syllables reads: CMUdict merged with the custom lexicon.
+# It is only ever replaced as a whole, never modified in place.
+_syllable_table: dict[str, list[int]] = _CMUDICT_SYLLABLES
+_lexicon_path: Path | None = None
+
 # TODO increase accuracy of count_syllables by adding more rules
-VOWELS = "aeiouy"
 CONSONANTS = "bcdfghjklmnpqrstvwxyz"
 LETTERS = VOWELS + CONSONANTS
 
+# Bump whenever fallback_estimate changes, so cached OOV estimates are recomputed
+FALLBACK_VERSION = "1"
+
+OOV_CACHE_ENV = "ORACLE_OOV_CACHE"
+_oov_cache: OovCache | None = None
+
+logger = logging.getLogger(__name__)
+
+
+def configure_oov_cache(path: str | Path | None) -> OovCache | None:
+    """
+    Enable or disable the persistent cache for words missing from CMUdict.
+
+    Args:
+        path: The SQLite database to share between processes, or None to disable it.
+
+    Returns:
+        The active cache, or None when disabled.
+
+    Note:
+        The cache is configured from the ORACLE_OOV_CACHE environment variable on import.
+    """
+    global _oov_cache
+    if _oov_cache is not None:
+        _oov_cache.close()
+    _oov_cache = OovCache(path, estimator_version=FALLBACK_VERSION) if path else None
+    return _oov_cache
+
+
+def _close_oov_cache() -> None:
+    if _oov_cache is not None:
+        _oov_cache.close()
+
+
+configure_oov_cache(os.environ.get(OOV_CACHE_ENV))
+atexit.register(_close_oov_cache)
+
+
+def load_custom_lexicon(path: str | Path | None) -> int:
+    """
+    Compile a user lexicon over CMUdict and swap it in for count_syllables.
+
+    Args:
+        path: The JSON lexicon file (see oracle.lexicon), or None to use CMUdict only.
+
+    Returns:
+        The number of lexicon entries.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid lexicon. The current table stays in use.
+
+    Note:
+        The new table is built completely before one assignment replaces the old
+        one, so concurrent lookups see either the old or the new table.
+    """
+    global _syllable_table, _lexicon_path
+    overlay = load_lexicon_file(path) if path else {}
+    table = merge_lexicon(_CMUDICT_SYLLABLES, overlay) if overlay else _CMUDICT_SYLLABLES
+    _syllable_table = table
+    _lexicon_path = Path(path) if path else None
+    return len(overlay)
+
+
+def custom_lexicon_path() -> Path | None:
+    """Return the custom lexicon file in use, or None when only CMUdict is used."""
+    return _lexicon_path
+
+
+def reload_custom_lexicon() -> int:
+    """Re-read the current custom lexicon file, e.g. after it was edited."""
+    return load_custom_lexicon(_lexicon_path)
+
+
+def _reload_on_signal(signum: int, frame: FrameType | None) -> None:
+    try:
+        entries = reload_custom_lexicon()
+        logger.info("Reloaded custom lexicon: %d entries", entries)
+    except (OSError, ValueError) as e:
+        logger.error("Custom lexicon was not reloaded: %s", e)
+
+
+def install_lexicon_reload_handler() -> bool:
+    """
+    Reload the custom lexicon whenever the process receives SIGHUP.
+
+    The outcome of each reload is logged to the "oracle.syllable_counter" logger.
+
+    Returns:
+        True if the handler was installed, False on platforms without SIGHUP
+        or when not called from the main thread.
+    """
+    sighup = getattr(signal, "SIGHUP", None)
+    if sighup is None:
+        return False
+    try:
+        signal.signal(sighup, _reload_on_signal)
+    except ValueError:
+        return False
+    return True
+
+
+if os.environ.get(LEXICON_ENV):
+    load_custom_lexicon(os.environ[LEXICON_ENV])
+
 
 def count_phonetically(word: str) -> list[int]:
     """
@@ -49,27 +172,41 @@ def count_syllables(word: str) -> list[int]:
     Note:
         Returns a list because some words have multiple pronunciations.
     """
-    # case sensitive check, in case CMU has the word with different capitalization
-    if word in DICTIONARY_CMUDICT:
-        return count_phonetically(word)
-    word_lower = word.lower()
+    return count_form_syllables(normalize_token(word))
 
-    if word_lower in DICTIONARY_CMUDICT:
-        return count_phonetically(word_lower)
-    
-    if "'" in word_lower:
-        before, sep, after = word_lower.partition("'")
-        if before and after and any(v in VOWELS for v in before[-1:]) \
-            and any(v in VOWELS for v in after[:1]):
-            # it is a real elision -> fallback and subtract 1
-            return [fallback_estimate(word_lower) - 1]
-    
-    word_stripped = word_lower.strip(".,;:!?\"'()[]{}#*_")
+def count_form_syllables(form: TokenForm) -> list[int]:
+    """
+    Count syllables of an already normalized token (see oracle.tokenizer).
+
+    Args:
+        form: The (text, lower, normalized, flags) form of the token.
 
-    if word_stripped in DICTIONARY_CMUDICT:
-        return count_phonetically(word_stripped)
-    else:
-        return [fallback_estimate(word_stripped)]
+    Returns:
+        A list of possible syllable counts for the token.
+
+    Note:
+        Dictionary keys are lowercase, so the lowercase form is probed first and
+        the punctuation-stripped form only when it differs.
+    """
+    # Read the table once, so a concurrent lexicon reload cannot mix two tables
+    table = _syllable_table
+    _, word_lower, word_stripped, flags = form
+
+    counts = table.get(word_lower)
+    if counts is not None:
+        return list(counts)
+
+    if flags & ELISION:
+        # it is a real elision -> fallback and subtract 1
+        return [fallback_estimate(word_lower) - 1]
+
+    if flags & WRAPPED:
+        counts = table.get(word_stripped)
+        if counts is not None:
+            return list(counts)
+    if _oov_cache is not None and word_stripped:
+        return _oov_cache.lookup(word_stripped, lambda oov_word: [fallback_estimate(oov_word)])
+    return [fallback_estimate(word_stripped)]
 
 def fallback_estimate(word: str) -> int:
     """
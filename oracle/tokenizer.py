@@ -0,0 +1,156 @@
+"""
+Tokenizer module for splitting poem lines into normalized tokens.
+
+One pass over a line yields both views the analysis needs: the
+whitespace-separated words used for phrase patterns (anaphora, line openings)
+and the hyphen-split tokens used for syllable counting. Every token carries
+its lowercase and punctuation-stripped forms and flags, so consumers look
+words up directly instead of re-splitting and re-normalizing strings. Source
+offsets are computed only when asked for.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+VOWELS = "aeiouy"
+
+# Stripped from both ends of a word before the dictionary lookup
+WRAPPING_PUNCTUATION = ".,;:!?\"'()[]{}#*_"
+
+# Stripped from both ends of a repeated phrase by the anaphora detector
+PATTERN_PUNCTUATION = '.,!?":;'
+
+# Markdown-style emphasis stripped from both ends of every line by the parser
+MARKUP_CHARACTERS = "#*"
+
+# Token flags, combined with |. Plain ints because enum arithmetic is slow on this hot path.
+# The token is one part of a hyphenated word, e.g. "blood" in "blood-flow"
+HYPHEN_PART = 1
+# The apostrophe joins two vowels, e.g. "o'er", so one syllable is elided
+ELISION = 2
+# Punctuation was stripped from the ends, e.g. "(void)," -> "void"
+WRAPPED = 4
+
+# Words up to this length have their normalized form memoized
+MAX_CACHED_LENGTH = 64
+
+# A whitespace-separated word
+_WORD = re.compile(r"\S+")
+
+# (text, lower, normalized, flags): a token without its position, shared by repeated words
+TokenForm = tuple[str, str, str, int]
+
+
+@dataclass(slots=True)
+class Token:
+    """
+    A word or word part with its normalized forms and position.
+
+    Attributes:
+        text (str): The token as written.
+        lower (str): The token in lowercase.
+        normalized (str): The lowercase token without WRAPPING_PUNCTUATION at its ends.
+        start (int): Offset of the token in the line.
+        end (int): Offset just past the token in the line.
+        flags (int): HYPHEN_PART, ELISION and WRAPPED combined.
+    """
+
+    text: str
+    lower: str
+    normalized: str
+    start: int
+    end: int
+    flags: int
+
+
+def _is_elision(lower: str) -> bool:
+    before, _, after = lower.partition("'")
+    return bool(before) and bool(after) and before[-1] in VOWELS and after[0] in VOWELS
+
+
+def _normalize(text: str, flags: int) -> TokenForm:
+    lower = text.lower()
+    normalized = lower.strip(WRAPPING_PUNCTUATION)
+    if "'" in lower and _is_elision(lower):
+        flags |= ELISION
+    if normalized != lower:
+        flags |= WRAPPED
+    return (text, lower, normalized, flags)
+
+
+_normalize_cached = lru_cache(maxsize=65536)(_normalize)
+
+
+def normalize_token(text: str, flags: int = 0) -> TokenForm:
+    """
+    Normalize a single word.
+
+    Args:
+        text: The word as written.
+        flags: Flags known from the context, e.g. HYPHEN_PART.
+
+    Returns:
+        The (text, lower, normalized, flags) form, with ELISION and WRAPPED set as they apply.
+    """
+    if len(text) > MAX_CACHED_LENGTH:
+        return _normalize(text, flags)
+    return _normalize_cached(text, flags)
+
+
+@dataclass(slots=True)
+class TokenizedLine:
+    """
+    The tokens of one line.
+
+    Attributes:
+        text (str): The line text.
+        words (list[str]): Whitespace-separated words in lowercase, used for phrase patterns.
+        forms (list[TokenForm]): Words split on hyphens, used for syllable counting.
+            Consecutive hyphens produce empty tokens, which count zero syllables.
+
+    Methods:
+        tokens: Returns the forms as Token objects with their offsets in the line.
+    """
+
+    text: str
+    words: list[str]
+    forms: list[TokenForm]
+    _tokens: list[Token] | None = field(default=None, repr=False)
+
+    def tokens(self) -> list[Token]:
+        """Return the hyphen-split tokens with their offsets, computed on first use."""
+        if self._tokens is None:
+            forms = iter(self.forms)
+            tokens = []
+            for match in _WORD.finditer(self.text):
+                start = match.start()
+                for part in match[0].split("-"):
+                    text, lower, normalized, flags = next(forms)
+                    tokens.append(Token(text, lower, normalized, start, start + len(part), flags))
+                    start += len(part) + 1
+            self._tokens = tokens
+        return self._tokens
+
+
+def tokenize_line(text: str) -> TokenizedLine:
+    """
+    Split a line into lowercase words and hyphen-split tokens in one pass.
+
+    Args:
+        text: The line text.
+
+    Returns:
+        The line's words and token forms, in order.
+    """
+    words = []
+    forms: list[TokenForm] = []
+    for word in text.split():
+        form = normalize_token(word)
+        words.append(form[1])
+        if "-" in word:
+            forms.extend(normalize_token(part, HYPHEN_PART) for part in word.split("-"))
+        else:
+            forms.append(form)
+    return TokenizedLine(text=text, words=words, forms=forms)
@@ -2,6 +2,10 @@
 Utility functions for poem analysis.
 """
 
+import os
+import uuid
+from pathlib import Path
+
 
 def check_for_title_line(line: str, filename: str) -> bool:
     """
@@ -31,3 +35,28 @@ def check_for_title_line(line: str, filename: str) -> bool:
         return True
 
     return False
+
+
+
+def write_text_atomically(path: Path, text: str) -> None:
+    """
+    Write text to a file so readers only ever see the old or the complete new content.
+    
+    Args:
+        path: The file to write.
+        text: The content to write, encoded as UTF-8.
+    
+    Note:
+        The content goes to a temporary file in the same folder, which then
+        replaces the target with os.replace.
+    """
+
+    # Unique name so concurrent writers (e.g. CLI worker processes) never share a temp file
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, 'x', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,111 @@
+"""
+Watch module for re-analyzing poems as they change.
+
+Polls a poems folder with os.scandir and compares mtime/size snapshots, so it
+needs no platform-specific file-notification packages. A changed file is only
+re-analyzed once it has stayed unchanged for a debounce window, which keeps an
+editor's burst of saves down to a single analysis.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from oracle.discovery import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, iter_candidate_files
+
+
+@dataclass(frozen=True)
+class FileSnapshot:
+    """
+    The mtime and size of a file at one poll.
+
+    Attributes:
+        mtime_ns (int): Modification time in nanoseconds.
+        size (int): File size in bytes.
+    """
+
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class _PendingChange:
+    snapshot: FileSnapshot
+    changed_at: float
+
+
+class PollingWatcher:
+    """
+    Detects new and changed poem files by polling folder snapshots.
+
+    Attributes:
+        folder (Path): The folder being watched.
+        debounce (float): Seconds a file must stay unchanged before it is reported.
+
+    Methods:
+        prime: Records the current state without reporting anything.
+        poll: Scans the folder and returns the files that are ready to re-analyze.
+    """
+
+    def __init__(self, folder: str | Path, debounce: float = 1.0, recursive: bool = False,
+                 include: Sequence[str] = DEFAULT_INCLUDE, exclude: Sequence[str] = DEFAULT_EXCLUDE,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.folder = Path(folder)
+        self.debounce = debounce
+        self._recursive = recursive
+        self._include = include
+        self._exclude = exclude
+        self._clock = clock
+        self._processed: dict[str, FileSnapshot] = {}
+        self._pending: dict[str, _PendingChange] = {}
+
+    def _scan(self) -> dict[str, FileSnapshot]:
+        snapshots = {}
+        for entry, relative_name in iter_candidate_files(self.folder, self._recursive,
+                                                         self._include, self._exclude):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            snapshots[relative_name] = FileSnapshot(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        return snapshots
+
+    def prime(self) -> None:
+        """Treat every file currently in the folder as already processed."""
+        self._processed = self._scan()
+        self._pending.clear()
+
+    def poll(self) -> list[str]:
+        """
+        Scan the folder once.
+
+        Returns:
+            Relative names of new or changed files that have been stable for
+            at least the debounce window. Each change is reported once.
+        """
+        now = self._clock()
+        snapshots = self._scan()
+
+        # Forget deleted files so a re-created file counts as new
+        for name in set(self._processed) - set(snapshots):
+            del self._processed[name]
+        for name in set(self._pending) - set(snapshots):
+            del self._pending[name]
+
+        ready = []
+        for name, snapshot in snapshots.items():
+            if self._processed.get(name) == snapshot:
+                self._pending.pop(name, None)
+                continue
+
+            pending = self._pending.get(name)
+            if pending is None or pending.snapshot != snapshot:
+                # New change, or still being written: restart the debounce window
+                self._pending[name] = _PendingChange(snapshot=snapshot, changed_at=now)
+            elif now - pending.changed_at >= self.debounce:
+                del self._pending[name]
+                self._processed[name] = snapshot
+                ready.append(name)
+
+        return sorted(ready)
@@ -0,0 +1,313 @@
+"""
+HTTP load generator for the Oracle API.
+
+Drives `oracle.api:app` with a weighted mix of `/analyze`, `/batch-analyze` and
+`/health` requests, either in-process through an ASGI transport or over the
+network against a running (or freshly spawned) uvicorn server, and reports
+throughput and latency percentiles per route.
+
+Usage:
+    python -m scripts.load_test --in-process --duration 10 --concurrency 8
+    python -m scripts.load_test --spawn-uvicorn --workers 4 --output results.json
+    python -m scripts.load_test --url http://localhost:8000 --mix analyze=6,batch=3,health=1
+"""
+
+import asyncio
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+SAMPLE_POEM = """"Voidborn"
+Born out of the void
+Amidst the stars of flesh
+An illusion both full and empty
+O'er the abyss' watchful maw
+
+Gazes into the weary eyes of a lost stalker
+Who lies in blood-flow of the night"""
+
+ROUTES = {
+    "analyze": ("POST", "/analyze"),
+    "batch": ("POST", "/batch-analyze"),
+    "health": ("GET", "/health"),
+}
+
+DEFAULT_MIX = {"analyze": 7, "batch": 2, "health": 1}
+
+
+@dataclass
+class RouteStats:
+    """
+    Latency samples and error count collected for one route.
+
+    Attributes:
+        latencies (list[float]): Latency of every completed request, in seconds.
+        errors (int): Number of requests that failed or returned a non-2xx status.
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, float | int]:
+        """Return request count, throughput and latency percentiles in milliseconds."""
+        ordered = sorted(self.latencies)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        ordered: Samples sorted in ascending order.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        The sample at the requested rank, or 0.0 for an empty list.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """
+    Parse a traffic mix such as "analyze=7,batch=2,health=1".
+
+    Args:
+        spec: Comma separated route=weight pairs.
+
+    Returns:
+        A mapping from route name to integer weight.
+
+    Raises:
+        ValueError: If a route is unknown or a weight is not a non-negative integer.
+    """
+    mix: dict[str, int] = {}
+    for pair in spec.split(","):
+        name, _, weight = pair.strip().partition("=")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route '{name}', expected one of {sorted(ROUTES)}")
+        if not weight.isdigit():
+            raise ValueError(f"Weight for '{name}' must be a non-negative integer")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("At least one route needs a positive weight")
+    return mix
+
+
+def build_payload(route: str, batch_size: int) -> dict[str, Any] | None:
+    """Return the JSON body for a route, or None for GET routes."""
+    if route == "analyze":
+        return {"poem_text": SAMPLE_POEM, "title": "Voidborn"}
+    if route == "batch":
+        return {"poems": [{"poem_text": SAMPLE_POEM, "title": f"Voidborn {i}"}
+                          for i in range(batch_size)]}
+    return None
+
+
+async def _worker(client: httpx.AsyncClient, deadline: float, mix: dict[str, int],
+                  batch_size: int, stats: dict[str, RouteStats], rng: random.Random) -> None:
+    """Send requests back to back until the deadline passes."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    while time.perf_counter() < deadline:
+        route = rng.choices(names, weights=weights)[0]
+        method, path = ROUTES[route]
+        payload = build_payload(route, batch_size)
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=payload)
+            ok = response.is_success
+        except httpx.HTTPError:
+            ok = False
+        latency = time.perf_counter() - start
+
+        if ok:
+            stats[route].latencies.append(latency)
+        else:
+            stats[route].errors += 1
+
+
+async def run_load_test(client: httpx.AsyncClient, concurrency: int = 8, duration: float = 10.0,
+                        mix: dict[str, int] | None = None, batch_size: int = 5,
+                        seed: int | None = None) -> dict[str, Any]:
+    """
+    Run a fixed-duration load test through an already configured client.
+
+    Args:
+        client: An httpx.AsyncClient pointing at the API (ASGI transport or real server).
+        concurrency: Number of concurrent request loops.
+        duration: Test length in seconds.
+        mix: Route weights, defaults to DEFAULT_MIX.
+        batch_size: Number of poems per /batch-analyze request.
+        seed: Optional seed for reproducible route selection.
+
+    Returns:
+        A report with the configuration, overall totals and per-route statistics.
+    """
+    mix = mix or DEFAULT_MIX
+    stats = {route: RouteStats() for route in mix}
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _worker(client, deadline, mix, batch_size, stats, random.Random(rng.random()))
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    routes = {route: route_stats.summary(elapsed) for route, route_stats in stats.items()}
+    total_requests = sum(int(summary["requests"]) for summary in routes.values())
+    total_errors = sum(int(summary["errors"]) for summary in routes.values())
+
+    return {
+        "config": {
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "mix": mix,
+            "batch_size": batch_size,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": total_requests,
+        "total_errors": total_errors,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed > 0 else 0.0,
+        "routes": routes,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def spawn_uvicorn(workers: int = 1, port: int | None = None,
+                  startup_timeout: float = 30.0) -> tuple[subprocess.Popen[bytes], str]:
+    """
+    Start `uvicorn oracle.api:app` in a subprocess and wait until /health answers.
+
+    Args:
+        workers: Number of uvicorn worker processes.
+        port: Port to bind, a free one is picked when omitted.
+        startup_timeout: Seconds to wait for the server to become healthy.
+
+    Returns:
+        The server process and its base URL.
+
+    Raises:
+        RuntimeError: If the server does not become healthy in time.
+    """
+    port = port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "oracle.api:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+    )
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).is_success:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not become healthy within {startup_timeout}s")
+
+
+def save_report(report: dict[str, Any], output_path: str) -> None:
+    """Write a load-test report as indented JSON."""
+    Path(output_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print a compact per-route table of the report."""
+    print(f"{report['total_requests']} requests in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s, {report['total_errors']} errors)")
+    print(f"{'route':<8} {'reqs':>7} {'err':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for route, summary in report["routes"].items():
+        print(f"{route:<8} {summary['requests']:>7} {summary['errors']:>5} "
+              f"{summary['throughput_rps']:>9} {summary['p50_ms']:>9} {summary['p95_ms']:>9} "
+              f"{summary['p99_ms']:>9} {summary['max_ms']:>9}")
+
+
+async def _run_from_args(args: Any) -> dict[str, Any]:
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    options = {"concurrency": args.concurrency, "duration": args.duration, "mix": mix,
+               "batch_size": args.batch_size, "seed": args.seed}
+
+    if args.in_process:
+        from oracle.api import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://oracle") as client:
+            report = await run_load_test(client, **options)
+        report["target"] = {"kind": "asgi"}
+        return report
+
+    process = None
+    base_url = args.url
+    if args.spawn_uvicorn:
+        process, base_url = spawn_uvicorn(workers=args.workers)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+            report = await run_load_test(client, **options)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    report["target"] = {"kind": "uvicorn" if args.spawn_uvicorn else "url",
+                        "url": base_url, "workers": args.workers if args.spawn_uvicorn else None}
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Oracle of the Abyss - API load generator")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--in-process", action="store_true", help="Drive the app through an in-process ASGI transport")
+    target.add_argument("--spawn-uvicorn", action="store_true", help="Start a local uvicorn server for the run")
+    target.add_argument("--url", type=str, default="http://localhost:8000", help="Base URL of a running server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker count when using --spawn-uvicorn")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent request loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--mix", type=str, default="", help="Route weights, e.g. analyze=7,batch=2,health=1")
+    parser.add_argument("--batch-size", type=int, default=5, help="Poems per /batch-analyze request")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for route selection")
+    parser.add_argument("--label", type=str, default="", help="Free-form label stored in the report")
+    parser.add_argument("--output", type=str, default="", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(_run_from_args(args))
+    report["label"] = args.label
+    print_report(report)
+    if args.output:
+        save_report(report, args.output)
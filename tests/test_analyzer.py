@@ -1,3 +1,4 @@
+import pytest
 from pathlib import Path
 from oracle.poem_model import Poem
 from oracle.analyzer import analyze_poem
@@ -32,4 +33,72 @@ def test_analyze_poem_has_stanzas_in_list():
         'poetic_devices': [[], []]
     }
     
-    assert analysis == expected, f"Poem analysis did not match expected output. Instead got: {analysis}"
\ No newline at end of file
+    assert analysis == expected, f"Poem analysis did not match expected output. Instead got: {analysis}"
+
+
+def test_analyze_poem_includes_rhyme_schemes_on_request():
+    """rhyme_schemes is only added when requested; unknown analyses are rejected."""
+    poem = Poem(text="The night is dark\nThe moon is bright\n\nI see the cat\nUpon the mat",
+                filepath=Path("rhymes.txt"))
+
+    assert "rhyme_schemes" not in analyze_poem(poem)
+    assert analyze_poem(poem, include=["rhyme_schemes"])["rhyme_schemes"] == ["AB", "AA"]
+    with pytest.raises(ValueError):
+        analyze_poem(poem, include=["nonsense"])
+
+
+def test_analyze_poem_includes_meters_on_request():
+    """Meters are reported per line and per stanza."""
+    poem = Poem(text="Tyger Tyger, burning bright,\nIn the forests of the night;", filepath=Path("tyger.txt"))
+
+    result = analyze_poem(poem, include=["meters"])
+
+    assert result["meters"] == [["trochaic tetrameter", "trochaic tetrameter"]]
+    assert result["meter_deviations"] == [[1, 1]]
+    assert result["stanza_meters"] == ["trochaic tetrameter"]
+
+
+def test_analyze_poem_includes_syllable_totals_on_request():
+    """Minimum, maximum and all achievable totals are reported per line."""
+    poem = Poem(text="fire our\ntest", filepath=Path("totals.txt"))
+
+    result = analyze_poem(poem, include=["syllable_totals"])
+
+    assert result["min_syllables_per_line"] == [[2, 1]]
+    assert result["max_syllables_per_line"] == [[4, 1]]
+    assert result["possible_syllables_per_line"] == [[[2, 3, 4], [1]]]
+
+
+def test_analyze_poem_includes_forms_on_request():
+    """Poem-level forms are reported best first with percent scores."""
+    poem = Poem(text="An old silent pond\nA frog jumps into the pond\nSplash! Silence again",
+                filepath=Path("haiku.txt"))
+
+    result = analyze_poem(poem, include=["forms"])
+
+    assert result["forms"] == ["haiku"]
+    assert result["form_scores"] == [100]
+    assert "forms" not in analyze_poem(poem)
+
+
+def test_analyze_poem_adds_sound_devices_to_poetic_devices():
+    """Sound devices follow the anaphora patterns of their stanza, only on request."""
+    poem = Poem(text="The dark and deep and dreaming sea\nThe sea", filepath=Path("sound.txt"))
+
+    result = analyze_poem(poem, include=["sound_devices"])
+
+    assert result["poetic_devices"] == [["alliteration: dark deep dreaming", "assonance: deep dreaming sea"]]
+    assert result["poetic_device_types"] == [["alliteration", "assonance"]]
+    assert result["poetic_device_patterns"] == [["dark deep dreaming", "deep dreaming sea"]]
+    assert analyze_poem(poem)["poetic_devices"] == [[]]
+    assert "poetic_device_types" not in analyze_poem(poem)
+
+
+def test_analyze_poem_includes_repetitions_on_request():
+    """Repeated phrases are labelled by device with [stanza, line, word] positions."""
+    poem = Poem(text="Rage against the night\nand rage\n\nRage against the night", filepath=Path("refrain.txt"))
+
+    result = analyze_poem(poem, include=["repetitions"])
+
+    assert result["repetitions"] == ["refrain: rage against the night"]
+    assert result["repetition_positions"] == [[[0, 0, 0], [1, 0, 0]]]
@@ -0,0 +1,91 @@
+import io
+
+from oracle.anthology import AnthologySplitter, iter_anthology_poems, read_anthology
+from oracle.parser import parse_into_stanzas
+from oracle.streaming import run_stream
+
+
+ANTHOLOGY = """"Voidborn"
+Born out of the void
+Amidst the stars of flesh
+
+Second stanza here
+still the same poem
+
+
+THE ABYSS
+Deep below the surface
+it waits
+
+* * *
+An untitled poem
+after an ornament
+"""
+
+
+def test_split_on_titles_after_blank_lines_and_separators():
+    """Titles after two blank lines and ornament lines both start a new poem."""
+    poems = list(iter_anthology_poems(io.StringIO(ANTHOLOGY), source_name="collected"))
+
+    assert [poem.filename for poem in poems] == ["Voidborn", "THE ABYSS", "collected 3"]
+    assert poems[0].text.endswith("still the same poem")
+    assert poems[2].text == "An untitled poem\nafter an ornament"
+
+
+def test_title_line_is_dropped_by_the_parser():
+    """Poems are named after their title, so the parser leaves the title line out."""
+    poem = next(iter_anthology_poems(io.StringIO(ANTHOLOGY)))
+
+    stanzas = parse_into_stanzas(poem.text, poem.filename)
+
+    assert stanzas[0].lines[0].text == "Born out of the void"
+    assert len(stanzas) == 2
+
+
+def test_caps_line_without_blank_run_stays_in_poem():
+    """An all-caps line after a single blank line is a stanza, not a new poem."""
+    text = "First line\nsecond line\n\nTHE REFRAIN\nlast line\n"
+
+    poems = list(iter_anthology_poems(io.StringIO(text)))
+
+    assert len(poems) == 1
+    assert "THE REFRAIN" in poems[0].text
+
+
+def test_numbered_titles_and_custom_rules():
+    """Numbered titles split by default; the rules can be replaced."""
+    text = "1.\nfirst poem\n\n\n2.\nsecond poem\n"
+
+    assert [poem.filename for poem in iter_anthology_poems(io.StringIO(text))] == ["1.", "2."]
+
+    splitter = AnthologySplitter(separators=["%%"], title_patterns=[], blank_lines_before_title=1)
+    poems = list(splitter.split(["a line", "%%", "another line", "", "NEXT", "text"]))
+    assert [poem.text for poem in poems] == ["a line", "another line", "NEXT\ntext"]
+
+
+def test_title_with_path_separator_is_sanitized():
+    """Slashes in titles never become folder names."""
+    poems = list(iter_anthology_poems(['"Night/Day"', "a line"]))
+
+    assert poems[0].filepath.name == "Night-Day.txt"
+
+
+def test_read_anthology_streams_a_file(tmp_path):
+    """Files are read lazily and untitled poems are named after the file."""
+    path = tmp_path / "book.txt"
+    path.write_text("one\n---\ntwo\n---\n\n---\n", encoding="utf-8")
+
+    poems = read_anthology(path)
+
+    assert next(poems).filename == "book 1"
+    assert [poem.text for poem in poems] == ["two"]
+
+
+def test_run_stream_with_anthology_format():
+    """Stream mode analyzes each poem of an anthology separately."""
+    stdout = io.StringIO()
+
+    written = run_stream(io.StringIO(ANTHOLOGY), stdout, input_format="anthology")
+
+    assert written == 3
+    assert '"title": "THE ABYSS"' in stdout.getvalue()
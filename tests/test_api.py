@@ -67,6 +67,16 @@ class TestAnalyzeEndpoint:
         assert response.status_code == 400
         assert "detail" in response.json()
 
+    def test_analyze_poem_with_rhyme_schemes(self):
+        """Optional analyses are added on request; unknown ones return 400."""
+        request_data = {"poem_text": "The night is dark\nThe moon is bright", "include": ["rhyme_schemes"]}
+
+        response = client.post("/analyze", json=request_data)
+        unknown = client.post("/analyze", json={"poem_text": "A line", "include": ["nonsense"]})
+
+        assert response.json()["rhyme_schemes"] == ["AB"]
+        assert unknown.status_code == 400
+
     def test_analyze_poem_missing_poem_text_returns_422(self):
         """Test that missing required poem_text field returns 422 Unprocessable Entity."""
         request_data = {
@@ -223,6 +233,14 @@ class TestBatchAnalyzeEndpoint:
         result_titles = [r["title"] for r in data["results"]]
         assert result_titles == titles
 
+    def test_batch_analyze_with_syllable_totals(self):
+        """Nested per-line totals pass through the batch result model."""
+        request_data = {"poems": [{"poem_text": "fire our", "include": ["syllable_totals"]}]}
+
+        response = client.post("/batch-analyze", json=request_data)
+
+        assert response.json()["results"][0]["analysis"]["possible_syllables_per_line"] == [[[2, 3, 4]]]
+
 
 class TestHealthCheckEndpoint:
     """Tests for the /health endpoint."""
@@ -381,3 +399,311 @@ Who lies in blood-flow of the night"""
         data = response.json()
         assert len(data["stanza_texts"]) == 2
         assert data["line_counts"] == [4, 2]
+
+
+class TestAnalyzeStreamEndpoint:
+    """Tests for the streaming text/plain upload endpoint."""
+
+    POEM = "Voidborn\nBorn out of the void\nAmidst the stars of flesh\n\nI am the storm\nI am the calm\n"
+
+    @staticmethod
+    def _lines(response):
+        import json
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_stream_matches_analyze_endpoint(self):
+        """Per-stanza results match /analyze, however the body is chunked."""
+        body = self.POEM.encode("utf-8")
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+
+        response = client.post("/analyze/stream", params={"title": "Voidborn"}, content=iter(chunks),
+                               headers={"Content-Type": "text/plain"})
+        expected = client.post("/analyze", json={"poem_text": self.POEM, "title": "Voidborn"}).json()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = self._lines(response)
+        assert [line["stanza_text"] for line in lines[:-1]] == expected["stanza_texts"]
+        assert [line["syllables_per_line"] for line in lines[:-1]] == expected["syllables_per_line"]
+        assert [line["poetic_devices"] for line in lines[:-1]] == expected["poetic_devices"]
+        assert lines[-1] == {"title": "Voidborn", "total": 2}
+
+    def test_stream_decodes_characters_split_across_chunks(self):
+        """Multi-byte characters split between chunks are decoded whole."""
+        body = "Été sombre\nnuit".encode("utf-8")
+
+        response = client.post("/analyze/stream", content=iter([body[:1], body[1:]]),
+                               headers={"Content-Type": "text/plain; charset=utf-8"})
+
+        assert self._lines(response)[0]["stanza_text"] == "Été sombre\nnuit"
+
+    def test_stream_reports_invalid_encoding(self):
+        """An undecodable body ends the stream with an error line."""
+        response = client.post("/analyze/stream", content=b"line\n\xff\xfe",
+                               headers={"Content-Type": "text/plain"})
+
+        assert "error" in self._lines(response)[-1]
+
+    def test_stream_reports_unparsable_stanza_and_continues(self):
+        """A markup-only stanza gets an error line; later stanzas and the total still follow."""
+        body = "Born out of the void\n\n***\n\nI am the storm\n"
+
+        response = client.post("/analyze/stream", content=body.encode("utf-8"),
+                               headers={"Content-Type": "text/plain"})
+        analyze = client.post("/analyze", json={"poem_text": body})
+
+        lines = self._lines(response)
+        assert analyze.status_code == 400
+        assert [line.get("stanza_text") for line in lines[:-1]] == ["Born out of the void", "", "I am the storm"]
+        assert lines[1]["stanza"] == 1 and "empty" in lines[1]["error"]
+        assert "error" not in lines[2]
+        assert lines[-1] == {"title": "Untitled", "total": 3}
+
+    def test_stream_rejects_other_content_types(self):
+        """Only raw text bodies are accepted."""
+        response = client.post("/analyze/stream", json={"poem_text": "A line"})
+        unknown_charset = client.post("/analyze/stream", content=b"A line",
+                                      headers={"Content-Type": "text/plain; charset=nope"})
+
+        assert response.status_code == 415
+        assert unknown_charset.status_code == 415
+
+
+class TestJobEndpoints:
+    """Tests for the background job endpoints."""
+
+    @pytest.fixture
+    def jobs_db(self, tmp_path, monkeypatch):
+        import oracle.api
+
+        path = tmp_path / "jobs.db"
+        monkeypatch.setenv("ORACLE_JOBS_DB", str(path))
+        monkeypatch.setenv("ORACLE_JOBS_ROOT", str(tmp_path))
+        yield path
+        if oracle.api._job_runner is not None:
+            oracle.api._job_runner.stop(timeout=10)
+            oracle.api._job_runner = None
+
+    @staticmethod
+    def _wait_for(job_id):
+        import time
+
+        deadline = time.monotonic() + 10
+        status = client.get(f"/jobs/{job_id}").json()
+        while status["status"] not in ("done", "failed") and time.monotonic() < deadline:
+            time.sleep(0.05)
+            status = client.get(f"/jobs/{job_id}").json()
+        return status
+
+    def test_job_is_processed_in_the_background(self, jobs_db):
+        """POST /jobs answers 202 with an id; status and results follow."""
+        response = client.post("/jobs", json={"poems": [{"poem_text": "I am the storm", "title": "Storm"},
+                                                        {"poem_text": "   ", "title": "Empty"}]})
+
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        status = self._wait_for(job_id)
+        results = client.get(f"/jobs/{job_id}/results", params={"limit": 1}).json()
+        rest = client.get(f"/jobs/{job_id}/results", params={"cursor": results["next_cursor"]}).json()
+
+        assert (status["status"], status["done"], status["failed"]) == ("done", 1, 1)
+        assert results["results"][0]["analysis"]["syllables_per_line"] == [[4]]
+        assert rest["results"][0]["error"] and rest["next_cursor"] is None
+
+    def test_folder_job_stays_inside_jobs_root(self, jobs_db, tmp_path):
+        """Folders are resolved inside ORACLE_JOBS_ROOT; anything else is refused."""
+        (tmp_path / "corpus").mkdir()
+        (tmp_path / "corpus" / "poem.txt").write_text("Born out of the void", encoding="utf-8")
+
+        accepted = client.post("/jobs", json={"path": "corpus"})
+        outside = client.post("/jobs", json={"path": "../"})
+
+        assert accepted.status_code == 202
+        assert self._wait_for(accepted.json()["id"])["done"] == 1
+        assert outside.status_code == 403
+
+    def test_job_request_errors(self, jobs_db):
+        """Requests need exactly one source; unknown jobs are 404."""
+        assert client.post("/jobs", json={}).status_code == 400
+        assert client.get("/jobs/unknown").status_code == 404
+        assert client.get("/jobs/unknown/results").status_code == 404
+
+    def test_concurrent_first_requests_start_one_runner(self, jobs_db, monkeypatch):
+        """Two threads asking for the runner at once share a single one."""
+        import threading
+        import time
+        import oracle.api
+
+        created = []
+
+        class SlowRunner:
+            def __init__(self, path, workers):
+                time.sleep(0.05)
+                self.path = Path(path)
+                created.append(self)
+
+            def start(self):
+                pass
+
+            def stop(self, timeout=None):
+                pass
+
+        monkeypatch.setattr(oracle.api, "JobRunner", SlowRunner)
+        runners = []
+        threads = [threading.Thread(target=lambda: runners.append(oracle.api._start_job_runner(str(jobs_db))))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1
+        assert all(runner is created[0] for runner in runners)
+
+    def test_jobs_without_database_return_404(self, monkeypatch):
+        """Without ORACLE_JOBS_DB the job endpoints are not available."""
+        monkeypatch.delenv("ORACLE_JOBS_DB", raising=False)
+        assert client.post("/jobs", json={"poems": []}).status_code == 404
+
+
+class TestStoreEndpoints:
+    """Tests for the read-only /store query endpoints."""
+
+    @pytest.fixture
+    def store_path(self, tmp_path, monkeypatch):
+        from oracle.analyzer import analyze_poem
+        from oracle.poem_model import Poem
+        from oracle.store import AnalysisStore
+
+        poem = Poem(text="I am the storm\nI am the calm", filepath=Path("storm.txt"))
+        path = tmp_path / "analyses.db"
+        with AnalysisStore(path) as store:
+            store.add_poems([("storm.txt", analyze_poem(poem))])
+        monkeypatch.setenv("ORACLE_STORE_PATH", str(path))
+        return path
+
+    def test_store_endpoints_answer_queries(self, store_path):
+        """Stanza, poem and line queries are answered from the store."""
+        stanzas = client.get("/store/stanzas", params={"profile": "4-4"}).json()
+        poems = client.get("/store/poems", params={"anaphora": "i am"}).json()
+        lines = client.get("/store/lines", params={"min_syllables": 4, "max_syllables": 4}).json()
+
+        assert stanzas["total"] == 1 and stanzas["results"][0]["poem"] == "storm.txt"
+        assert poems == {"results": ["storm.txt"], "total": 1}
+        assert lines["total"] == 2
+
+    def test_store_endpoint_rejects_bad_profile(self, store_path):
+        """A malformed profile returns 400."""
+        response = client.get("/store/stanzas", params={"profile": "five"})
+        assert response.status_code == 400
+
+    def test_store_endpoints_without_store_return_404(self, monkeypatch):
+        """Without ORACLE_STORE_PATH the store endpoints are not available."""
+        monkeypatch.delenv("ORACLE_STORE_PATH", raising=False)
+        response = client.get("/store/poems", params={"anaphora": "i am"})
+        assert response.status_code == 404
+
+
+class TestReloadLexiconEndpoint:
+    """Tests for POST /admin/reload-lexicon."""
+
+    @pytest.fixture
+    def lexicon(self, tmp_path, monkeypatch):
+        from oracle.syllable_counter import load_custom_lexicon
+
+        path = tmp_path / "lexicon.json"
+        path.write_text('{"voidborn": 2}')
+        load_custom_lexicon(path)
+        monkeypatch.setenv("ORACLE_ADMIN_TOKEN", "secret")
+        yield path
+        load_custom_lexicon(None)
+
+    def test_reload_lexicon(self, lexicon):
+        """The current lexicon file is re-read with a valid admin token."""
+        lexicon.write_text('{"voidborn": 3, "maw": 1}')
+        response = client.post("/admin/reload-lexicon", headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 200
+        assert response.json() == {"entries": 2, "path": str(lexicon)}
+
+    def test_reload_lexicon_requires_token(self, lexicon, monkeypatch):
+        """A wrong token is rejected, and without a configured token the endpoint is hidden."""
+        assert client.post("/admin/reload-lexicon", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        monkeypatch.delenv("ORACLE_ADMIN_TOKEN")
+        assert client.post("/admin/reload-lexicon").status_code == 404
+
+    def test_reload_lexicon_rejects_invalid_file(self, lexicon):
+        """An invalid lexicon file answers 400."""
+        lexicon.write_text("[1, 2]")
+        response = client.post("/admin/reload-lexicon", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 400
+
+    def test_importing_the_api_keeps_the_sighup_handler(self):
+        """The SIGHUP reload handler is installed by the app's lifespan, not as an import side effect."""
+        import subprocess
+        import sys
+
+        script = ("import signal; before = signal.getsignal(signal.SIGHUP); import oracle.api; "
+                  "print(signal.getsignal(signal.SIGHUP) is before)")
+        completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        assert completed.stdout.strip() == "True"
+
+
+class TestServeFrontend:
+    """Tests for the in-memory frontend assets."""
+
+    SCRIPT = "console.log('oracle');\n" * 100
+
+    @pytest.fixture
+    def dist(self, tmp_path, monkeypatch):
+        from oracle import api
+
+        dist = tmp_path / "dist"
+        (dist / "assets").mkdir(parents=True)
+        (dist / "index.html").write_text("<!doctype html><div id=root></div>")
+        (dist / "assets" / "index-BXk2a9Lq.js").write_text(self.SCRIPT)
+        (tmp_path / "secret.txt").write_text("outside dist")
+        monkeypatch.setattr(api, "_DIST_DIR", dist)
+        monkeypatch.setattr(api, "_asset_table", None)
+        return dist
+
+    def test_hashed_asset_is_compressed_and_immutable(self, dist):
+        response = client.get("/assets/index-BXk2a9Lq.js", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.headers["content-type"].startswith("application/javascript")
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.text == self.SCRIPT
+
+    def test_identity_when_compression_is_not_accepted(self, dist):
+        response = client.get("/assets/index-BXk2a9Lq.js", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == self.SCRIPT.encode()
+
+    def test_not_modified_with_matching_etag(self, dist):
+        first = client.get("/index.html")
+        assert first.headers["cache-control"] == "no-cache"
+
+        second = client.get("/index.html", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_unknown_paths_fall_back_to_index(self, dist):
+        response = client.get("/poems/some-route")
+        assert response.status_code == 200
+        assert "id=root" in response.text
+
+    def test_paths_outside_dist_are_never_served(self, dist):
+        for path in ("/../secret.txt", "/%2e%2e/secret.txt", "/assets/..%2f..%2fsecret.txt"):
+            response = client.get(path)
+            assert "outside dist" not in response.text
+
+    def test_missing_frontend(self, tmp_path, monkeypatch):
+        from oracle import api
+
+        monkeypatch.setattr(api, "_DIST_DIR", tmp_path / "missing")
+        monkeypatch.setattr(api, "_asset_table", None)
+        assert client.get("/").json() == {"error": "Frontend not found"}
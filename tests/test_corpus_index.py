@@ -0,0 +1,82 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from oracle.corpus_index import CorpusIndex, normalize_tokens
+
+
+ANALYSES = {
+    "haiku.txt": {"stanza_texts": ["An old silent pond\nA frog jumps into the pond\nSplash! Silence again"],
+                  "syllables_per_line": [[5, 7, 5]]},
+    "storm.txt": {"stanza_texts": ["I am the storm\nI am the calm", "Oh, Captain! my Captain"],
+                  "syllables_per_line": [[4, 4], [5]]},
+}
+
+
+@pytest.fixture
+def index() -> CorpusIndex:
+    index = CorpusIndex()
+    for name, analysis in ANALYSES.items():
+        index.add_poem(name, analysis)
+    return index
+
+
+def test_normalize_tokens_strips_case_and_punctuation():
+    """Tokens are lowercased and lose the punctuation anaphora ignores."""
+    assert normalize_tokens("Oh, Captain!  my Captain") == ["oh", "captain", "my", "captain"]
+
+
+def test_lookups(index: CorpusIndex):
+    """Lines and stanzas are found by syllables, signature and opening phrase."""
+    assert index.lines_with_syllables(5) == [("haiku.txt", 0, 0), ("haiku.txt", 0, 2), ("storm.txt", 1, 0)]
+    assert index.stanzas_with_signature([5, 7, 5]) == [("haiku.txt", 0)]
+    assert index.lines_starting_with("I AM") == [("storm.txt", 0, 0), ("storm.txt", 0, 1)]
+    assert index.lines_starting_with("oh captain") == [("storm.txt", 1, 0)]
+    assert index.line_text(("haiku.txt", 0, 1)) == "A frog jumps into the pond"
+
+    with pytest.raises(ValueError):
+        index.lines_starting_with("i am the storm")
+
+
+def test_incremental_updates(index: CorpusIndex):
+    """Replacing or removing a poem only changes that poem's entries."""
+    index.add_poem("storm.txt", {"stanza_texts": ["Just one line"], "syllables_per_line": [[3]]})
+    assert index.lines_starting_with("i am") == []
+    assert index.lines_with_syllables(3) == [("storm.txt", 0, 0)]
+
+    index.remove_poem("haiku.txt")
+    index.remove_poem("missing.txt")
+    assert len(index) == 1 and "haiku.txt" not in index
+    assert index.stanzas_with_signature([5, 7, 5]) == []
+    assert index.lines_with_syllables(5) == []
+
+
+def test_save_and_load(index: CorpusIndex, tmp_path: Path):
+    """A saved index answers the same queries after loading."""
+    index.save(tmp_path / "index.json")
+    loaded = CorpusIndex.load(tmp_path / "index.json")
+
+    assert len(loaded) == 2
+    assert loaded.stanzas_with_signature([4, 4]) == [("storm.txt", 0)]
+
+    (tmp_path / "other.json").write_text("[]")
+    with pytest.raises(ValueError):
+        CorpusIndex.load(tmp_path / "other.json")
+
+
+def test_lookups_stay_fast_on_a_large_corpus():
+    """Lookups cost a dictionary access, not a scan of the corpus."""
+    index = CorpusIndex()
+    for poem in range(2000):
+        index.add_poem(f"poem{poem}.txt", {"stanza_texts": [f"Line {poem} of the deep\nAnother line here"],
+                                           "syllables_per_line": [[poem % 20, 5]]})
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.stanzas_with_signature([7, 5])
+        index.lines_starting_with("line 42")
+    elapsed = (time.perf_counter() - start) / 200
+
+    assert index.lines_starting_with("line 42 of") == [("poem42.txt", 0, 0)]
+    assert elapsed < 0.001
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from oracle import corpus_output
+from oracle.corpus_output import ColumnarCorpus, ColumnarCorpusWriter, JsonlCorpusWriter, read_jsonl_corpus
+
+
+ANALYSES = {
+    "one.txt": {"stanza_texts": ["a\nb", "c"], "line_counts": [2, 1],
+                "syllables_per_line": [[5, 7], [5]], "poetic_devices": [[], []]},
+    "two.txt": {"stanza_texts": ["d"], "line_counts": [1],
+                "syllables_per_line": [[10]], "poetic_devices": [[]]},
+}
+
+
+def test_jsonl_corpus_round_trip(tmp_path: Path):
+    """Analyses written to a JSONL corpus are read back in order."""
+    path = tmp_path / "corpus.jsonl"
+    with JsonlCorpusWriter(path) as writer:
+        for name, analysis in ANALYSES.items():
+            writer.write(name, analysis)
+
+    records = list(read_jsonl_corpus(path))
+
+    assert [record["poem"] for record in records] == ["one.txt", "two.txt"]
+    assert records[0]["analysis"] == ANALYSES["one.txt"]
+
+
+def test_jsonl_corpus_append(tmp_path: Path):
+    """Append mode adds records after the existing ones."""
+    path = tmp_path / "corpus.jsonl"
+    with JsonlCorpusWriter(path) as writer:
+        writer.write("one.txt", ANALYSES["one.txt"])
+    with JsonlCorpusWriter(path, append=True) as writer:
+        writer.write("two.txt", ANALYSES["two.txt"])
+
+    assert [record["poem"] for record in read_jsonl_corpus(path)] == ["one.txt", "two.txt"]
+
+
+def test_columnar_corpus_round_trip(tmp_path: Path, monkeypatch):
+    """Syllables are stored as flat arrays with offsets and memory-mapped back."""
+    monkeypatch.setattr(corpus_output, "FLUSH_EVERY", 1)  # exercise multiple flushes
+    with ColumnarCorpusWriter(tmp_path / "corpus") as writer:
+        for name, analysis in ANALYSES.items():
+            writer.write(name, analysis)
+
+    with ColumnarCorpus(tmp_path / "corpus") as corpus:
+        assert len(corpus) == 2
+        assert corpus.poem_names() == ["one.txt", "two.txt"]
+        assert corpus.syllables.tolist() == [5, 7, 5, 10]
+        assert corpus.stanza_offsets.tolist() == [0, 2, 3, 4]
+        assert corpus.poem_offsets.tolist() == [0, 2, 3]
+        assert corpus.poem_syllables(0) == [[5, 7], [5]]
+        assert corpus.poem_syllables(1) == [[10]]
+        assert sum(corpus.syllables) == 27
+
+
+def test_columnar_corpus_append(tmp_path: Path):
+    """Appending to a columnar corpus continues its offsets."""
+    with ColumnarCorpusWriter(tmp_path / "corpus") as writer:
+        writer.write("one.txt", ANALYSES["one.txt"])
+    with ColumnarCorpusWriter(tmp_path / "corpus", append=True) as writer:
+        writer.write("two.txt", ANALYSES["two.txt"])
+
+    with ColumnarCorpus(tmp_path / "corpus") as corpus:
+        assert corpus.poem_syllables(1) == [[10]]
+        assert corpus.poem_offsets.tolist() == [0, 2, 3]
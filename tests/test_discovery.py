@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from oracle import discovery
+from oracle.discovery import iter_poem_files
+
+
+def test_iter_poem_files_skips_empty_and_analysis_files(tmp_path: Path):
+    """Empty, whitespace-only and '_analysis.txt' files are not yielded."""
+    (tmp_path / "poem.txt").write_text("A poem")
+    (tmp_path / "empty.txt").write_text("")
+    (tmp_path / "blank.md").write_text("  \n\t\n")
+    (tmp_path / "poem_analysis.txt").write_text("Stanza 1:")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+
+    names = [poem_file.name for poem_file in iter_poem_files(tmp_path)]
+
+    assert names == ["poem.txt"]
+
+
+def test_small_files_are_read_once(tmp_path: Path, monkeypatch):
+    """The discovery peek keeps small files in memory so analysis does not re-read them."""
+    (tmp_path / "poem.txt").write_text("Roses are red\r\nViolets are blue")
+
+    poem_file = next(iter_poem_files(tmp_path))
+    monkeypatch.setattr(Path, "read_bytes", lambda self: (_ for _ in ()).throw(AssertionError("re-read")))
+
+    assert poem_file.read_text() == "Roses are red\nViolets are blue"
+
+
+def test_large_files_are_read_lazily(tmp_path: Path, monkeypatch):
+    """Files larger than the peek are only read in full when their content is requested."""
+    monkeypatch.setattr(discovery, "PEEK_BYTES", 16)
+    (tmp_path / "long.txt").write_text(" " * 40 + "late words")
+    (tmp_path / "spaces.txt").write_text(" " * 40)
+
+    found = list(iter_poem_files(tmp_path))
+
+    assert [poem_file.name for poem_file in found] == ["long.txt"]
+    assert found[0]._content is None
+    assert found[0].read_text().strip() == "late words"
+
+
+def test_recursive_discovery_skips_hidden_folders(tmp_path: Path):
+    """Recursion descends into subfolders but not hidden ones."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "one.txt").write_text("One")
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / ".cache" / "two.txt").write_text("Two")
+
+    names = sorted(poem_file.name for poem_file in iter_poem_files(tmp_path, recursive=True))
+
+    assert names == ["a/one.txt"]
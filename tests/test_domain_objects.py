@@ -160,3 +160,16 @@ def test_line_all_variants_edge_cases():
     case_line_simple = Line(text="test")  # test=[1]
     variants_simple = case_line_simple.get_all_syllable_variants()
     assert variants_simple == [[1]]
+
+
+def test_line_get_possible_syllable_totals():
+    """Every combination of word variants is reflected in the totals."""
+    assert Line(text="fire our").get_possible_syllable_totals() == [2, 3, 4]
+    assert Line(text="test").get_possible_syllable_totals() == [1]
+
+
+def test_line_possible_syllable_totals_scale_to_long_lines():
+    """Long lines of ambiguous words do not enumerate the exponential number of combinations."""
+    case_line = Line(text=" ".join(["fire"] * 400))
+
+    assert case_line.get_possible_syllable_totals() == list(range(400, 801))
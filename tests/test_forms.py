@@ -0,0 +1,126 @@
+from oracle.analysis.forms import FORMS, Form, classify_form, refrains, syllables
+from oracle.domain_objects import Line, Stanza
+
+
+HAIKU = ["An old silent pond", "A frog jumps into the pond", "Splash! Silence again"]
+
+LIMERICK = [
+    "There was an old man with a beard",
+    "Who said it is just as I feared",
+    "Two owls and a hen",
+    "Four larks and a wren",
+    "Have all built their nests in my beard",
+]
+
+SONNET = [
+    "Shall I compare thee to a summer's day?",
+    "Thou art more lovely and more temperate:",
+    "Rough winds do shake the darling buds of May,",
+    "And summer's lease hath all too short a date;",
+    "Sometime too hot the eye of heaven shines,",
+    "And often is his gold complexion dimm'd;",
+    "And every fair from fair sometime declines,",
+    "By chance or nature's changing course untrimm'd;",
+    "But thy eternal summer shall not fade,",
+    "Nor lose possession of that fair thou ow'st;",
+    "Nor shall death brag thou wander'st in his shade,",
+    "When in eternal lines to time thou grow'st:",
+    "So long as men can breathe or eyes can see,",
+    "So long lives this, and this gives life to thee.",
+]
+
+A1 = "Do not go gentle into that good night,"
+A2 = "Rage, rage against the dying of the light."
+VILLANELLE = [
+    [A1, "Old age should burn and rave at close of day;", A2],
+    ["Though wise men at their end know dark is right,", "Because their words had forked no lightning they", A1],
+    ["Good men, the last wave by, crying how bright", "Their frail deeds might have danced in a green bay,", A2],
+    ["Wild men who caught and sang the sun in flight,", "And learn, too late, they grieved it on its way,", A1],
+    ["Grave men, near death, who see with blinding sight", "Blind eyes could blaze like meteors and be gay,", A2],
+    ["And you, my father, there on the sad height,", "Curse, bless, me now with your fierce tears, I pray.", A1, A2],
+]
+
+
+def _stanzas(*stanzas):
+    return [Stanza(lines=[Line(text=line) for line in lines]) for lines in stanzas]
+
+
+def _forms(*stanzas):
+    return {match.form: match for match in classify_form(_stanzas(*stanzas))}
+
+
+def test_haiku_matches():
+    """Syllable targets are met under some pronunciation of each word."""
+    matches = _forms(HAIKU)
+    assert list(matches) == ["haiku"]
+    assert matches["haiku"].is_match
+
+
+def test_near_match_scores_below_one():
+    """A line off by one syllable counts half."""
+    matches = _forms(["An old silent pond", "A frog jumps into the cold pond", "Splash! Silence again"])
+    assert 0.5 <= matches["haiku"].score < 1.0
+    assert not matches["haiku"].is_match
+
+
+def test_limerick_and_tanka_share_a_line_count():
+    """Both five-line forms are scored; the limerick fits better."""
+    matches = classify_form(_stanzas(LIMERICK))
+    assert matches[0].form == "limerick"
+    assert matches[0].is_match
+    assert all(match.score < 1.0 for match in matches[1:])
+
+
+def test_sonnet_matches_across_stanza_layouts():
+    """Stanza breaks do not matter to a sonnet's rhyme scheme."""
+    assert _forms(SONNET)["sonnet"].score >= 0.9
+    assert _forms(SONNET[:4], SONNET[4:8], SONNET[8:12], SONNET[12:])["sonnet"].score >= 0.9
+
+
+def test_villanelle_matches():
+    """Stanza layout, both refrains and the ABA rhymes are checked."""
+    matches = _forms(*VILLANELLE)
+    assert matches["villanelle"].is_match
+
+
+def test_villanelle_without_refrains_is_a_near_match():
+    """Losing the refrains lowers the score without ruling the form out."""
+    stanzas = [VILLANELLE[0]] + [[line.replace("gentle", "softly").replace("Rage, rage", "Fight, fight")
+                                  for line in stanza] for stanza in VILLANELLE[1:]]
+    score = _forms(*stanzas)["villanelle"].score
+    assert 0.5 <= score < 1.0
+
+
+def test_wrong_line_count_is_pruned_before_costly_checks():
+    """No syllables or rhymes are looked up for forms that cannot fit."""
+    calls = []
+
+    def costly(lines):
+        calls.append(lines)
+        return 1.0
+
+    forms = [Form("quatrain", 3, [(1.0, costly)])]
+    assert classify_form(_stanzas(["one", "two", "three", "four"]), forms) == []
+    assert calls == []
+
+
+def test_hopeless_form_skips_remaining_constraints():
+    """Once the minimum score is out of reach, later constraints are not run."""
+    calls = []
+
+    def costly(lines):
+        calls.append(lines)
+        return 1.0
+
+    forms = [Form("refrained", 3, [(2.0, refrains((1, 3))), (1.0, costly)])]
+    assert classify_form(_stanzas(["a b", "c d", "e f"]), forms) == []
+    assert calls == []
+
+
+def test_custom_forms_and_scores():
+    """Forms are plain data, so callers can check their own."""
+    forms = [Form("cinquain", 5, [(1.0, syllables(2, 4, 6, 8, 2))])]
+    matches = classify_form(_stanzas(["Listen", "With faint dry sound", "Like steps of passing ghosts",
+                                      "The leaves, frost-crisp'd, break from the trees", "And fall"]), forms)
+    assert [match.form for match in matches] == ["cinquain"]
+    assert {form.name for form in FORMS} == {"haiku", "tanka", "limerick", "sonnet", "villanelle"}
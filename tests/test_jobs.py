@@ -0,0 +1,138 @@
+import time
+
+from oracle.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobRunner
+
+
+POEMS = [("Storm", "I am the storm\nI am the calm"), ("Void", "Born out of the void"), ("Empty", "   ")]
+
+
+def test_inline_job_records_results_in_order(tmp_path):
+    """Every poem gets a result; a failing poem does not fail the job."""
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_poems(POEMS)
+        assert queue.status(job_id).status == QUEUED
+
+    assert JobRunner(path).run_pending() == 1
+
+    with JobQueue(path) as queue:
+        status = queue.status(job_id)
+        results, next_cursor = queue.results(job_id)
+
+    assert (status.status, status.total, status.done, status.failed) == (DONE, 3, 2, 1)
+    assert [result.title for result in results] == ["Storm", "Void", "Empty"]
+    assert results[0].analysis["syllables_per_line"] == [[4, 4]]
+    assert results[2].analysis == {} and results[2].error
+    assert next_cursor is None
+
+
+def test_results_are_paginated(tmp_path):
+    """The cursor walks through results in pages."""
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_poems([(f"Poem {i}", f"Line {i}") for i in range(5)])
+    JobRunner(path).run_pending()
+
+    with JobQueue(path) as queue:
+        first, cursor = queue.results(job_id, limit=2)
+        second, cursor = queue.results(job_id, cursor=cursor, limit=2)
+        last, cursor = queue.results(job_id, cursor=cursor, limit=2)
+
+    assert [result.position for result in first + second + last] == [0, 1, 2, 3, 4]
+    assert cursor is None
+
+
+def test_folder_job_scans_folder_when_it_runs(tmp_path):
+    """Folder jobs analyze the poem files found when the job starts."""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("I am the storm", encoding="utf-8")
+    (corpus / "a_analysis.txt").write_text("old output", encoding="utf-8")
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_folder(corpus)
+        missing_id = queue.submit_folder(tmp_path / "missing")
+        assert queue.status(job_id).total is None
+
+    JobRunner(path, workers=2).run_pending()
+
+    with JobQueue(path) as queue:
+        results, _ = queue.results(job_id)
+        assert queue.status(job_id).total == 1
+        assert queue.status(missing_id).status == FAILED
+    assert [result.title for result in results] == ["a.txt"]
+    assert results[0].error is None
+
+
+def test_interrupted_job_resumes_after_lease_expires(tmp_path):
+    """Results recorded before a crash are kept; only pending poems are analyzed again."""
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_poems(POEMS[:2])
+        # A runner claims the job, records one poem and dies
+        assert queue.claim_next("crashed", lease_seconds=0.1) == job_id
+        assert queue.record(job_id, "crashed", [(0, '{"from": "before crash"}', None)], lease_seconds=0.1)
+        assert queue.status(job_id).status == RUNNING
+    time.sleep(0.2)
+
+    assert JobRunner(path).run_pending() == 1
+
+    with JobQueue(path) as queue:
+        status = queue.status(job_id)
+        results, _ = queue.results(job_id)
+    assert (status.status, status.done) == (DONE, 2)
+    assert results[0].analysis == {"from": "before crash"}
+    assert results[1].analysis["line_counts"] == [1]
+
+
+def test_claimed_job_is_not_taken_by_another_runner(tmp_path):
+    """A job with a live lease is left alone, and a runner that lost its lease stops recording."""
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_poems(POEMS[:1])
+        assert queue.claim_next("first") == job_id
+        assert queue.claim_next("second") is None
+        assert not queue.record(job_id, "second", [(0, "{}", None)])
+
+
+def test_runner_thread_processes_submitted_jobs(tmp_path):
+    """A started runner picks up jobs when notified."""
+    path = tmp_path / "jobs.db"
+    runner = JobRunner(path, poll_interval=10)
+    runner.start()
+    try:
+        with JobQueue(path) as queue:
+            job_id = queue.submit_poems(POEMS[:1])
+        runner.notify()
+        deadline = time.monotonic() + 10
+        with JobQueue(path) as queue:
+            while queue.status(job_id).status != DONE and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert queue.status(job_id).status == DONE
+    finally:
+        runner.stop(timeout=10)
+
+
+def test_lease_is_renewed_while_one_slow_poem_runs(tmp_path, monkeypatch):
+    """A poem slower than the lease does not let another runner claim the job."""
+    import oracle.jobs
+
+    path = tmp_path / "jobs.db"
+    with JobQueue(path) as queue:
+        job_id = queue.submit_poems(POEMS[:1])
+    claims = []
+    analyze = oracle.jobs.analyze_job_item
+
+    def slow_analyze(title, poem_text, file_path):
+        time.sleep(0.6)
+        with JobQueue(path) as other:
+            claims.append(other.claim_next("other", lease_seconds=0.3))
+        return analyze(title, poem_text, file_path)
+
+    monkeypatch.setattr(oracle.jobs, "analyze_job_item", slow_analyze)
+    assert JobRunner(path, lease_seconds=0.3).run_pending() == 1
+
+    with JobQueue(path) as queue:
+        status = queue.status(job_id)
+    assert claims == [None]
+    assert (status.status, status.done) == (DONE, 1)
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import signal
+import threading
+from pathlib import Path
+
+import pytest
+
+from oracle import syllable_counter
+from oracle.lexicon import compile_pronunciations, merge_lexicon, parse_lexicon
+from oracle.syllable_counter import count_syllables, load_custom_lexicon, reload_custom_lexicon
+
+
+@pytest.fixture
+def lexicon_file(tmp_path: Path):
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({"Voidborn": 2, "fire": [1], "abyss'": ["AH0 B IH1 S"]}))
+    yield path
+    load_custom_lexicon(None)
+
+
+def test_parse_lexicon_accepts_counts_and_pronunciations():
+    """Entries may be a count, several counts or ARPABET pronunciations."""
+    assert parse_lexicon({"Oracle": [3, 2], "maw": "M AO1", "void": 1}) == {
+        "oracle": [3, 2], "maw": [1], "void": [1],
+    }
+    for invalid in ([], {"word": []}, {"word": -1}, {"word": True}, {"word": [""]}):
+        with pytest.raises(ValueError):
+            parse_lexicon(invalid)
+
+
+def test_compile_and_merge():
+    """Pronunciations are counted once and overlay entries replace base entries."""
+    base = compile_pronunciations({"fire": [["F", "AY1", "ER0"], ["F", "AY1", "R"]]})
+    assert base == {"fire": [2, 1]}
+    assert merge_lexicon(base, {"fire": [1]}) == {"fire": [1]}
+    assert base == {"fire": [2, 1]}
+
+
+def test_custom_lexicon_overrides_cmudict(lexicon_file: Path):
+    """Custom entries are used before CMUdict and the fallback."""
+    assert count_syllables("fire") == [2, 1]
+    assert load_custom_lexicon(lexicon_file) == 3
+
+    assert count_syllables("Voidborn") == [2]
+    assert count_syllables("fire") == [1]
+    assert count_syllables("abyss'") == [2]
+    assert count_syllables("hello") == [2, 2]
+
+    load_custom_lexicon(None)
+    assert count_syllables("fire") == [2, 1]
+
+
+def test_reload_swaps_the_table_and_keeps_it_on_errors(lexicon_file: Path):
+    """A reload picks up edits; an invalid file leaves the current table in place."""
+    load_custom_lexicon(lexicon_file)
+    lexicon_file.write_text(json.dumps({"voidborn": 3}))
+    assert reload_custom_lexicon() == 1
+    assert count_syllables("voidborn") == [3]
+
+    lexicon_file.write_text("{not json")
+    with pytest.raises(ValueError):
+        reload_custom_lexicon()
+    assert count_syllables("voidborn") == [3]
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP is not available")
+def test_sighup_reloads_the_lexicon(lexicon_file: Path, caplog, capsys):
+    """Sending SIGHUP reloads the lexicon file and logs the outcome instead of printing it."""
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        assert syllable_counter.install_lexicon_reload_handler()
+        load_custom_lexicon(lexicon_file)
+        lexicon_file.write_text(json.dumps({"voidborn": 5}))
+
+        with caplog.at_level(logging.INFO, logger="oracle.syllable_counter"):
+            os.kill(os.getpid(), signal.SIGHUP)
+        assert count_syllables("voidborn") == [5]
+        assert "Reloaded custom lexicon: 1 entries" in caplog.text
+        assert capsys.readouterr().out == ""
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+def test_lookups_during_reloads_see_a_complete_table(lexicon_file: Path):
+    """Concurrent lookups always see either the old or the new table."""
+    load_custom_lexicon(lexicon_file)
+    seen = set()
+    stop = threading.Event()
+
+    def look_up() -> None:
+        while not stop.is_set():
+            seen.add(tuple(count_syllables("fire")))
+
+    reader = threading.Thread(target=look_up)
+    reader.start()
+    for _ in range(20):
+        load_custom_lexicon(lexicon_file)
+        load_custom_lexicon(None)
+    stop.set()
+    reader.join()
+
+    assert seen <= {(1,), (2, 1)}
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from oracle.api import app
+from scripts.load_test import percentile, parse_mix, run_load_test, save_report
+
+
+def test_percentile_nearest_rank():
+    """Percentiles use the nearest-rank method on sorted samples."""
+    samples = [float(i) for i in range(1, 101)]
+
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile(samples, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_parse_mix():
+    """Traffic mix specs are parsed into route weights."""
+    assert parse_mix("analyze=3,health=1") == {"analyze": 3, "health": 1}
+
+
+@pytest.mark.parametrize("spec", ["unknown=1", "analyze=x", "analyze=0,health=0"])
+def test_parse_mix_rejects_invalid_specs(spec):
+    """Unknown routes, non-integer weights and all-zero mixes are rejected."""
+    with pytest.raises(ValueError):
+        parse_mix(spec)
+
+
+def test_run_load_test_in_process(tmp_path):
+    """A short in-process run reports per-route latency percentiles and saves as JSON."""
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://oracle") as client:
+            return await run_load_test(client, concurrency=2, duration=0.3,
+                                       mix={"analyze": 1, "batch": 1, "health": 1},
+                                       batch_size=2, seed=1)
+
+    report = asyncio.run(run())
+
+    assert report["total_requests"] > 0
+    assert report["total_errors"] == 0
+    assert set(report["routes"]) == {"analyze", "batch", "health"}
+    for summary in report["routes"].values():
+        if summary["requests"]:
+            assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+    output = tmp_path / "report.json"
+    save_report(report, str(output))
+    assert json.loads(output.read_text())["total_requests"] == report["total_requests"]
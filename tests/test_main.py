@@ -146,4 +146,281 @@ def test_read_multiple_poem_files_with_empty_folder(tmp_path, monkeypatch):
     
     # No analysis files should be created
     analysis_files = list(empty_folder.glob("*_analysis.txt"))
-    assert len(analysis_files) == 0, "No analysis files should be created for empty folder"
\ No newline at end of file
+    assert len(analysis_files) == 0, "No analysis files should be created for empty folder"
+
+
+def test_read_multiple_poem_files_collects_failures_without_aborting(tmp_path: Path):
+    """A poem that fails to parse is reported in the summary while the others are analyzed."""
+    (tmp_path / "good.txt").write_text("First line\nSecond line")
+    (tmp_path / "broken.txt").write_text("###")  # markdown-only line leaves an empty Line
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert summary is not None
+    assert summary.total == 2
+    assert summary.succeeded == 1
+    assert list(summary.failures) == ["broken.txt"]
+    assert "ValueError" in summary.failures["broken.txt"]
+    assert (tmp_path / "good_analysis.txt").exists()
+
+
+def test_read_multiple_poem_files_records_undecodable_poems(tmp_path: Path):
+    """A file that is not valid UTF-8 fails on its own; the run finishes and saves the manifest."""
+    (tmp_path / "good.txt").write_text("First line\nSecond line")
+    (tmp_path / "latin.txt").write_bytes("Caf\u00e9 au lait\nNa\u00efve line".encode("latin-1"))
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert summary is not None
+    assert summary.total == 2
+    assert list(summary.failures) == ["latin.txt"]
+    assert "UnicodeDecodeError" in summary.failures["latin.txt"]
+    assert (tmp_path / "good_analysis.txt").exists()
+    assert (tmp_path / ".oracle_manifest.json").exists()
+
+    rerun = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+    assert rerun is not None
+    assert rerun.skipped == 1
+    assert list(rerun.failures) == ["latin.txt"]
+
+
+def test_read_multiple_poem_files_with_process_pool(tmp_path: Path, capsys):
+    """Running with several jobs writes the same analyses as a serial run."""
+    for i in range(4):
+        (tmp_path / f"poem{i}.txt").write_text(f"Poem number {i}\nWith a second line")
+    (tmp_path / "broken.txt").write_text("###")
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path), jobs=2)
+    captured = capsys.readouterr()
+
+    assert summary is not None
+    assert summary.succeeded == 4
+    assert list(summary.failures) == ["broken.txt"]
+    assert len(list(tmp_path.glob("poem*_analysis.txt"))) == 4
+    assert "[5]" in captured.out
+    assert "files/sec" in captured.out
+
+
+def test_rerun_skips_unchanged_poems(tmp_path: Path):
+    """A second run over an unchanged folder analyzes nothing and keeps the outputs."""
+    (tmp_path / "poem1.txt").write_text("First line\nSecond line")
+    (tmp_path / "poem2.txt").write_text("Another poem")
+
+    first = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+    second = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert first is not None and first.total == 2
+    assert second is not None
+    assert second.total == 0
+    assert second.skipped == 2
+    assert (tmp_path / ".oracle_manifest.json").exists()
+
+
+def test_rerun_regenerates_changed_and_missing_outputs(tmp_path: Path):
+    """Edited poems and poems whose output was deleted are analyzed again."""
+    (tmp_path / "edited.txt").write_text("Original line")
+    (tmp_path / "lost.txt").write_text("Some line")
+    (tmp_path / "same.txt").write_text("Unchanged line")
+    read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    (tmp_path / "edited.txt").write_text("Rewritten line entirely")
+    (tmp_path / "lost_analysis.txt").unlink()
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert summary is not None
+    assert summary.total == 2
+    assert summary.skipped == 1
+    assert "Rewritten line entirely" in (tmp_path / "edited_analysis.txt").read_text()
+    assert (tmp_path / "lost_analysis.txt").exists()
+
+
+def test_rerun_removes_outputs_of_deleted_poems(tmp_path: Path):
+    """Outputs of poems that disappeared from the folder are cleaned up."""
+    (tmp_path / "keep.txt").write_text("Kept poem")
+    (tmp_path / "gone.txt").write_text("Deleted poem")
+    read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    (tmp_path / "gone.txt").unlink()
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert summary is not None
+    assert summary.removed == ["gone.txt"]
+    assert not (tmp_path / "gone_analysis.txt").exists()
+    assert (tmp_path / "keep_analysis.txt").exists()
+
+
+def test_non_recursive_rerun_keeps_outputs_of_subfolder_poems(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("Top poem")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.txt").write_text("Nested poem")
+    read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path), recursive=True)
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    assert summary is not None and summary.removed == []
+    assert (tmp_path / "sub" / "c_analysis.txt").exists()
+    # The nested poem is still in the manifest, so it is not analyzed again
+    rerun = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path), recursive=True)
+    assert rerun is not None and rerun.skipped == 2 and rerun.total == 0
+
+
+def test_filtered_rerun_keeps_outputs_of_unmatched_poems(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("First poem")
+    (tmp_path / "b.txt").write_text("Second poem")
+    read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path), include=["a*.txt"])
+
+    assert summary is not None and summary.removed == []
+    assert (tmp_path / "b_analysis.txt").exists()
+
+
+def test_force_and_analyzer_version_invalidate_manifest(tmp_path: Path, monkeypatch):
+    """--force and an analyzer version bump both re-analyze unchanged poems."""
+    (tmp_path / "poem.txt").write_text("Some poem")
+    read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+
+    forced = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path), force=True)
+    assert forced is not None and forced.total == 1
+
+    monkeypatch.setattr("oracle.manifest.ANALYZER_VERSION", "next")
+    bumped = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+    assert bumped is not None and bumped.total == 1
+
+
+def test_read_poem_folder_recursive_names_use_relative_paths(tmp_path: Path):
+    """Recursive discovery names nested poems by their path relative to the folder."""
+    (tmp_path / "top.txt").write_text("Top poem")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "deep.md").write_text("Deep poem")
+
+    assert sorted(read_poem_folder_and_return_names(str(tmp_path))) == ["top.txt"]
+    assert sorted(read_poem_folder_and_return_names(str(tmp_path), recursive=True)) == \
+        ["nested/deep.md", "top.txt"]
+
+
+def test_read_multiple_poem_files_recursive_with_patterns(tmp_path: Path):
+    """Include/exclude patterns and recursion decide which poems get analyzed."""
+    (tmp_path / "drafts").mkdir()
+    (tmp_path / "drafts" / "idea.txt").write_text("Draft line")
+    (tmp_path / "sonnet.txt").write_text("Finished line")
+    (tmp_path / "notes.md").write_text("Not a poem")
+
+    summary = read_multiple_poem_files_and_write_analyses(
+        folder_path=str(tmp_path), recursive=True, include=["*.txt"],
+        exclude=["*_analysis.txt", "drafts/*"])
+
+    assert summary is not None and summary.total == 1
+    assert (tmp_path / "sonnet_analysis.txt").exists()
+    assert not (tmp_path / "drafts" / "idea_analysis.txt").exists()
+    assert not (tmp_path / "notes_analysis.txt").exists()
+
+
+def _watch_with_edits(folder: Path, edits, max_polls: int = 4) -> None:
+    """Watch a folder for max_polls polls, applying edits[n] during the n-th sleep."""
+    from oracle.main import watch_poem_folder
+
+    polls = {"count": 0}
+
+    def fake_sleep(seconds):
+        polls["count"] += 1
+        edit = edits.get(polls["count"])
+        if edit:
+            edit()
+
+    watch_poem_folder(folder_path=str(folder), interval=0, debounce=0,
+                      max_polls=max_polls, sleep=fake_sleep)
+
+
+def test_watch_poem_folder_reanalyzes_changed_poems(tmp_path: Path, capsys):
+    """Watch mode analyzes the folder once, then only poems that change."""
+    (tmp_path / "existing.txt").write_text("Existing poem")
+    _watch_with_edits(tmp_path, {
+        1: lambda: (tmp_path / "new.txt").write_text("A brand new poem"),
+        3: lambda: (tmp_path / "existing.txt").write_text("Existing poem, now edited"),
+    })
+    captured = capsys.readouterr()
+
+    assert "new.txt: re-analyzed" in captured.out
+    assert "existing.txt: re-analyzed" in captured.out
+    assert "now edited" in (tmp_path / "existing_analysis.txt").read_text()
+    assert (tmp_path / "new_analysis.txt").exists()
+    assert not list(tmp_path.glob("*.tmp")), "Atomic writes should not leave temp files behind"
+
+    # The watcher kept the manifest current, so a plain run has nothing to do
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(tmp_path))
+    assert summary is not None and summary.total == 0
+
+
+def test_watch_poem_folder_survives_undecodable_poems(tmp_path: Path, capsys):
+    """A poem saved in another encoding is reported as failed and the watcher keeps going."""
+    _watch_with_edits(tmp_path, {
+        1: lambda: (tmp_path / "latin.txt").write_bytes("Caf\u00e9 au lait".encode("latin-1")),
+        3: lambda: (tmp_path / "later.txt").write_text("A poem written afterwards"),
+    })
+    captured = capsys.readouterr()
+
+    assert "latin.txt: FAILED (UnicodeDecodeError" in captured.out
+    assert "later.txt: re-analyzed" in captured.out
+    assert not (tmp_path / "latin_analysis.txt").exists()
+
+
+def test_export_poem_corpus_to_jsonl_and_columnar(tmp_path: Path):
+    """Folder mode can write one bulk corpus instead of per-poem analysis files."""
+    from oracle.main import export_poem_corpus
+    from oracle.corpus_output import ColumnarCorpus, read_jsonl_corpus
+
+    poems = tmp_path / "poems"
+    poems.mkdir()
+    (poems / "a.txt").write_text("Born out of the void\nAmidst the stars of flesh")
+    (poems / "broken.txt").write_text("###")
+
+    summary = export_poem_corpus(str(poems), str(tmp_path / "corpus.jsonl"), "jsonl")
+    records = list(read_jsonl_corpus(tmp_path / "corpus.jsonl"))
+
+    assert summary is not None and list(summary.failures) == ["broken.txt"]
+    assert [record["poem"] for record in records] == ["a.txt"]
+    assert records[0]["analysis"]["syllables_per_line"] == [[5, 6]]
+    assert not list(poems.glob("*_analysis.txt"))
+
+    export_poem_corpus(str(poems), str(tmp_path / "columnar"), "columnar", jobs=2)
+    with ColumnarCorpus(tmp_path / "columnar") as corpus:
+        assert corpus.poem_names() == ["a.txt"]
+        assert corpus.poem_syllables(0) == [[5, 6]]
+
+
+def test_export_poem_corpus_to_sqlite(tmp_path: Path):
+    """The sqlite output format fills an indexed analysis store."""
+    from oracle.main import export_poem_corpus
+    from oracle.store import AnalysisStore
+
+    poems = tmp_path / "poems"
+    poems.mkdir()
+    (poems / "a.txt").write_text("I am the void\nI am the flesh")
+
+    export_poem_corpus(str(poems), str(tmp_path / "analyses.db"), "sqlite")
+    with AnalysisStore(tmp_path / "analyses.db", read_only=True) as store:
+        assert store.poem_count() == 1
+        assert store.poems_with_anaphora("i am") == ["a.txt"]
+
+
+def test_export_poem_corpus_keeps_going_and_keeps_existing_output(tmp_path: Path):
+    """Undecodable poems fail on their own, and a missing folder leaves an earlier export intact."""
+    from oracle.main import export_poem_corpus
+    from oracle.corpus_output import read_jsonl_corpus
+
+    poems = tmp_path / "poems"
+    poems.mkdir()
+    (poems / "a.txt").write_text("Born out of the void")
+    (poems / "latin.txt").write_bytes("Café au lait".encode("latin-1"))
+    corpus = tmp_path / "corpus.jsonl"
+
+    summary = export_poem_corpus(str(poems), str(corpus), "jsonl")
+
+    assert summary is not None and summary.total == 2
+    assert list(summary.failures) == ["latin.txt"]
+    assert "UnicodeDecodeError" in summary.failures["latin.txt"]
+    assert [record["poem"] for record in read_jsonl_corpus(corpus)] == ["a.txt"]
+
+    assert export_poem_corpus(str(tmp_path / "poemz"), str(corpus), "jsonl") is None
+    assert [record["poem"] for record in read_jsonl_corpus(corpus)] == ["a.txt"]
@@ -0,0 +1,49 @@
+import pytest
+
+from oracle.analysis.meter import IRREGULAR, LineMeter, line_stress_variants, scan_line, stanza_meter
+from oracle.domain_objects import Line
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Shall I compare thee to a summer's day?", "iambic pentameter"),
+    ("To be, or not to be, that is the question:", "iambic pentameter"),
+    ("Tyger Tyger, burning bright,", "trochaic tetrameter"),
+    ("This is the forest primeval. The murmuring pines and the hemlocks", "dactylic hexameter"),
+])
+def test_scan_line_finds_known_meters(text, name):
+    """Well-known lines, including catalectic and feminine endings, are scanned correctly."""
+    assert scan_line(Line(text=text)).name == name
+
+
+def test_scan_line_reports_deviation_and_scansion():
+    """A regular line has no deviation and one stress digit per syllable."""
+    meter = scan_line(Line(text="The cat began to sing"))
+
+    assert (meter.foot, meter.feet, meter.deviation) == ("iambic", 3, 0)
+    assert meter.stresses == "010101"
+
+
+def test_stress_variants_keep_every_pronunciation():
+    """Words with several pronunciations offer several stress strings; unknown words are free."""
+    variants = line_stress_variants(Line(text="fire zzyzzx"))
+
+    assert variants[0] == ("10", "1")
+    assert all(set(variant) == {"2"} for variant in variants[1])
+
+
+def test_long_lines_are_irregular_and_fast():
+    """Lines longer than eight feet fit no meter; the scan does not blow up."""
+    meter = scan_line(Line(text=" ".join(["every fire temperate"] * 200)))
+
+    assert meter.name == IRREGULAR
+
+
+def test_stanza_meter_takes_most_common_line_meter():
+    """Ties are broken by the lower total deviation."""
+    meters = [LineMeter("iambic pentameter", "iambic", 5, 2, ""),
+              LineMeter("trochaic tetrameter", "trochaic", 4, 0, ""),
+              LineMeter("iambic pentameter", "iambic", 5, 0, "")]
+
+    assert stanza_meter(meters) == "iambic pentameter"
+    assert stanza_meter(meters[:2]) == "trochaic tetrameter"
+    assert stanza_meter([]) == IRREGULAR
@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from oracle import oov_cache, syllable_counter
+from oracle.oov_cache import OovCache
+from oracle.syllable_counter import configure_oov_cache, count_syllables
+
+
+class CountingEstimator:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, word: str) -> list[int]:
+        self.calls.append(word)
+        return [len(word)]
+
+
+def _look_up_words(path: str) -> None:
+    cache = OovCache(path)
+    for _ in range(50):
+        cache.lookup("zorblax", lambda word: [2])
+    cache.close()
+
+
+@pytest.fixture
+def restore_oov_cache():
+    yield
+    configure_oov_cache(None)
+
+
+def test_results_are_shared_across_instances(tmp_path: Path):
+    """A word estimated once is served from the database by other processes."""
+    first_estimator, second_estimator = CountingEstimator(), CountingEstimator()
+
+    first = OovCache(tmp_path / "oov.db")
+    assert first.lookup("zorblax", first_estimator) == [7]
+    assert first.lookup("zorblax", first_estimator) == [7]
+    first.close()
+
+    second = OovCache(tmp_path / "oov.db")
+    assert second.lookup("zorblax", second_estimator) == [7]
+    assert first_estimator.calls == ["zorblax"]
+    assert second_estimator.calls == []
+    assert second.most_common() == [("zorblax", 3)]
+    second.close()
+
+
+def test_other_estimator_versions_are_recomputed(tmp_path: Path):
+    """Estimates stored by another estimator version are not reused."""
+    cache = OovCache(tmp_path / "oov.db", estimator_version="1")
+    cache.lookup("zorblax", lambda word: [1])
+    cache.close()
+
+    upgraded = OovCache(tmp_path / "oov.db", estimator_version="2")
+    assert upgraded.lookup("zorblax", lambda word: [3]) == [3]
+    upgraded.close()
+
+
+def test_hit_counts_are_flushed_in_batches(tmp_path: Path, monkeypatch):
+    """Hit counts are written once FLUSH_EVERY lookups are buffered."""
+    monkeypatch.setattr(oov_cache, "FLUSH_EVERY", 3)
+    cache = OovCache(tmp_path / "oov.db")
+    for word in ("aa", "bb", "aa"):
+        cache.lookup(word, lambda word: [1])
+
+    reader = OovCache(tmp_path / "oov.db")
+    assert reader.most_common() == [("aa", 2), ("bb", 1)]
+    reader.close()
+    cache.close()
+
+
+def test_concurrent_processes_share_the_cache(tmp_path: Path):
+    """Several processes can record hits in the same database."""
+    path = str(tmp_path / "oov.db")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(_look_up_words, [path] * 4))
+
+    cache = OovCache(path)
+    assert cache.most_common() == [("zorblax", 200)]
+    cache.close()
+
+
+def test_count_syllables_uses_the_cache_after_the_lexicon(tmp_path: Path, restore_oov_cache):
+    """Only words missing from CMUdict are cached, under their normalized form."""
+    cache = configure_oov_cache(tmp_path / "oov.db")
+    assert cache is not None and syllable_counter._oov_cache is cache
+
+    assert count_syllables("Zorblaxian,") == count_syllables("zorblaxian") == [3]
+    assert count_syllables("hello") == [2, 2]
+    assert cache.most_common() == [("zorblaxian", 2)]
+
+
+def test_pool_workers_flush_hit_counts_on_exit(tmp_path: Path, restore_oov_cache):
+    """A --jobs 2 folder run keeps the hit counts its workers buffered below FLUSH_EVERY."""
+    from oracle.main import read_multiple_poem_files_and_write_analyses
+
+    poems = tmp_path / "poems"
+    poems.mkdir()
+    for i in range(4):
+        (poems / f"poem{i}.txt").write_text("Zorblax zorblax\nThe zorblax sings")
+    configure_oov_cache(tmp_path / "oov.db")
+
+    summary = read_multiple_poem_files_and_write_analyses(folder_path=str(poems), jobs=2)
+
+    assert summary is not None and summary.succeeded == 4
+    cache = OovCache(tmp_path / "oov.db")
+    assert cache.most_common() == [("zorblax", 12)]
+    cache.close()
+
+
+def test_count_syllables_from_several_threads(tmp_path: Path, restore_oov_cache):
+    """Threads share the cache's connection, as the API's threadpool does."""
+    cache = configure_oov_cache(tmp_path / "oov.db")
+    assert cache is not None
+    errors = []
+
+    def look_up(index):
+        try:
+            for _ in range(100):
+                assert count_syllables(f"zorblax{index % 2}") == [2]
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=look_up, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.most_common() == [("zorblax0", 400), ("zorblax1", 400)]
+
+
+def test_memory_keeps_recently_used_words(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(oov_cache, "MEMORY_SIZE", 2)
+    cache = OovCache(tmp_path / "oov.db")
+    for word in ("alpha", "beta", "alpha", "gamma"):
+        cache.lookup(word, lambda word: [2])
+
+    assert list(cache._memory) == ["alpha", "gamma"]
+    cache.close()
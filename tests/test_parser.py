@@ -3,7 +3,7 @@ from pathlib import Path
 
 from oracle.poem_model import Poem
 from oracle.domain_objects import Stanza, Line
-from oracle.parser import parse_into_stanzas
+from oracle.parser import IncrementalStanzaParser, parse_into_stanzas, scan_stanzas
 
 
 # Test data: poems with title + two stanzas separated by varying blank lines
@@ -99,4 +99,77 @@ class TestParseIntoStanzas:
         """First line of first stanza should be poem content, not title."""
         stanzas = parse_into_stanzas(poem_text, poem_filename)
         first_line = stanzas[0].lines[0].text.strip()
-        assert first_line.startswith("Born out of the void"), f"Failed for: {description}"
\ No newline at end of file
+        assert first_line.startswith("Born out of the void"), f"Failed for: {description}"
+
+    @pytest.mark.parametrize("blank_lines", [1, 2, 3, 4, 5])
+    def test_any_number_of_blank_lines_separates_stanzas(self, blank_lines, poem_filename):
+        """Runs of blank or whitespace-only lines are a single separator, also at the start."""
+        separator = "\n" + "  \n" * blank_lines
+        poem_text = separator + "Born out of the void" + separator + "Amidst the stars of flesh\n"
+        stanzas = parse_into_stanzas(poem_text, poem_filename)
+        assert [stanza.stanza_text_string for stanza in stanzas] == [
+            "Born out of the void", "Amidst the stars of flesh"
+        ]
+
+    def test_windows_line_endings(self, poem_filename):
+        """CRLF line endings are single line breaks."""
+        stanzas = parse_into_stanzas("Born out\r\nof the void\r\n\r\nAmidst", poem_filename)
+        assert [stanza.stanza_text_string for stanza in stanzas] == ["Born out\nof the void", "Amidst"]
+
+
+class TestScanStanzas:
+    """Tests for the offset-based scan_stanzas function."""
+
+    def test_spans_point_into_the_original_text(self, poem_filename):
+        """Line spans slice the stripped, markup-free line out of the source text."""
+        stanzas = scan_stanzas(POEM_WITH_MARKDOWN, poem_filename)
+        first_line = stanzas[0].lines[0]
+
+        assert first_line.source is POEM_WITH_MARKDOWN
+        assert first_line.text == "Born out of the void"
+        assert POEM_WITH_MARKDOWN[first_line.start - 3:first_line.end] == "###Born out of the void"
+        assert stanzas[0].lines[3].text == "O'er the abyss' watchful maw"
+
+    def test_stanza_spans_match_parsed_stanzas(self, poem_filename):
+        """Stanza spans give the same text as the parsed Stanza objects."""
+        for poem_text in (POEM_WITH_QUOTED_TITLE_DOUBLE_BLANK, POEM_WITH_UNQUOTED_TITLE, POEM_WITH_MARKDOWN):
+            spans = scan_stanzas(poem_text, poem_filename)
+            stanzas = parse_into_stanzas(poem_text, poem_filename)
+            assert [span.text for span in spans] == [stanza.stanza_text_string for stanza in stanzas]
+            assert all(span.start < span.end for span in spans)
+
+
+class TestIncrementalStanzaParser:
+    """Tests for parsing stanzas from chunked text."""
+
+    TEXT = "Voidborn\r\nBorn out of the void\r\n\r\n\r\nI am the storm\n  \nI am the calm\n"
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 1000])
+    def test_chunks_give_same_stanzas_as_whole_text(self, size):
+        """Any chunking yields the stanzas of parse_into_stanzas."""
+        parser = IncrementalStanzaParser("Voidborn")
+        stanzas = []
+        for i in range(0, len(self.TEXT), size):
+            stanzas += parser.feed(self.TEXT[i:i + size])
+        stanzas += parser.close()
+
+        assert stanzas == parse_into_stanzas(self.TEXT, "Voidborn")
+
+    def test_stanza_is_returned_once_a_blank_line_follows(self):
+        """Completed stanzas are returned right away, the open one is buffered."""
+        parser = IncrementalStanzaParser("poem")
+
+        assert parser.feed("first line\nsecond line\n") == []
+        completed = parser.feed("\nnext stanza")
+
+        assert [stanza.stanza_text_string for stanza in completed] == ["first line\nsecond line"]
+        assert [stanza.stanza_text_string for stanza in parser.close()] == ["next stanza"]
+
+    def test_spans_let_one_bad_stanza_fail_alone(self):
+        """A markup-only stanza only fails when its own span is turned into a Stanza."""
+        parser = IncrementalStanzaParser("poem")
+        spans = parser.feed_spans("first line\n\n***\n\n") + parser.close_spans()
+
+        assert spans[0].to_stanza().stanza_text_string == "first line"
+        with pytest.raises(ValueError):
+            spans[1].to_stanza()
@@ -0,0 +1,79 @@
+import threading
+
+from oracle.analysis.phonemes import NONE, PhonemeFeatureStore
+from oracle.analysis.rhyme import rhyme_keys
+
+
+def test_dictionary_word_features():
+    """Onset, coda, vowels, stresses and rhyme come from the first pronunciation."""
+    store = PhonemeFeatureStore()
+    features = store.features(store.row("dreaming"))
+
+    assert store.symbol(features.onset) == ("D",)
+    assert store.symbol(features.coda) == ("NG",)
+    assert store.symbol(features.stressed_vowel) == ("IY",)
+    assert store.symbol(features.vowels) == ("IY", "IH")
+    assert store.symbol(features.stresses) == ("1", "0")
+    assert features.rhyme == rhyme_keys("dreaming")[0]
+
+
+def test_vowel_initial_and_final_words_have_no_onset_or_coda():
+    store = PhonemeFeatureStore()
+    features = store.features(store.row("echo"))
+    assert features.onset == NONE
+    assert features.coda == NONE
+
+
+def test_unknown_words_are_estimated():
+    """Compounds borrow their first and last parts; other words fall back to spelling."""
+    store = PhonemeFeatureStore()
+    voidborn = store.features(store.row("voidborn"))
+    assert store.symbol(voidborn.onset) == ("V",)
+    assert store.symbol(voidborn.coda) == ("N",)
+    assert voidborn.stresses == NONE
+
+    zzq = store.features(store.row("zzgrtyss"))
+    assert store.symbol(zzq.onset) == ("~", "z")
+
+
+def test_each_token_is_resolved_once():
+    """Repeated tokens share one row, and shared sounds share one symbol id."""
+    store = PhonemeFeatureStore()
+    rows = store.rows(["dark", "deep", "dark"])
+
+    assert list(rows) == [rows[0], rows[1], rows[0]]
+    assert len(store) == 2
+    assert len(store.onsets) == 2
+    assert store.onsets[rows[0]] == store.onsets[rows[1]]
+
+
+def test_concurrent_lookups_agree():
+    store = PhonemeFeatureStore()
+    words = [f"word{index % 50}" for index in range(2000)] + ["night", "light"] * 100
+    results = []
+
+    def look_up():
+        results.append(list(store.rows(words)))
+
+    threads = [threading.Thread(target=look_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result == results[0] for result in results)
+    assert len(store) == len(store.onsets) == 52
+
+
+def test_scopes_keep_unknown_words_out_of_their_parent():
+    """Dictionary words are resolved once in the parent; unknown words stay in the scope."""
+    store = PhonemeFeatureStore()
+    scope = store.scope()
+    rows = scope.rows(["dark", "zzgrtyss", "deep"])
+
+    assert len(store) == 2
+    assert len(scope) == 3
+    assert scope.features(rows[0]) == store.features(store.row("dark"))
+    assert scope.symbol(scope.onsets[rows[1]]) == ("~", "z")
+    other = store.scope()
+    assert other.features(other.row("deep")) == scope.features(rows[2])
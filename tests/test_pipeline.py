@@ -0,0 +1,125 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from oracle.analysis import pipeline
+from oracle.analysis.pipeline import ANALYZERS, Analyzer, Intermediate, run_pipeline, schedule
+from oracle.analyzer import OPTIONAL_ANALYSES, analyze_poem
+from oracle.poem_model import Poem
+
+
+POEM = Poem(text="The night is dark\nThe moon is bright\n\nI hear the lark\nBeneath the light",
+            filepath=Path("pipeline.txt"))
+
+
+def _plugins(calls):
+    def words(context):
+        calls.append("words")
+        return [line.text.split() for stanza in context.poem.stanzas for line in stanza.lines]
+
+    def word_counts(context):
+        calls.append("word_counts")
+        return [len(line) for line in context.get("words")]
+
+    intermediates = {
+        "words": Intermediate("words", words),
+        "word_counts": Intermediate("word_counts", word_counts, requires=("words",)),
+    }
+    analyzers = {
+        "counts": Analyzer("counts", lambda context: {"counts": context.get("word_counts")},
+                           requires=("word_counts",), default=True),
+        "first_words": Analyzer("first_words",
+                                lambda context: {"first_words": [line[0] for line in context.get("words")]},
+                                requires=("words",)),
+        "doubled": Analyzer("doubled", lambda context: {"counts": [count * 2 for count in context.field("counts")]},
+                            after=("counts",)),
+    }
+    return intermediates, analyzers
+
+
+def test_intermediates_are_computed_once_and_only_when_needed():
+    calls = []
+    intermediates, analyzers = _plugins(calls)
+
+    result = run_pipeline(POEM, include=["first_words"], analyzers=analyzers, intermediates=intermediates)
+
+    assert result == {"counts": [4, 4, 4, 3], "first_words": ["The", "The", "I", "Beneath"]}
+    assert calls == ["words", "word_counts"]
+
+    calls.clear()
+    assert run_pipeline(POEM, analyzers={"first_words": analyzers["first_words"]},
+                        intermediates=intermediates) == {}
+    assert calls == []
+
+
+def test_later_analyzers_extend_earlier_fields_in_place():
+    """'doubled' runs after 'counts' and replaces its field without moving it."""
+    calls = []
+    intermediates, analyzers = _plugins(calls)
+
+    result = run_pipeline(POEM, include=["doubled", "first_words"], analyzers=analyzers, intermediates=intermediates)
+
+    assert list(result) == ["counts", "first_words"]
+    assert result["counts"] == [8, 8, 8, 6]
+
+
+def test_schedule_orders_by_dependencies():
+    first = Analyzer("first", dict)
+    second = Analyzer("second", dict, after=("first",))
+    third = Analyzer("third", dict)
+    assert [[analyzer.name for analyzer in wave] for wave in schedule([second, first, third])] == [
+        ["first", "third"], ["second"]]
+    with pytest.raises(ValueError):
+        schedule([Analyzer("a", dict, after=("b",)), Analyzer("b", dict, after=("a",))])
+
+
+def test_unknown_analyses_are_rejected():
+    with pytest.raises(ValueError):
+        run_pipeline(POEM, include=["nonexistent"])
+    # Default analyzers always run and are not optional analyses
+    with pytest.raises(ValueError):
+        run_pipeline(POEM, include=["stanzas"])
+
+
+def test_independent_analyzers_run_in_parallel_for_large_poems(monkeypatch):
+    """With parallel_min_lines reached and no GIL, one wave's analyzers share a thread pool."""
+    monkeypatch.setattr(pipeline, "GIL_ENABLED", False)
+    threads = set()
+
+    def record(name):
+        def run(context):
+            threads.add(threading.get_ident())
+            return {name: [1]}
+        return run
+
+    analyzers = {name: Analyzer(name, record(name), default=True) for name in ("a", "b", "c")}
+    assert run_pipeline(POEM, analyzers=analyzers, parallel_min_lines=1) == {"a": [1], "b": [1], "c": [1]}
+    assert threading.get_ident() not in threads
+
+    threads.clear()
+    run_pipeline(POEM, analyzers=analyzers)
+    assert threads == {threading.get_ident()}
+
+    # With the GIL, threads would only add overhead
+    monkeypatch.setattr(pipeline, "GIL_ENABLED", True)
+    threads.clear()
+    run_pipeline(POEM, analyzers=analyzers, parallel_min_lines=1)
+    assert threads == {threading.get_ident()}
+
+
+def test_builtin_analyzers_match_in_parallel_and_sequentially(monkeypatch):
+    monkeypatch.setattr(pipeline, "GIL_ENABLED", False)
+    sequential = run_pipeline(POEM, include=OPTIONAL_ANALYSES)
+    assert run_pipeline(POEM, include=OPTIONAL_ANALYSES, parallel_min_lines=1) == sequential
+    assert sequential == analyze_poem(POEM, include=OPTIONAL_ANALYSES)
+
+
+def test_builtin_registry():
+    assert OPTIONAL_ANALYSES == ("rhyme_schemes", "meters", "syllable_totals", "forms", "sound_devices",
+                                 "repetitions")
+    assert [name for name, analyzer in ANALYZERS.items() if analyzer.default] == [
+        "stanzas", "syllables", "poetic_devices"]
+    # Analyzers only require the intermediates they read
+    assert {name: ANALYZERS[name].requires for name in ("rhyme_schemes", "meters", "forms", "repetitions")} == {
+        "rhyme_schemes": (), "meters": (), "forms": ("syllable_totals",), "repetitions": ()}
@@ -0,0 +1,78 @@
+import random
+
+from oracle.analysis.repetition import (ANAPHORA, EPISTROPHE, REFRAIN, REPETITION, SYMPLOCE, find_repetitions,
+                                        lcp_array, maximal_repeats, suffix_array)
+from oracle.domain_objects import Line, Stanza
+
+
+def _stanzas(*stanzas):
+    return [Stanza(lines=[Line(text=line) for line in lines]) for lines in stanzas]
+
+
+def _brute_force_maximal_repeats(tokens, min_length):
+    occurrences = {}
+    for start in range(len(tokens)):
+        for end in range(start + min_length, len(tokens) + 1):
+            occurrences.setdefault(tuple(tokens[start:end]), []).append(start)
+    repeats = set()
+    for phrase, starts in occurrences.items():
+        if len(starts) < 2:
+            continue
+        before = {tokens[start - 1] if start else None for start in starts}
+        after = {tokens[start + len(phrase)] if start + len(phrase) < len(tokens) else None for start in starts}
+        if (len(before) > 1 or None in before) and (len(after) > 1 or None in after):
+            repeats.add((len(phrase), tuple(starts)))
+    return repeats
+
+
+def test_suffix_and_lcp_arrays():
+    tokens = [2, 1, 2, 1, 0]
+    order = suffix_array(tokens)
+    assert order == sorted(range(len(tokens)), key=lambda start: tokens[start:])
+    assert lcp_array(tokens, order) == [0, 0, 1, 0, 2]
+
+
+def test_maximal_repeats_match_brute_force():
+    """Random small alphabets produce many nested and overlapping repeats."""
+    generator = random.Random(7)
+    for _ in range(200):
+        tokens = [generator.randint(0, 2) for _ in range(generator.randint(0, 30))]
+        found = {(length, tuple(starts)) for length, starts in maximal_repeats(tokens, 2)}
+        assert found == _brute_force_maximal_repeats(tokens, 2), tokens
+
+
+def test_refrain_across_stanzas():
+    repetitions = find_repetitions(_stanzas(
+        ["Do not go gentle into that good night", "Old age should burn"],
+        ["Though wise men know dark is right", "Do not go gentle into that good night"],
+    ))
+    assert [(repetition.device, repetition.phrase) for repetition in repetitions] == [
+        (REFRAIN, "do not go gentle into that good night")]
+    assert repetitions[0].positions == [(0, 0, 0), (1, 1, 0)]
+
+
+def test_anaphora_epistrophe_and_symploce():
+    repetitions = find_repetitions(_stanzas(
+        ["I am the storm that breaks the night", "I am the calm that follows the night"],
+    ))
+    assert [(repetition.device, repetition.phrase) for repetition in repetitions] == [
+        (ANAPHORA, "i am the"),
+        (EPISTROPHE, "the night"),
+        (SYMPLOCE, "i am the ... the night"),
+    ]
+    assert repetitions[1].positions == [(0, 0, 6), (0, 1, 6)]
+
+
+def test_mid_line_repetition_ignores_function_word_phrases():
+    """'no evil' is reported; 'in the' alone is too common to count."""
+    repetitions = find_repetitions(_stanzas(
+        ["See no evil, hear no evil, speak no evil", "Sleep in the dark, walk in the light"],
+    ))
+    assert [(repetition.device, repetition.phrase) for repetition in repetitions] == [(REPETITION, "no evil")]
+    assert repetitions[0].positions == [(0, 0, 1), (0, 0, 4), (0, 0, 7)]
+
+
+def test_repeats_do_not_cross_line_breaks():
+    """'end begins' spans two lines in both stanzas but is never a phrase."""
+    repetitions = find_repetitions(_stanzas(["at the end", "begins today"], ["at the end", "begins tonight"]))
+    assert [(repetition.device, repetition.phrase) for repetition in repetitions] == [(REFRAIN, "at the end")]
@@ -0,0 +1,56 @@
+from oracle.analysis import rhyme
+from oracle.analysis.rhyme import line_rhyme_keys, rhyme_key, rhyme_keys, rhyme_scheme
+from oracle.domain_objects import Line, Stanza
+
+
+def _stanza(*lines):
+    return Stanza(lines=[Line(text=line) for line in lines])
+
+
+def test_rhyme_key_starts_at_last_stressed_vowel():
+    """Stress digits are dropped and unstressed endings are kept."""
+    assert rhyme_key(["AH2", "N", "D", "ER0", "S", "T", "AE1", "N", "D"]) == ("AE", "N", "D")
+    assert rhyme_key(["F", "AE1", "N", "T", "AH0", "S", "IY0"]) == ("AE", "N", "T", "AH", "S", "IY")
+    assert rhyme_key(["DH", "AH0"]) == ("AH",)
+
+
+def test_rhyming_words_share_a_key_id():
+    """Rhymes compare as integers; every pronunciation of a word is considered."""
+    assert set(rhyme_keys("night")) & set(rhyme_keys("light"))
+    assert not set(rhyme_keys("night")) & set(rhyme_keys("dark"))
+    # "read" is pronounced like "reed" and like "red"
+    assert set(rhyme_keys("read")) & set(rhyme_keys("need"))
+    assert set(rhyme_keys("read")) & set(rhyme_keys("bed"))
+    assert rhyme_keys("") == ()
+
+
+def test_unknown_words_get_estimated_keys():
+    """Unknown compounds rhyme like their last part; other words by spelling."""
+    assert set(rhyme_keys("voidborn")) & set(rhyme_keys("reborn"))
+    assert rhyme_keys("zzgrtyss") == rhyme_keys("qqblyss")
+
+
+def test_spelling_keys_are_bounded(monkeypatch):
+    """A full table of spelling keys starts over without reusing ids."""
+    monkeypatch.setattr(rhyme, "MAX_SPELLING_KEYS", 2)
+    rhyme._estimate_rhyme_keys.cache_clear()
+    monkeypatch.setattr(rhyme, "_spelling_key_ids", {})
+    ids = [rhyme_keys(word)[0] for word in ("qzxjub", "qzxjec", "qzxjid", "qzxjof")]
+
+    assert len(rhyme._spelling_key_ids) <= 2
+    assert len(set(ids)) == 4
+    assert rhyme_keys("wvkvof") == rhyme_keys("qzxjof")
+
+
+def test_line_rhyme_keys_use_last_word_without_punctuation():
+    """Trailing punctuation and dashes are skipped."""
+    assert line_rhyme_keys(Line(text="Burning bright, -")) == rhyme_keys("bright")
+
+
+def test_rhyme_scheme_labels():
+    """Common schemes are labelled in order of first appearance."""
+    assert rhyme_scheme(_stanza("The night is dark", "The moon is bright",
+                                "I hear the lark", "Beneath the light")) == "ABAB"
+    assert rhyme_scheme(_stanza("I see the cat", "Upon the mat",
+                                "The sky is blue", "And so are you")) == "AABB"
+    assert rhyme_scheme(_stanza("One line alone")) == "A"
@@ -0,0 +1,33 @@
+from oracle.analysis.sound import line_sound_devices, sound_devices
+from oracle.domain_objects import Line, Stanza
+
+
+def _devices(text):
+    return line_sound_devices(Line(text=text))
+
+
+def test_alliteration_needs_consecutive_content_words():
+    """Function words between alliterating words are skipped."""
+    assert "alliteration: dark deep dreaming" in _devices("The dark and deep and dreaming sea")
+    assert not [entry for entry in _devices("The dark night and a deep sea") if entry.startswith("alliteration")]
+
+
+def test_alliteration_by_sound_not_spelling():
+    """'knight' starts with N, so it alliterates with 'night', not with 'kind'."""
+    assert _devices("Night knights") == ["alliteration: night knights"]
+    assert _devices("Kind knights") == []
+
+
+def test_assonance():
+    assert _devices("Hear the mellow wedding bells") == ["assonance: mellow wedding bells"]
+
+
+def test_consonance_excludes_pure_rhymes():
+    """Shared final consonants count only when the words do not all rhyme."""
+    assert "consonance: mill fill spill" not in _devices("mill and fill will spill")
+    assert _devices("Stroke the black milk, the lake at dusk") == ["consonance: stroke black milk lake dusk"]
+
+
+def test_stanza_collects_lines_in_order():
+    stanza = Stanza(lines=[Line(text="Peter Piper picked"), Line(text="Hear the mellow wedding bells")])
+    assert sound_devices(stanza) == ["alliteration: peter piper picked", "assonance: mellow wedding bells"]
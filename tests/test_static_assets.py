@@ -0,0 +1,64 @@
+import gzip
+
+from oracle.static_assets import (IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, AssetTable, build_asset,
+                                  etag_matches, negotiate_encoding)
+
+
+CSS = ("body { color: black; }\n" * 50).encode()
+
+
+def test_negotiate_encoding():
+    available = {"gzip": b"", "br": b""}
+    assert negotiate_encoding("gzip, deflate", available) == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate", available) is None
+    assert negotiate_encoding("*", {"gzip": b""}) == "gzip"
+    assert negotiate_encoding("*, gzip;q=0", {"gzip": b""}) is None
+    assert negotiate_encoding(None, available) is None
+    assert negotiate_encoding("gzip", {}) is None
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_build_asset_compresses_once_and_tags_variants():
+    asset = build_asset("style.css", CSS, "text/css; charset=utf-8")
+
+    assert gzip.decompress(asset.encodings["gzip"]) == CSS
+    assert asset.cache_control == REVALIDATE_CACHE_CONTROL
+    coding, body, etag = asset.variant("gzip")
+    assert (coding, body) == ("gzip", asset.encodings["gzip"])
+    assert etag != asset.etag
+    assert asset.variant(None) == (None, CSS, asset.etag)
+
+
+def test_small_and_binary_files_are_not_compressed():
+    assert build_asset("a.css", b"a{}", "text/css").encodings == {}
+    assert build_asset("logo.png", bytes(1000), "image/png").encodings == {}
+
+
+def test_hashed_vite_assets_are_immutable():
+    assert build_asset("assets/index-BXk2a9Lq.js", b"", "application/javascript").cache_control == \
+        IMMUTABLE_CACHE_CONTROL
+    assert build_asset("favicon-large.svg", b"", "image/svg+xml").cache_control == REVALIDATE_CACHE_CONTROL
+
+
+def test_table_only_holds_files_inside_the_folder(tmp_path):
+    dist = tmp_path / "dist"
+    (dist / "assets").mkdir(parents=True)
+    (dist / "index.html").write_text("<html></html>")
+    (dist / "assets" / "style.css").write_bytes(CSS)
+    (tmp_path / "secret.txt").write_text("secret")
+    (dist / "link.txt").symlink_to(tmp_path / "secret.txt")
+
+    table = AssetTable.load(dist)
+
+    assert len(table) == 2
+    assert table.get("/assets/style.css").body == CSS
+    assert table.get("assets/../index.html") is None
+    assert table.get("link.txt") is None
+    assert table.index().content_type == "text/html; charset=utf-8"
+    assert len(AssetTable.load(tmp_path / "missing")) == 0
@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import pytest
+
+from oracle import store as store_module
+from oracle.analyzer import analyze_poem
+from oracle.poem_model import Poem
+from oracle.store import AnalysisStore, format_syllable_profile, parse_syllable_profile
+
+
+HAIKU = """An old silent pond
+A frog jumps into the pond
+Splash silence again"""
+
+ANAPHORA_POEM = """I am the storm that breaks
+I am the calm that follows
+I am nothing at all"""
+
+LONG_LINE_POEM = """Gazes into the weary eyes of a lost stalker
+Who lies in blood-flow of the night"""
+
+
+def _analysis(text: str, name: str) -> dict:
+    return analyze_poem(Poem(text=text, filepath=Path(f"{name}.txt")))
+
+
+@pytest.fixture
+def filled_store(tmp_path: Path):
+    with AnalysisStore(tmp_path / "analyses.db") as store:
+        store.add_poems([
+            ("haiku.txt", _analysis(HAIKU, "haiku")),
+            ("anaphora.txt", _analysis(ANAPHORA_POEM, "anaphora")),
+            ("long.txt", _analysis(LONG_LINE_POEM, "long")),
+        ])
+    return tmp_path / "analyses.db"
+
+
+def test_syllable_profile_round_trip():
+    """Profiles are stored as dash-joined keys and parsed from dashes or commas."""
+    assert format_syllable_profile([5, 7, 5]) == "5-7-5"
+    assert parse_syllable_profile("5,7,5") == [5, 7, 5]
+    with pytest.raises(ValueError):
+        parse_syllable_profile("five-seven")
+
+
+def test_stanzas_with_profile(filled_store: Path):
+    """A 5-7-5 stanza is found by its syllable profile."""
+    with AnalysisStore(filled_store, read_only=True) as store:
+        profile = _analysis(HAIKU, "haiku")["syllables_per_line"][0]
+        results = store.stanzas_with_profile(profile)
+
+    assert [(record.poem, record.position) for record in results] == [("haiku.txt", 0)]
+    assert results[0].text.startswith("An old silent pond")
+
+
+def test_poems_with_anaphora(filled_store: Path):
+    """Poems are found when a stored anaphora pattern contains the phrase."""
+    with AnalysisStore(filled_store, read_only=True) as store:
+        assert store.poems_with_anaphora("I am") == ["anaphora.txt"]
+        assert store.poems_with_anaphora("storm") == []
+
+
+def test_lines_by_syllables(filled_store: Path):
+    """Lines above a syllable threshold are returned with their location."""
+    with AnalysisStore(filled_store, read_only=True) as store:
+        results = store.lines_by_syllables(minimum=13)
+
+    assert [(record.poem, record.stanza, record.position) for record in results] == [("long.txt", 0, 0)]
+    assert results[0].syllables >= 13
+
+
+def test_storing_a_poem_again_replaces_it(filled_store: Path):
+    """Re-adding a poem name replaces its stanzas, lines and devices."""
+    with AnalysisStore(filled_store) as store:
+        store.add_poems([("anaphora.txt", _analysis("Just one line now", "anaphora"))])
+        assert store.poem_count() == 3
+        assert store.poems_with_anaphora("i am") == []
+
+        store.remove_poem("haiku.txt")
+        assert store.poem_count() == 2
+        assert store.lines_by_syllables(maximum=100, minimum=0, limit=100)[0].poem != "haiku.txt"
+
+
+def test_buffered_writes_are_flushed_in_batches(tmp_path: Path, monkeypatch):
+    """write() buffers poems and inserts them per batch, with the rest on close."""
+    monkeypatch.setattr(store_module, "BATCH_SIZE", 2)
+    analysis = _analysis(HAIKU, "haiku")
+    store = AnalysisStore(tmp_path / "analyses.db")
+    for i in range(3):
+        store.write(f"poem{i}.txt", analysis)
+    assert store.poem_count() == 2
+    store.close()
+
+    with AnalysisStore(tmp_path / "analyses.db", read_only=True) as reopened:
+        assert reopened.poem_count() == 3
+
+
+def test_sound_devices_are_stored_under_their_own_name(tmp_path: Path):
+    """Sound device entries do not show up as anaphora."""
+    analysis = analyze_poem(Poem(text="I am the dark and deep\nI am the sea", filepath=Path("sound.txt")),
+                            include=["sound_devices"])
+    with AnalysisStore(tmp_path / "analyses.db") as store:
+        store.add_poems([("sound.txt", analysis)])
+        assert store.poems_with_anaphora("i am") == ["sound.txt"]
+        assert store.poems_with_anaphora("dark deep") == []
+        rows = store._connection.execute("SELECT device, pattern FROM devices ORDER BY device").fetchall()
+
+    assert ("alliteration", "dark deep") in rows
+
+
+def test_anaphora_named_like_a_sound_device_stays_anaphora(tmp_path: Path):
+    """Device types come from the analysis, not from the text of an entry."""
+    analysis = analyze_poem(Poem(text="Consonance: the first\nConsonance: the second", filepath=Path("c.txt")),
+                            include=["sound_devices"])
+    with AnalysisStore(tmp_path / "analyses.db") as store:
+        store.add_poems([("c.txt", analysis)])
+        assert store.poems_with_anaphora("consonance: the") == ["c.txt"]
+        rows = store._connection.execute("SELECT device, pattern FROM devices").fetchall()
+
+    assert rows == [("anaphora", "consonance: the")]
@@ -0,0 +1,86 @@
+import io
+import json
+
+import pytest
+
+from oracle.streaming import (
+    StreamRecord, iter_delimited_records, iter_ndjson_records, iter_stream_results, run_stream,
+)
+
+
+def test_iter_ndjson_records_reads_titles_and_flags_bad_lines():
+    """Valid records are parsed, blank lines skipped and malformed lines become error records."""
+    lines = [
+        '{"title": "One", "poem_text": "First poem"}\n',
+        "\n",
+        '{"poem_text": "No title"}\n',
+        "not json\n",
+        '{"title": "Missing text"}\n',
+    ]
+
+    records = list(iter_ndjson_records(lines))
+
+    assert [record.title for record in records[:2]] == ["One", "Untitled"]
+    assert records[1].poem_text == "No title"
+    assert records[2].error is not None and "Invalid record" in records[2].error
+    assert records[3].error == "Missing 'poem_text' field"
+
+
+def test_iter_delimited_records_splits_on_delimiter_lines():
+    """Plain-text poems are separated by delimiter lines; empty chunks are dropped."""
+    text = "First poem\nline two\n---\n\n---\nSecond poem\n"
+
+    records = list(iter_delimited_records(io.StringIO(text)))
+
+    assert [record.poem_text for record in records] == ["First poem\nline two\n", "Second poem\n"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_iter_stream_results_preserves_input_order(jobs):
+    """Results come back in input order, also when analyzed in a process pool."""
+    records = [StreamRecord(title=f"Poem {i}", poem_text=f"Line number {i}\nAnother line")
+               for i in range(10)]
+
+    results = list(iter_stream_results(iter(records), jobs=jobs, window=3))
+
+    assert [result["title"] for result in results] == [f"Poem {i}" for i in range(10)]
+    assert all(result["error"] is None for result in results)
+
+
+def test_run_stream_writes_one_json_result_per_line():
+    """Each input poem produces one NDJSON line, including failures."""
+    stdin = io.StringIO(
+        '{"title": "Voidborn", "poem_text": "Born out of the void\\nAmidst the stars of flesh"}\n'
+        '{"title": "Empty", "poem_text": "   "}\n'
+    )
+    stdout = io.StringIO()
+
+    written = run_stream(stdin, stdout)
+    lines = stdout.getvalue().splitlines()
+
+    assert written == 2
+    first, second = (json.loads(line) for line in lines)
+    assert first["analysis"]["syllables_per_line"] == [[5, 6]]
+    assert second["analysis"] == {}
+    assert "empty" in second["error"]
+
+
+def test_run_stream_rejects_unknown_format():
+    """An unsupported input format is a ValueError."""
+    with pytest.raises(ValueError):
+        run_stream(io.StringIO(""), io.StringIO(), input_format="xml")
+
+
+def test_perf_timings_stay_off_the_ndjson_stream():
+    """With --stream --perf, stdout carries only JSON lines and timings go to stderr."""
+    import subprocess
+    import sys
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "oracle.main", "--stream", "--perf"],
+        input='{"title": "Voidborn", "poem_text": "Born out of the void"}\n',
+        capture_output=True, text=True, check=True,
+    )
+
+    assert [json.loads(line)["title"] for line in completed.stdout.splitlines()] == ["Voidborn"]
+    assert "analyze_poem:" in completed.stderr
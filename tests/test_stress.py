@@ -0,0 +1,139 @@
+import gc
+import math
+import time
+import tracemalloc
+from typing import Callable
+
+import pytest
+
+from oracle.analysis.base import anaphora
+from oracle.analysis.repetition import find_repetitions
+from oracle.domain_objects import Line, Stanza
+from oracle.parser import parse_into_stanzas
+from oracle.syllable_counter import count_syllables, fallback_estimate
+
+
+# Adversarial inputs that drive the super-linear (or accidentally super-linear) paths.
+# Each scenario is timed at three input sizes, and the log-log slope of the timings is
+# the observed scaling exponent. Bounds are generous on purpose: they should catch a
+# complexity regression (linear -> quadratic), not a slow CI machine.
+
+REPEATS = 3
+
+
+def _time_once(func: Callable[[], object]) -> float:
+    """Run func once with the garbage collector paused and return elapsed seconds."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def _best_time(func: Callable[[], object]) -> float:
+    """Return the fastest of REPEATS runs, which is the least noisy estimate."""
+    return min(_time_once(func) for _ in range(REPEATS))
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    """Return peak traced memory in bytes while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _scaling_exponent(sizes: list[int], timings: list[float]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(timing, 1e-9)) for timing in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def _long_line_stanza(word_count: int) -> Stanza:
+    words = " ".join(f"w{i}" for i in range(word_count))
+    return Stanza(lines=[Line(text=words), Line(text=words)])
+
+
+def _one_word_stanzas(stanza_count: int) -> str:
+    return "\n\n".join(f"word{i}" for i in range(stanza_count))
+
+
+def _huge_word(length: int) -> str:
+    return "ab" * (length // 2) + "!"
+
+
+def _hyphen_chain(part_count: int) -> Line:
+    return Line(text="-".join(["ab"] * part_count))
+
+
+def _symploce_pairs(line_count: int) -> list[Stanza]:
+    # Every pair of lines shares an opening and an ending, so openings and endings both grow with the poem
+    return [Stanza(lines=[Line(text=f"o{i // 2} p{i // 2} x{i} e{i // 2} f{i // 2}") for i in range(line_count)])]
+
+
+SCENARIOS = [
+    pytest.param(
+        lambda n: (lambda stanza=_long_line_stanza(n): anaphora(stanza)),
+        [250, 500, 1000], 2.5, 2.0, 16 * 1024 * 1024,
+        id="anaphora-thousands-of-words-per-line",
+    ),
+    pytest.param(
+        lambda n: (lambda text=_one_word_stanzas(n): parse_into_stanzas(text, "stress")),
+        [2000, 4000, 8000], 1.5, 2.0, 32 * 1024 * 1024,
+        id="parse-thousands-of-one-word-stanzas",
+    ),
+    pytest.param(
+        lambda n: (lambda word=_huge_word(n): count_syllables(word)),
+        [2 ** 18, 2 ** 19, 2 ** 20], 1.5, 2.0, 8 * 2 ** 20,
+        id="count-syllables-megabyte-word",
+    ),
+    pytest.param(
+        lambda n: (lambda word=_huge_word(n): fallback_estimate(word)),
+        [2 ** 18, 2 ** 19, 2 ** 20], 1.5, 2.0, 1024 * 1024,
+        id="fallback-estimate-megabyte-word",
+    ),
+    pytest.param(
+        lambda n: (lambda line=_hyphen_chain(n): line.get_total_syllables()),
+        [5000, 10000, 20000], 1.5, 2.0, 32 * 1024 * 1024,
+        id="line-huge-hyphen-chain",
+    ),
+    pytest.param(
+        lambda n: (lambda stanzas=_symploce_pairs(n): find_repetitions(stanzas)),
+        [1000, 2000, 4000], 1.5, 2.0, 64 * 1024 * 1024,
+        id="repetitions-thousands-of-symploce-lines",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "make_workload,sizes,max_exponent,max_seconds,max_peak_bytes", SCENARIOS
+)
+def test_worst_case_scaling(make_workload, sizes, max_exponent, max_seconds,
+                            max_peak_bytes, record_property):
+    """Adversarial inputs stay within time, memory and scaling-exponent bounds."""
+    timings = [_best_time(make_workload(size)) for size in sizes]
+    exponent = _scaling_exponent(sizes, timings)
+    peak = _peak_memory(make_workload(sizes[-1]))
+
+    record_property("sizes", sizes)
+    record_property("timings", [round(timing, 6) for timing in timings])
+    record_property("scaling_exponent", round(exponent, 3))
+    record_property("peak_bytes", peak)
+
+    assert timings[-1] < max_seconds, \
+        f"Largest input took {timings[-1]:.3f}s (limit {max_seconds}s)"
+    assert peak < max_peak_bytes, \
+        f"Peak memory {peak} bytes exceeds {max_peak_bytes} bytes"
+    assert exponent < max_exponent, \
+        f"Observed scaling exponent {exponent:.2f} exceeds {max_exponent} (timings: {timings})"
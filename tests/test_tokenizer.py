@@ -0,0 +1,35 @@
+from oracle.tokenizer import (ELISION, HYPHEN_PART, WRAPPED, Token, normalize_token,
+                              tokenize_line)
+
+
+def test_normalize_token_sets_forms_and_flags():
+    """Words are lowercased, stripped of wrapping punctuation and flagged."""
+    assert normalize_token("(Void),") == ("(Void),", "(void),", "void", WRAPPED)
+    assert normalize_token("O'er") == ("O'er", "o'er", "o'er", ELISION)
+    assert normalize_token("don't") == ("don't", "don't", "don't", 0)
+    assert normalize_token("abyss'") == ("abyss'", "abyss'", "abyss", WRAPPED)
+
+
+def test_tokenize_line_splits_words_and_hyphens():
+    """Words keep hyphens for phrase patterns; tokens are split on them."""
+    line = tokenize_line("Who lies in  blood-flow of the Night!")
+
+    assert line.words == ["who", "lies", "in", "blood-flow", "of", "the", "night!"]
+    assert [form[2] for form in line.forms] == ["who", "lies", "in", "blood", "flow", "of", "the", "night"]
+    assert line.forms[3][3] == HYPHEN_PART
+    assert line.forms[7][3] == WRAPPED
+
+
+def test_consecutive_hyphens_produce_empty_tokens():
+    """Empty hyphen parts are kept, matching the previous str.split('-') behavior."""
+    assert [form[0] for form in tokenize_line("x--y -").forms] == ["x", "", "y", "", ""]
+
+
+def test_tokens_carry_source_offsets():
+    """Token offsets slice the original text."""
+    text = "  O'er the  abyss-watch"
+    tokens = tokenize_line(text).tokens()
+
+    assert [text[token.start:token.end] for token in tokens] == ["O'er", "the", "abyss", "watch"]
+    assert tokens[0] == Token("O'er", "o'er", "o'er", 2, 6, ELISION)
+    assert tokens[3].flags == HYPHEN_PART
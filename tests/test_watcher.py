@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from oracle.watcher import PollingWatcher
+
+
+class FakeClock:
+    """Manually advanced clock for debounce tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_new_file_is_reported_after_debounce(tmp_path: Path):
+    """A new poem is reported once it has been stable for the debounce window."""
+    clock = FakeClock()
+    watcher = PollingWatcher(tmp_path, debounce=2.0, clock=clock)
+    watcher.prime()
+
+    (tmp_path / "draft.txt").write_text("First line")
+    assert watcher.poll() == []          # change seen, debounce starts
+
+    clock.now = 1.0
+    assert watcher.poll() == []          # still inside the window
+
+    clock.now = 2.5
+    assert watcher.poll() == ["draft.txt"]
+
+    clock.now = 5.0
+    assert watcher.poll() == []          # reported only once
+
+
+def test_edits_during_debounce_restart_the_window(tmp_path: Path):
+    """Repeated saves inside the window collapse into a single report."""
+    clock = FakeClock()
+    (tmp_path / "poem.txt").write_text("v1")
+    watcher = PollingWatcher(tmp_path, debounce=1.0, clock=clock)
+    watcher.prime()
+
+    (tmp_path / "poem.txt").write_text("version two")
+    watcher.poll()
+    clock.now = 0.8
+    (tmp_path / "poem.txt").write_text("version three!")
+    assert watcher.poll() == []
+
+    clock.now = 1.5
+    assert watcher.poll() == []          # window restarted at 0.8
+    clock.now = 2.0
+    assert watcher.poll() == ["poem.txt"]
+
+
+def test_primed_and_analysis_files_are_not_reported(tmp_path: Path):
+    """Files present at prime time and '_analysis.txt' outputs are ignored."""
+    clock = FakeClock()
+    (tmp_path / "old.txt").write_text("Old poem")
+    watcher = PollingWatcher(tmp_path, debounce=0.0, clock=clock)
+    watcher.prime()
+
+    (tmp_path / "old_analysis.txt").write_text("Stanza 1:")
+    watcher.poll()
+    clock.now = 1.0
+    assert watcher.poll() == []
+
+
+def test_deleted_and_recreated_file_is_reported_again(tmp_path: Path):
+    """A file that is deleted and written again counts as new."""
+    clock = FakeClock()
+    poem = tmp_path / "poem.txt"
+    poem.write_text("Same text")
+    watcher = PollingWatcher(tmp_path, debounce=0.0, clock=clock)
+    watcher.prime()
+
+    poem.unlink()
+    watcher.poll()
+    poem.write_text("Same text")
+    watcher.poll()
+    clock.now = 1.0
+    assert watcher.poll() == ["poem.txt"]